@@ -2,8 +2,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import os
 import pandas as pd
-from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Font
+from workbook_session import get_workbook_session, workbook_action
+from sheet_rewrite import sort_rows
+from trade_results import compute_analytics, load_closed_trade_analytics
+from report_writer import MONEY, PERCENT, ReportSheet, signed_style
+from option_quote_cache import get_option_quote_cache
+from gui_tasks import check_cancelled, get_task_runner, report_progress
 
 # --- Explicit mapping from Excel columns to app field names ---
 EXCEL_TO_APP_COLS = {
@@ -45,6 +50,7 @@ COLUMNS = [
     "Close Price", "Realized P/L", "P&L %", "Notes2", "Current Price", "Current P/L"
 ]
 DATE_COLUMNS = ["Expiration", "Date", "Close Date"]
+EXCEL_FILENAME = "Put Transactions.xlsx"
 
 
 class TradeTrackerApp:
@@ -168,6 +174,13 @@ class TradeTrackerApp:
         fix_pl_btn.pack(side="left", padx=5, pady=2)
         results_btn = tk.Button(button_frame, text="Generate Results", command=self.generate_results, bg="#9C27B0", fg="white", font=("Arial", 12, "bold"))
         results_btn.pack(side="left", padx=5, pady=2)
+        
+        # Price updates and results run in the background; their progress shows here
+        self.tasks = get_task_runner()
+        cancel_btn = tk.Button(button_frame, text="Cancel", command=self.cancel_background_tasks, font=("Arial", 12))
+        cancel_btn.pack(side="right", padx=5, pady=2)
+        self.status_var = tk.StringVar()
+        tk.Label(button_frame, textvariable=self.status_var, font=("Arial", 11, "italic"), fg="#555555").pack(side="right", padx=10)
 
         # Treeview for displaying trades
         tree_frame = tk.Frame(self.root)
@@ -261,6 +274,7 @@ class TradeTrackerApp:
                 cost_widget.update()
                 print(f"DEBUG: Force refreshed Cost field: '{self.vars['Cost'].get()}'")
                 
+    @workbook_action(EXCEL_FILENAME)
     def add_trade(self):
         # Build trade entry with calculated fields
         from datetime import datetime
@@ -453,8 +467,8 @@ class TradeTrackerApp:
         excel_filename = "Put Transactions.xlsx"
         sheet_name = "Open_Trades_2025"
         try:
-            wb = load_workbook(excel_filename)
-            ws = wb[sheet_name]
+            wb_session = get_workbook_session(excel_filename)
+            ws = wb_session.edit(sheet_name)
             header = [cell.value for cell in ws[1]]
             # Find the first empty row after the header (row 1)
             insert_row = None
@@ -539,10 +553,9 @@ class TradeTrackerApp:
                     cell.font = Font(name="Arial", size=12, bold=True)
                 elif app_col in ["Strike", "Cost", "Investment", "Close Price", "Realized P/L", "Current Price", "Current P/L", "Call Value", "Put Value", "Put Cash Req"] and value is not None:
                     cell.number_format = "$#,##0.00"
-            wb.save(excel_filename)
-            wb.close()
             # Sort Excel trades by ticker (existing logic)
             self.sort_excel_trades()
+            wb_session.commit()  # One save for the new row and the re-sort
             self.load_open_trades_from_excel()
             self.sort_treeview_by_ticker_and_date()
         except Exception as e:
@@ -596,13 +609,14 @@ class TradeTrackerApp:
                 self.vars[col].set(value)
                 print(f"DEBUG: Setting {col} = '{value}'")
         
+        @workbook_action(EXCEL_FILENAME)
         def save_update():
             print("DEBUG: save_update() called")
             # Always define Excel workbook and worksheet at the start
             excel_filename = "Put Transactions.xlsx"
             sheet_name = "Open_Trades_2025"
-            wb = load_workbook(excel_filename)
-            ws = wb[sheet_name]
+            wb_session = get_workbook_session(excel_filename)
+            ws = wb_session.sheet(sheet_name)
             # Build updated entry - preserve original values, only update assignment fields
             from datetime import datetime
             entry = {}
@@ -830,8 +844,8 @@ class TradeTrackerApp:
             excel_filename = "Put Transactions.xlsx"
             sheet_name = "Open_Trades_2025"
             try:
-                wb = load_workbook(excel_filename)
-                ws = wb[sheet_name]
+                wb_session = get_workbook_session(excel_filename)
+                ws = wb_session.edit(sheet_name)
                 header = [cell.value for cell in ws[1]]
                 # Find row in Excel matching Ticker, Date, Shares
                 match_row = None
@@ -1136,8 +1150,7 @@ class TradeTrackerApp:
                                 else:
                                     cell.font = Font(name="Arial", size=12)
                             
-                            wb.save(excel_filename)
-                            wb.close()
+                            # Saved together with the move to the closed trades sheet below
                             
                             # Update the treeview with final values - ensure cleared fields show empty
                             trade = []
@@ -1148,8 +1161,11 @@ class TradeTrackerApp:
                                     trade.append(entry[col])
                             self.tree.item(item, values=trade)
                             
-                            # Move to closed trades sheet and remove from GUI - pass the cleaned entry data
-                            self.move_trade_to_closed(entry, match_row, excel_filename)
+                            # Move to closed trades sheet and remove from GUI - pass the cleaned entry data.
+                            # The move commits this close with it; on failure both were rolled back
+                            # and the trades reloaded, so there is nothing left to save or remove.
+                            if not self.move_trade_to_closed(entry, match_row, excel_filename):
+                                return
                             # Remove from GUI
                             self.tree.delete(item)
                             # Clear entry fields
@@ -1162,15 +1178,15 @@ class TradeTrackerApp:
                             print(f"DEBUG: Error in close trade logic: {close_error}")
                             messagebox.showerror("Close Trade Error", f"Error closing trade: {close_error}")
                             # Continue with regular update if close fails
-                            wb.save(excel_filename)
-                            wb.close()
-                            messagebox.showinfo("Trade Updated", "Trade updated in Excel and GUI (close failed).")
+                            if wb_session.commit():
+                                messagebox.showinfo("Trade Updated", "Trade updated in Excel and GUI (close failed).")
                     else:
                         print("DEBUG: No close conditions, proceeding with regular Excel update")
-                        wb.save(excel_filename)
-                        wb.close()
-                        print("DEBUG: Excel file saved successfully")
-                        messagebox.showinfo("Trade Updated", "Trade updated in Excel and GUI.")
+                        if wb_session.commit():
+                            print("DEBUG: Excel file saved successfully")
+                            messagebox.showinfo("Trade Updated", "Trade updated in Excel and GUI.")
+                        else:
+                            messagebox.showinfo("Trade Updated", "No changes to save in Excel.")
                 else:
                     print("DEBUG: No matching row found in Excel!")
                     messagebox.showwarning("Excel Update", "Could not find matching trade in Excel.")
@@ -1184,23 +1200,21 @@ class TradeTrackerApp:
         # Execute the save_update function directly (no popup needed)
         save_update()
 
+    @workbook_action(EXCEL_FILENAME)
     def move_trade_to_closed(self, entry, match_row, excel_filename):
-        """Move a trade from Open_Trades_2025 to Closed_Trades_2025 sheet"""
+        """Move a trade from Open_Trades_2025 to Closed_Trades_2025 sheet; returns False if nothing was saved"""
         try:
             print(f"DEBUG: Starting move_trade_to_closed for {entry['Ticker']}")
-            # Wait a moment and reopen to ensure we get the latest saved data
-            import time
-            time.sleep(0.1)  # Brief pause to ensure file save is complete
-            
-            wb = load_workbook(excel_filename)
-            open_sheet = wb["Open_Trades_2025"]
+            # Same workbook as the caller's edits; both are saved in one commit
+            wb_session = get_workbook_session(excel_filename)
+            open_sheet = wb_session.edit("Open_Trades_2025")
             print(f"DEBUG: Loaded workbook, open sheet has {open_sheet.max_row} rows")
             
             # Create Closed_Trades_2025 sheet if it doesn't exist (matching the naming pattern)
             closed_sheet_name = "Closed_Trades_2025"
-            if closed_sheet_name not in wb.sheetnames:
+            if closed_sheet_name not in wb_session.sheetnames:
                 print(f"DEBUG: Creating new {closed_sheet_name} sheet")
-                closed_sheet = wb.create_sheet(closed_sheet_name)
+                closed_sheet = wb_session.create_sheet(closed_sheet_name)
                 # Copy headers from open trades sheet
                 open_headers = [cell.value for cell in open_sheet[1]]
                 for col_idx, header in enumerate(open_headers, start=1):
@@ -1210,7 +1224,7 @@ class TradeTrackerApp:
                 print(f"DEBUG: Created closed sheet with {len(open_headers)} headers")
             else:
                 print(f"DEBUG: Using existing {closed_sheet_name} sheet")
-                closed_sheet = wb[closed_sheet_name]
+                closed_sheet = wb_session.edit(closed_sheet_name)
             
             print(f"DEBUG: Closed sheet currently has {closed_sheet.max_row} rows")
             
@@ -1301,23 +1315,23 @@ class TradeTrackerApp:
             open_sheet.delete_rows(match_row)
             
             print(f"DEBUG: Saving workbook to {excel_filename}")
-            wb.save(excel_filename)
-            wb.close()
-            print(f"DEBUG: Workbook saved and closed successfully")
+            wb_session.commit()
+            print(f"DEBUG: Workbook committed successfully")
             
             print(f"Successfully moved closed trade {entry['Ticker']} to {closed_sheet_name} sheet")
+            return True
             
         except Exception as e:
             print(f"Error moving trade to closed: {e}")
             messagebox.showerror("Close Trade Error", f"Could not move trade to closed trades.\n{e}")
             
-            # Reopen the file to reload fresh data if there was an error
+            # Drop the half-moved trade (and the caller's unsaved close) and reload from disk
             try:
-                wb = load_workbook(excel_filename)
-                wb.close()
+                get_workbook_session(excel_filename).rollback()
                 self.load_open_trades_from_excel()
             except:
                 pass
+            return False
 
     def get_stock_price_from_etrade(self, ticker):
         """Fetch current stock price from E*TRADE"""
@@ -1340,100 +1354,15 @@ class TradeTrackerApp:
         return None
 
     def get_option_price_from_etrade(self, ticker, strike, option_type, expiry_date):
-        """Fetch current option price from E*TRADE"""
+        """Fetch current option price from E*TRADE (chains are shared through the option quote cache)"""
         try:
-            from etrade_auth import get_etrade_session
-            from datetime import datetime
-            
-            session, base_url = get_etrade_session()
-            
-            # Parse expiry date if it's a string
-            target_date = None
-            if isinstance(expiry_date, str):
-                try:
-                    target_date = datetime.strptime(expiry_date, "%m/%d/%Y").date()
-                except:
-                    try:
-                        target_date = datetime.strptime(expiry_date, "%Y-%m-%d").date()
-                    except:
-                        print(f"Could not parse expiry date: {expiry_date}")
-                        return None
-            elif hasattr(expiry_date, 'date'):
-                target_date = expiry_date.date()
-            else:
-                target_date = expiry_date
-                
-            if not target_date:
-                print(f"Invalid expiry date format: {expiry_date}")
-                return None
-            
-            # Get available expiration dates to find the closest match
-            exp_url = f"{base_url}/v1/market/optionexpiredate.json?symbol={ticker}"
-            exp_response = session.get(exp_url)
-            
-            if exp_response.status_code != 200:
-                print(f"Could not get expiration dates for {ticker}")
-                return None
-                
-            exp_data = exp_response.json()
-            dates = exp_data.get("OptionExpireDateResponse", {}).get("ExpirationDate", [])
-            
-            # Find the best matching expiration date
-            best_match = None
-            min_diff = float('inf')
-            
-            for date_info in dates:
-                exp_datetime = datetime(date_info['year'], date_info['month'], date_info['day']).date()
-                diff = abs((exp_datetime - target_date).days)
-                if diff < min_diff:
-                    min_diff = diff
-                    best_match = date_info
-            
-            if not best_match:
-                print(f"No expiration dates found for {ticker}")
-                return None
-                
-            # Format URL for option chain with the best matching date
-            url = f"{base_url}/v1/market/optionchains.json?symbol={ticker}&expiryDay={best_match['day']:02d}&expiryMonth={best_match['month']:02d}&expiryYear={best_match['year']}&chainType={option_type.upper()}"
-            response = session.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                chain = data.get("OptionChainResponse", {})
-                option_pairs = chain.get("OptionPair", [])
-                
-                # Find option with closest strike price
-                best_option = None
-                min_strike_diff = float('inf')
-                
-                for pair in option_pairs:
-                    if option_type.lower() == "call":
-                        option_data = pair.get("Call", {})
-                    else:
-                        option_data = pair.get("Put", {})
-                    
-                    if option_data:
-                        option_strike = float(option_data.get("strikePrice", 0))
-                        strike_diff = abs(option_strike - float(strike))
-                        if strike_diff < min_strike_diff:
-                            min_strike_diff = strike_diff
-                            best_option = option_data
-                
-                if best_option:
-                    last_price = best_option.get("lastPrice")
-                    if last_price:
-                        print(f"Found {option_type} option for {ticker}: Strike ${best_option.get('strikePrice')}, Price ${last_price}")
-                        return float(last_price)
-                        
+            return get_option_quote_cache().option_price(ticker, strike, option_type, expiry_date)
         except Exception as e:
             print(f"Error fetching option price for {ticker} {strike} {option_type}: {e}")
         return None
 
     def update_stock_prices(self):
-        updated_count = 0
         total_trades = len(self.trades)
-        excel_filename = "Put Transactions.xlsx"
-        sheet_name = "Open_Trades_2025"
         
         if total_trades == 0:
             messagebox.showinfo("No Trades", "No trades to update prices for.")
@@ -1443,112 +1372,179 @@ class TradeTrackerApp:
         if not messagebox.askyesno("Update Prices", f"Fetch current prices from E*TRADE for {total_trades} trades?\n\nThis may take a few moments."):
             return
         
+        # The E*TRADE sign-in prompt is a Tk window, so the session is checked here on the main thread
         try:
-            wb = load_workbook(excel_filename)
-            ws = wb[sheet_name]
-            header = [cell.value for cell in ws[1]]
-            
-            print(f"Updating prices for {total_trades} trades...")
+            from etrade_auth import get_etrade_session
+            get_etrade_session()
+        except Exception as e:
+            print(f"E*TRADE session error: {e}")
+        
+        # Quotes and the Excel write run on a worker so the window stays responsive
+        self.status_var.set(f"Updating prices for {total_trades} trades...")
+        self.tasks.submit(self.root, self.fetch_and_store_prices, [list(trade) for trade in self.trades],
+                          name="update_stock_prices", on_done=self.on_prices_updated,
+                          on_error=self.on_prices_failed, on_progress=self.show_status)
+    
+    def fetch_and_store_prices(self, trades):
+        """
+        Background part of update_stock_prices: quotes the trades, then writes the new prices to Excel.
+        The quotes are fetched without holding the workbook, so the window can keep saving meanwhile.
+        """
+        updates = self.fetch_current_prices(trades)
+        self.store_prices(updates)
+        return updates, len(trades)
+    
+    def fetch_current_prices(self, trades):
+        """Quotes the trades; returns [(ticker, date, shares), current price, current P/L or None] per priced trade"""
+        updates = []
+        total_trades = len(trades)
+        
+        print(f"Updating prices for {total_trades} trades...")
+        # Trades on the same underlying and expiry share one chain request this cycle
+        get_option_quote_cache().begin_cycle()
+        
+        for idx, trade in enumerate(trades):
+            check_cancelled()
+            report_progress(idx + 1, f"Updating prices... {idx + 1}/{total_trades}")
+            ticker = trade[COLUMNS.index("Ticker")]
+            trade_type = trade[COLUMNS.index("Type")].lower().strip()
+            strike_str = trade[COLUMNS.index("Strike")]
+            expiry_str = trade[COLUMNS.index("Expiration")]
+            
+            print(f"Processing {idx+1}/{total_trades}: {ticker} ({trade_type})")
+            print(f"  Strike: {strike_str}, Expiry: {expiry_str}")
+            current_price = None
+            
+            # Determine if this is a stock or option trade
+            if "put" in trade_type or "call" in trade_type:
+                # This is an option trade
+                try:
+                    strike = float(str(strike_str).replace("$","").replace(",","").strip()) if strike_str else None
+                    if strike and expiry_str:
+                        option_type = "put" if "put" in trade_type else "call"
+                        print(f"  Fetching {option_type} option price for {ticker}, strike ${strike}, expiry {expiry_str}")
+                        current_price = self.get_option_price_from_etrade(ticker, strike, option_type, expiry_str)
+                    else:
+                        print(f"  Missing strike ({strike_str}) or expiry ({expiry_str}) for option {ticker}")
+                except Exception as e:
+                    print(f"  Error processing option {ticker}: {e}")
+            else:
+                # This is a stock trade
+                print(f"  Fetching stock price for {ticker}")
+                current_price = self.get_stock_price_from_etrade(ticker)
             
-            for idx, trade in enumerate(self.trades):
-                ticker = trade[COLUMNS.index("Ticker")]
-                trade_type = trade[COLUMNS.index("Type")].lower().strip()
-                strike_str = trade[COLUMNS.index("Strike")]
-                expiry_str = trade[COLUMNS.index("Expiration")]
-                
-                print(f"Processing {idx+1}/{total_trades}: {ticker} ({trade_type})")
-                print(f"  Strike: {strike_str}, Expiry: {expiry_str}")
-                current_price = None
+            if current_price:
+                # Calculate Current P/L based on new price
+                current_pl = None
+                try:
+                    cost_str = trade[COLUMNS.index("Cost")]
+                    shares_str = trade[COLUMNS.index("Shares")]
+                    cost = float(str(cost_str).replace("$","").replace(",","").strip()) if cost_str else 0.0
+                    shares = float(str(shares_str).replace("$","").replace(",","").strip()) if shares_str else 0.0
+                    
+                    if cost and shares:
+                        current_pl = (current_price - cost) * shares
+                        print(f"  Calculated P/L: ${current_pl:,.2f} (Price: {current_price}, Cost: {cost}, Shares: {shares})")
+                    else:
+                        print(f"  Could not calculate P/L - Cost: {cost}, Shares: {shares}")
+                except Exception as e:
+                    print(f"  Error calculating P/L for {ticker}: {e}")
                 
-                # Determine if this is a stock or option trade
-                if "put" in trade_type or "call" in trade_type:
-                    # This is an option trade
-                    try:
-                        strike = float(str(strike_str).replace("$","").replace(",","").strip()) if strike_str else None
-                        if strike and expiry_str:
-                            option_type = "put" if "put" in trade_type else "call"
-                            print(f"  Fetching {option_type} option price for {ticker}, strike ${strike}, expiry {expiry_str}")
-                            current_price = self.get_option_price_from_etrade(ticker, strike, option_type, expiry_str)
-                        else:
-                            print(f"  Missing strike ({strike_str}) or expiry ({expiry_str}) for option {ticker}")
-                    except Exception as e:
-                        print(f"  Error processing option {ticker}: {e}")
-                else:
-                    # This is a stock trade
-                    print(f"  Fetching stock price for {ticker}")
-                    current_price = self.get_stock_price_from_etrade(ticker)
+                key = (ticker, trade[COLUMNS.index("Date")], trade[COLUMNS.index("Shares")])
+                updates.append((key, current_price, current_pl))
+                print(f"  ✓ Updated {ticker}: ${current_price:,.2f}")
+            else:
+                print(f"  ✗ Could not get price for {ticker}")
+        
+        return updates
+    
+    @workbook_action(EXCEL_FILENAME)
+    def store_prices(self, updates):
+        """Writes fetched prices to the matching Excel rows"""
+        excel_filename = "Put Transactions.xlsx"
+        sheet_name = "Open_Trades_2025"
+        
+        try:
+            wb_session = get_workbook_session(excel_filename)
+            ws = wb_session.edit(sheet_name)
+            header = [cell.value for cell in ws[1]]
+            ticker_col = self.find_header_column(header, ["Stock ticker", "Ticker"])
+            date_col = self.find_header_column(header, ["Date of transaction", "Trade Date", "Date"])
+            shares_col = self.find_header_column(header, ["Number of shares +/-", "Shares", "Quantity"])
+            current_price_col = self.find_header_column(header, ["Current Price"])
+            current_pl_col = self.find_header_column(header, ["Current P/L"])
+            
+            for (ticker, trade_date, shares), current_price, current_pl in updates:
+                # Update Excel row
+                match_row = None
+                for r in range(2, ws.max_row+1):
+                    excel_ticker = ws.cell(row=r, column=ticker_col).value
+                    excel_date = ws.cell(row=r, column=date_col).value
+                    excel_shares = ws.cell(row=r, column=shares_col).value
+                    if str(excel_ticker) == str(ticker) and str(excel_date) == str(trade_date) and str(excel_shares) == str(shares):
+                        match_row = r
+                        break
                 
-                # Update the price if we got one
-                if current_price:
-                    formatted_price = f"${current_price:,.2f}"
-                    trade[COLUMNS.index("Current Price")] = formatted_price
-                    
-                    # Calculate Current P/L based on new price
-                    try:
-                        cost_str = trade[COLUMNS.index("Cost")]
-                        shares_str = trade[COLUMNS.index("Shares")]
-                        cost = float(str(cost_str).replace("$","").replace(",","").strip()) if cost_str else 0.0
-                        shares = float(str(shares_str).replace("$","").replace(",","").strip()) if shares_str else 0.0
-                        
-                        if cost and shares:
-                            current_pl = (current_price - cost) * shares
-                            formatted_pl = f"${current_pl:,.2f}"
-                            trade[COLUMNS.index("Current P/L")] = formatted_pl
-                            print(f"  Calculated P/L: {formatted_pl} (Price: {current_price}, Cost: {cost}, Shares: {shares})")
-                        else:
-                            print(f"  Could not calculate P/L - Cost: {cost}, Shares: {shares}")
-                    except Exception as e:
-                        print(f"  Error calculating P/L for {ticker}: {e}")
-                    
-                    # Update Excel row
-                    match_row = None
-                    for r in range(2, ws.max_row+1):
-                        ticker_col = self.find_header_column(header, ["Stock ticker", "Ticker"])
-                        date_col = self.find_header_column(header, ["Date of transaction", "Trade Date", "Date"])
-                        shares_col = self.find_header_column(header, ["Number of shares +/-", "Shares", "Quantity"])
-                        
-                        excel_ticker = ws.cell(row=r, column=ticker_col).value
-                        excel_date = ws.cell(row=r, column=date_col).value
-                        excel_shares = ws.cell(row=r, column=shares_col).value
-                        if str(excel_ticker) == str(trade[COLUMNS.index("Ticker")]) and str(excel_date) == str(trade[COLUMNS.index("Date")]) and str(excel_shares) == str(trade[COLUMNS.index("Shares")]):
-                            match_row = r
-                            break
-                    
-                    if match_row:
-                        # Update Current Price
-                        current_price_col = self.find_header_column(header, ["Current Price"])
-                        ws.cell(row=match_row, column=current_price_col, value=current_price)
-                        ws.cell(row=match_row, column=current_price_col).number_format = '$#,##0.00'
-                        
-                        # Update Current P/L if we calculated it
-                        if cost and shares:
-                            current_pl = (current_price - cost) * shares
-                            current_pl_col = self.find_header_column(header, ["Current P/L"])
-                            ws.cell(row=match_row, column=current_pl_col, value=current_pl)
-                            ws.cell(row=match_row, column=current_pl_col).number_format = '$#,##0.00'
+                if match_row:
+                    # Update Current Price
+                    ws.cell(row=match_row, column=current_price_col, value=current_price)
+                    ws.cell(row=match_row, column=current_price_col).number_format = '$#,##0.00'
                     
-                    updated_count += 1
-                    print(f"  ✓ Updated {ticker}: {formatted_price}")
-                else:
-                    print(f"  ✗ Could not get price for {ticker}")
+                    # Update Current P/L if we calculated it
+                    if current_pl is not None:
+                        ws.cell(row=match_row, column=current_pl_col, value=current_pl)
+                        ws.cell(row=match_row, column=current_pl_col).number_format = '$#,##0.00'
             
-            wb.save(excel_filename)
-            wb.close()
-            
-            # Refresh the GUI display
-            self.tree.delete(*self.tree.get_children())
-            for trade in self.trades:
-                self.tree.insert("", "end", values=trade)
-            
-            # Fix any existing trades that have Current Price but missing Current P/L
-            self.fix_missing_current_pl()
-            
-            messagebox.showinfo("Price Update Complete", f"Successfully updated prices for {updated_count} out of {total_trades} trades.")
+            wb_session.commit()
             
         except Exception as e:
             print(f"Excel Error: {e}")
-            messagebox.showerror("Excel Error", f"Could not update stock prices in Excel.\n{e}")
+            raise
+    
+    def on_prices_updated(self, result):
+        """
+        Shows the prices fetched by fetch_and_store_prices (runs on the Tk main loop).
+        They are merged into the current trades by (ticker, date, shares), so trades
+        added, edited or closed while the quotes were running are kept as they are now.
+        """
+        updates, total_trades = result
+        prices = {key: (current_price, current_pl) for key, current_price, current_pl in updates}
+        for i, trade in enumerate(self.trades):
+            key = (trade[COLUMNS.index("Ticker")], trade[COLUMNS.index("Date")], trade[COLUMNS.index("Shares")])
+            if key not in prices:
+                continue
+            current_price, current_pl = prices[key]
+            trade = list(trade)
+            trade[COLUMNS.index("Current Price")] = f"${current_price:,.2f}"
+            if current_pl is not None:
+                trade[COLUMNS.index("Current P/L")] = f"${current_pl:,.2f}"
+            self.trades[i] = trade
+        self.status_var.set("")
+        
+        # Refresh the GUI display
+        self.tree.delete(*self.tree.get_children())
+        for trade in self.trades:
+            self.tree.insert("", "end", values=trade)
+        
+        # Fix any existing trades that have Current Price but missing Current P/L
+        self.fix_missing_current_pl()
+        
+        messagebox.showinfo("Price Update Complete", f"Successfully updated prices for {len(updates)} out of {total_trades} trades.")
+    
+    def on_prices_failed(self, error):
+        self.status_var.set("")
+        messagebox.showerror("Excel Error", f"Could not update stock prices in Excel.\n{error}")
+    
+    def show_status(self, value=None, message=None):
+        """Progress callback of background tasks"""
+        if message:
+            self.status_var.set(message)
+    
+    def cancel_background_tasks(self):
+        if self.tasks.cancel(self.root):
+            self.status_var.set("Cancelled")
 
+    @workbook_action(EXCEL_FILENAME)
     def fix_missing_current_pl(self):
         """Fix trades that have Current Price but missing Current P/L"""
         excel_filename = "Put Transactions.xlsx"
@@ -1557,8 +1553,8 @@ class TradeTrackerApp:
         print(f"Starting P/L fix process...")
         
         try:
-            wb = load_workbook(excel_filename)
-            ws = wb[sheet_name]
+            wb_session = get_workbook_session(excel_filename)
+            ws = wb_session.edit(sheet_name)
             header = [cell.value for cell in ws[1]]
             
             current_price_col = self.find_header_column(header, ["Current Price"])
@@ -1614,7 +1610,7 @@ class TradeTrackerApp:
                         print(f"  Skipping {ticker}: P/L already calculated ({current_pl})")
             
             if fixed_count > 0:
-                wb.save(excel_filename)
+                wb_session.commit()
                 print(f"✓ Fixed Current P/L for {fixed_count} trades")
                 
                 # Reload the data to refresh the GUI
@@ -1622,7 +1618,6 @@ class TradeTrackerApp:
             else:
                 print("No trades needed P/L fixes")
             
-            wb.close()
             
             # Show message to user
             if fixed_count > 0:
@@ -1633,81 +1628,42 @@ class TradeTrackerApp:
         except Exception as e:
             print(f"Error fixing Current P/L: {e}")
             messagebox.showerror("P/L Fix Error", f"Could not fix P/L calculations.\n{e}")
+    @workbook_action(EXCEL_FILENAME)
     def sort_excel_trades(self, sheet_name="Open_Trades_2025"):
         """Sort Excel trades by ticker and date without data loss"""
         excel_filename = "Put Transactions.xlsx"
         try:
             from datetime import datetime
-            wb = load_workbook(excel_filename)
-            ws = wb[sheet_name]
+            wb_session = get_workbook_session(excel_filename)
+            ws = wb_session.sheet(sheet_name)
             
             # Get header row
             header = [cell.value for cell in ws[1]]
             ticker_col = self.find_header_column(header, ["Stock ticker", "Ticker"])
             date_col = self.find_header_column(header, ["Date of transaction", "Trade Date", "Date"])
             
-            # Get all data rows with their row numbers
-            data_with_rows = []
-            for row_num in range(2, ws.max_row + 1):
-                ticker = ws.cell(row=row_num, column=ticker_col).value or ""
-                date_val = ws.cell(row=row_num, column=date_col).value
+            def sort_key(values):
+                ticker = values[ticker_col - 1] or ""
+                date_val = values[date_col - 1]
                 
                 # Parse date for sorting
                 sort_date = datetime.min
-                try:
-                    if isinstance(date_val, datetime):
-                        sort_date = date_val
-                    elif date_val:
-                        date_str = str(date_val).split()[0]
-                        for fmt in ("%m/%d/%Y", "%Y-%m-%d"):
-                            try:
-                                sort_date = datetime.strptime(date_str, fmt)
-                                break
-                            except:
-                                continue
-                except:
-                    pass
-                
-                data_with_rows.append((str(ticker), sort_date, row_num))
-            
-            # Sort by ticker and date
-            data_with_rows.sort(key=lambda x: (x[0], x[1]))
-            
-            # Get the sorted row numbers
-            sorted_row_nums = [row_data[2] for row_data in data_with_rows]
-            
-            # Only proceed if we actually need to sort
-            if sorted_row_nums != list(range(2, ws.max_row + 1)):
-                # Read all row data first
-                all_rows_data = []
-                for row_num in sorted_row_nums:
-                    row_data = []
-                    for col in range(1, len(header) + 1):
-                        cell = ws.cell(row=row_num, column=col)
-                        row_data.append({
-                            'value': cell.value,
-                            'number_format': cell.number_format
-                        })
-                    all_rows_data.append(row_data)
-                
-                # Clear data rows and rewrite in sorted order
-                for row_num in range(ws.max_row, 1, -1):
-                    ws.delete_rows(row_num)
-                
-                # Write sorted data back
-                for new_row, row_data in enumerate(all_rows_data, start=2):
-                    for col, cell_data in enumerate(row_data, start=1):
-                        cell = ws.cell(row=new_row, column=col)
-                        cell.value = cell_data['value']
-                        cell.number_format = cell_data['number_format']
-                        
-                        # Apply standard formatting
-                        app_col = EXCEL_TO_APP_COLS.get(header[col-1], header[col-1])
-                        if app_col in DATE_COLUMNS:
-                            cell.alignment = Alignment(horizontal="right")
+                if isinstance(date_val, datetime):
+                    sort_date = date_val
+                elif date_val:
+                    date_str = str(date_val).split()[0]
+                    for fmt in ("%m/%d/%Y", "%Y-%m-%d"):
+                        try:
+                            sort_date = datetime.strptime(date_str, fmt)
+                            break
+                        except ValueError:
+                            continue
+                return str(ticker), sort_date
             
-            wb.save(excel_filename)
-            wb.close()
+            # Rows are reordered in one pass, keeping their styles and formulas
+            if sort_rows(ws, sort_key):
+                wb_session.mark_dirty(sheet_name)
+                wb_session.commit()
             print("Excel sorting completed successfully")
             
         except Exception as e:
@@ -1763,17 +1719,26 @@ class TradeTrackerApp:
         pass
 
     def load_open_trades_from_excel(self):
-        excel_filename = "Put Transactions.xlsx"
-        if not os.path.exists(excel_filename):
-            return  # File not found, skip loading
-
         # Read from the correct sheet and header row
         try:
-            df = pd.read_excel(excel_filename, header=0, sheet_name="Open_Trades_2025")
+            df = self.read_open_trades_frame()
         except ValueError as e:
             print(f"Excel loading error: {e}")
             messagebox.showerror("Excel Error", f"Could not find sheet 'Open_Trades_2025'.\n{e}")
             return
+        if df is not None:
+            self.show_open_trades(df)
+
+    def read_open_trades_frame(self):
+        """The Open_Trades_2025 sheet as a DataFrame, or None without a workbook; safe to call from a worker"""
+        excel_filename = "Put Transactions.xlsx"
+        if not os.path.exists(excel_filename):
+            return None  # File not found, skip loading
+        # Includes edits the current action has not saved yet
+        return get_workbook_session(excel_filename).read_frame("Open_Trades_2025")
+
+    def show_open_trades(self, df):
+        """Replaces the trades in memory and in the GUI with the rows of df (main thread only)"""
         # Replace all NaN with empty string for clean display
         df = df.fillna("")
         print("Excel columns:", df.columns.tolist())  # Debug print
@@ -1861,67 +1826,78 @@ class TradeTrackerApp:
 
     def generate_results(self):
         """Generate comprehensive results analysis in Excel with real-time data"""
+        # First update current prices and P&L for open trades, then reload them for the open trade stats
+        print("Updating current prices for open trades...")
+        self.status_var.set("Updating open trade P&L...")
+        self.tasks.submit(self.root, self.refresh_open_trades_for_results, name="generate_results",
+                          on_done=self.write_results_in_background, on_error=self.on_results_failed)
+    
+    def refresh_open_trades_for_results(self):
+        """Background part of generate_results: updates open trade P&L and reads the sheet back"""
+        self.update_current_prices_for_all_trades(False)
+        return self.read_open_trades_frame()
+    
+    def write_results_in_background(self, df):
+        if df is not None:
+            self.show_open_trades(df)
+        self.status_var.set("Generating results...")
+        self.tasks.submit(self.root, self.write_results_sheet, name="generate_results",
+                          on_done=self.on_results_generated, on_error=self.on_results_failed)
+    
+    def on_results_generated(self, _):
+        self.status_var.set("")
+        messagebox.showinfo("Results Generated", "Comprehensive trading results with real-time data have been generated in the 'Results' sheet!")
+    
+    def on_results_failed(self, error):
+        self.status_var.set("")
+        messagebox.showerror("Results Error", f"Could not generate results.\n{error}")
+    
+    @workbook_action(EXCEL_FILENAME)
+    def write_results_sheet(self):
+        """Background part of generate_results: builds the Results sheet"""
         try:
             from datetime import datetime
             import pandas as pd
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
             
             excel_filename = "Put Transactions.xlsx"
             
-            # First update current prices and P&L for open trades
-            print("Updating current prices for open trades...")
-            self.update_current_prices_for_all_trades()
-            
-            wb = load_workbook(excel_filename)
-            
-            # Create or clear Results sheet
-            if "Results" in wb.sheetnames:
-                wb.remove(wb["Results"])
-            results_sheet = wb.create_sheet("Results")
+            wb_session = get_workbook_session(excel_filename)
             
             print("Generating comprehensive trading results...")
             
+            # Cells are collected with named styles and written to the sheet in one pass
+            report = ReportSheet()
+            
             # --- SECTION 1: TITLE ---
             row = 1
             
             # Title
-            title_cell = results_sheet.cell(row=row, column=1, value="🏆 TRADING RESULTS DASHBOARD")
-            title_cell.font = Font(name="Arial", size=20, bold=True, color="FFFFFF")
-            title_cell.fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-            title_cell.alignment = Alignment(horizontal="center")
-            results_sheet.merge_cells(f"A{row}:G{row}")
+            report.put(row, 1, "🏆 TRADING RESULTS DASHBOARD", "results_title")
+            report.merge(f"A{row}:G{row}")
             row += 1
             
             # Timestamp
-            timestamp_cell = results_sheet.cell(row=row, column=1, value=f"Generated: {datetime.now().strftime('%m/%d/%Y %I:%M %p')}")
-            timestamp_cell.font = Font(name="Arial", size=10, italic=True, color="666666")
-            timestamp_cell.alignment = Alignment(horizontal="center")
-            results_sheet.merge_cells(f"A{row}:G{row}")
+            report.put(row, 1, f"Generated: {datetime.now().strftime('%m/%d/%Y %I:%M %p')}", "results_timestamp")
+            report.merge(f"A{row}:G{row}")
             row += 3
             
             # --- SECTION 2: CLOSED TRADES ANALYSIS ---
             
-            # Get closed trades data
-            closed_data = self.get_closed_trades_data()
+            # Closed trades are streamed into a DataFrame and aggregated once per sheet content
+            analytics = self.get_closed_trades_analytics()
             
             # Closed Trades Summary Header
-            header_cell = results_sheet.cell(row=row, column=1, value="📈 CLOSED TRADES PERFORMANCE")
-            header_cell.font = Font(name="Arial", size=16, bold=True, color="FFFFFF")
-            header_cell.fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-            header_cell.alignment = Alignment(horizontal="center")
-            results_sheet.merge_cells(f"A{row}:E{row}")
+            report.put(row, 1, "📈 CLOSED TRADES PERFORMANCE", "results_section_closed")
+            report.merge(f"A{row}:E{row}")
             row += 2
             
             # Yearly P&L Analysis
-            yearly_stats = self.calculate_yearly_stats(closed_data)
+            yearly_stats = analytics["yearly_stats"]
             
             # Headers for yearly table
             headers = ["Year", "Total P&L", "Average P&L %", "Win Rate", "Number of Trades"]
             for col, header in enumerate(headers, 1):
-                cell = results_sheet.cell(row=row, column=col, value=header)
-                cell.font = Font(name="Arial", size=12, bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
+                report.put(row, col, header, "results_header")
             row += 1
             
             # Yearly data
@@ -1930,35 +1906,20 @@ class TradeTrackerApp:
             total_avg_percent = 0
             
             for year, stats in yearly_stats.items():
-                results_sheet.cell(row=row, column=1, value=year).font = Font(name="Arial", size=11, bold=True)
+                report.put(row, 1, year, "results_label")
                 
                 # P&L with color coding
-                pl_cell = results_sheet.cell(row=row, column=2, value=stats['total_pl'])
-                pl_cell.number_format = "$#,##0.00"
-                pl_cell.font = Font(name="Arial", size=11, bold=True)
-                if stats['total_pl'] > 0:
-                    pl_cell.font = Font(name="Arial", size=11, bold=True, color="006400")  # Green
-                    pl_cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-                elif stats['total_pl'] < 0:
-                    pl_cell.font = Font(name="Arial", size=11, bold=True, color="CC0000")  # Red
-                    pl_cell.fill = PatternFill(start_color="FFF2F2", end_color="FFF2F2", fill_type="solid")
+                report.put(row, 2, stats['total_pl'], signed_style(stats['total_pl'], "results_up", "results_down", "results_label"), MONEY)
                 
                 # Average P&L %
-                avg_cell = results_sheet.cell(row=row, column=3, value=stats['avg_percent'])
-                avg_cell.number_format = "0.0%"
-                avg_cell.font = Font(name="Arial", size=11)
+                report.put(row, 3, stats['avg_percent'], "results_value", PERCENT)
                 
                 # Win Rate
-                win_rate_cell = results_sheet.cell(row=row, column=4, value=stats['win_rate'])
-                win_rate_cell.number_format = "0.0%"
-                win_rate_cell.font = Font(name="Arial", size=11)
-                if stats['win_rate'] >= 0.6:
-                    win_rate_cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-                elif stats['win_rate'] < 0.4:
-                    win_rate_cell.fill = PatternFill(start_color="FFF2F2", end_color="FFF2F2", fill_type="solid")
+                win_rate_style = "results_good" if stats['win_rate'] >= 0.6 else "results_bad" if stats['win_rate'] < 0.4 else "results_value"
+                report.put(row, 4, stats['win_rate'], win_rate_style, PERCENT)
                 
                 # Number of trades
-                results_sheet.cell(row=row, column=5, value=stats['trade_count']).font = Font(name="Arial", size=11)
+                report.put(row, 5, stats['trade_count'], "results_value")
                 
                 total_pl += stats['total_pl']
                 total_trades += stats['trade_count']
@@ -1966,42 +1927,53 @@ class TradeTrackerApp:
                 row += 1
             
             # Totals row
-            results_sheet.cell(row=row, column=1, value="TOTAL").font = Font(name="Arial", size=12, bold=True)
-            total_pl_cell = results_sheet.cell(row=row, column=2, value=total_pl)
-            total_pl_cell.number_format = "$#,##0.00"
-            total_pl_cell.font = Font(name="Arial", size=12, bold=True, color="FFFFFF")
-            if total_pl > 0:
-                total_pl_cell.fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-            else:
-                total_pl_cell.fill = PatternFill(start_color="F44336", end_color="F44336", fill_type="solid")
+            report.put(row, 1, "TOTAL", "results_total_label")
+            report.put(row, 2, total_pl, "results_total_up" if total_pl > 0 else "results_total_down", MONEY)
             
             overall_avg = total_avg_percent / len(yearly_stats) if yearly_stats else 0
-            avg_total_cell = results_sheet.cell(row=row, column=3, value=overall_avg)
-            avg_total_cell.number_format = "0.0%"
-            avg_total_cell.font = Font(name="Arial", size=12, bold=True, color="FFFFFF")
-            avg_total_cell.fill = PatternFill(start_color="FF9800", end_color="FF9800", fill_type="solid")
+            report.put(row, 3, overall_avg, "results_total", PERCENT)
             
             # Overall win rate
             overall_win_rate = sum(stats['win_rate'] for stats in yearly_stats.values()) / len(yearly_stats) if yearly_stats else 0
-            win_total_cell = results_sheet.cell(row=row, column=4, value=overall_win_rate)
-            win_total_cell.number_format = "0.0%"
-            win_total_cell.font = Font(name="Arial", size=12, bold=True, color="FFFFFF")
-            win_total_cell.fill = PatternFill(start_color="FF9800", end_color="FF9800", fill_type="solid")
+            report.put(row, 4, overall_win_rate, "results_total", PERCENT)
+            
+            report.put(row, 5, total_trades, "results_total")
+            
+            row += 2
             
-            total_trades_cell = results_sheet.cell(row=row, column=5, value=total_trades)
-            total_trades_cell.font = Font(name="Arial", size=12, bold=True, color="FFFFFF")
-            total_trades_cell.fill = PatternFill(start_color="FF9800", end_color="FF9800", fill_type="solid")
+            # --- CLOSED TRADES BREAKDOWN: holding period, strategy, symbol, month ---
+            holding = analytics["holding"]
+            if holding["avg_days"] is not None:
+                report.put(row, 1, f"Average holding period: {holding['avg_days']:.0f} days (median {holding['median_days']:.0f}, longest {holding['max_days']})", "results_note")
+                row += 2
             
-            row += 4
+            breakdown_tables = [("Strategy", analytics["by_strategy"]), ("Symbol", analytics["by_symbol"]), ("Month", analytics["monthly"])]
+            for label_header, table in breakdown_tables:
+                if table.empty:
+                    continue
+                headers = [label_header, "Total P&L", "Average P&L %", "Win Rate", "Number of Trades", "Avg Days Held"]
+                for col, header in enumerate(headers, 1):
+                    report.put(row, col, header, "results_subheader")
+                row += 1
+                
+                for label, stats in table.iterrows():
+                    report.put(row, 1, label or "(blank)", "results_row_label")
+                    report.put(row, 2, float(stats['total_pl']), signed_style(stats['total_pl'], "results_row_up", "results_row_down", "results_row"), MONEY)
+                    report.put(row, 3, float(stats['avg_percent']), "results_row", PERCENT)
+                    report.put(row, 4, float(stats['win_rate']), "results_row", PERCENT)
+                    report.put(row, 5, int(stats['trade_count']), "results_row")
+                    if pd.notna(stats['avg_days_held']):
+                        report.put(row, 6, round(float(stats['avg_days_held']), 1), "results_row")
+                    row += 1
+                row += 2
+            
+            row += 2
             
             # --- SECTION 3: OPEN TRADES ANALYSIS (REAL-TIME) ---
             
             # Open Trades Header
-            open_header_cell = results_sheet.cell(row=row, column=1, value="📊 OPEN TRADES SUMMARY (REAL-TIME)")
-            open_header_cell.font = Font(name="Arial", size=16, bold=True, color="FFFFFF")
-            open_header_cell.fill = PatternFill(start_color="E91E63", end_color="E91E63", fill_type="solid")
-            open_header_cell.alignment = Alignment(horizontal="center")
-            results_sheet.merge_cells(f"A{row}:F{row}")
+            report.put(row, 1, "📊 OPEN TRADES SUMMARY (REAL-TIME)", "results_section_open")
+            report.merge(f"A{row}:F{row}")
             row += 2
             
             # Get updated open trades data
@@ -2032,58 +2004,32 @@ class TradeTrackerApp:
             for metric_name, value, metric_type in metrics_data:
                 if metric_type == "header":
                     # Section header
-                    header_cell = results_sheet.cell(row=row, column=1, value=metric_name)
-                    header_cell.font = Font(name="Arial", size=13, bold=True, color="FFFFFF")
-                    header_cell.fill = PatternFill(start_color="607D8B", end_color="607D8B", fill_type="solid")
-                    header_cell.alignment = Alignment(horizontal="center")
-                    results_sheet.merge_cells(f"A{row}:C{row}")
+                    report.put(row, 1, metric_name, "results_group_header")
+                    report.merge(f"A{row}:C{row}")
                     row += 1
                 elif metric_type == "spacer":
                     row += 1
                 else:
                     # Metric name
-                    name_cell = results_sheet.cell(row=row, column=1, value=metric_name)
-                    name_cell.font = Font(name="Arial", size=11, bold=True)
-                    name_cell.fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
+                    report.put(row, 1, metric_name, "results_metric_name")
                     
                     # Value with appropriate formatting and colors
-                    value_cell = results_sheet.cell(row=row, column=2, value=value)
-                    value_cell.font = Font(name="Arial", size=11, bold=True)
-                    
                     if metric_type == "currency":
-                        value_cell.number_format = "$#,##0.00"
-                        if value > 0:
-                            value_cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
+                        report.put(row, 2, value, "results_bold_good" if value > 0 else "results_label", MONEY)
                     elif metric_type == "percent":
-                        value_cell.number_format = "0.0%"
-                        if value > 0:
-                            value_cell.font = Font(name="Arial", size=11, bold=True, color="006400")
-                            value_cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-                        elif value < 0:
-                            value_cell.font = Font(name="Arial", size=11, bold=True, color="CC0000")
-                            value_cell.fill = PatternFill(start_color="FFF2F2", end_color="FFF2F2", fill_type="solid")
+                        report.put(row, 2, value, signed_style(value, "results_up", "results_down", "results_label"), PERCENT)
                     elif metric_type == "pl":
-                        value_cell.number_format = "$#,##0.00"
-                        if value > 0:
-                            value_cell.font = Font(name="Arial", size=11, bold=True, color="006400")
-                            value_cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-                        elif value < 0:
-                            value_cell.font = Font(name="Arial", size=11, bold=True, color="CC0000")
-                            value_cell.fill = PatternFill(start_color="FFF2F2", end_color="FFF2F2", fill_type="solid")
+                        report.put(row, 2, value, signed_style(value, "results_up", "results_down", "results_label"), MONEY)
                     elif metric_type == "count":
-                        value_cell.font = Font(name="Arial", size=11, bold=True, color="1F4E79")
-                        value_cell.fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
+                        report.put(row, 2, value, "results_count")
                     
                     row += 1
             
             row += 2
             
             # --- SECTION 3: POSITION BREAKDOWN ---
-            breakdown_header = results_sheet.cell(row=row, column=1, value="📋 POSITION TYPE BREAKDOWN")
-            breakdown_header.font = Font(name="Arial", size=14, bold=True, color="FFFFFF")
-            breakdown_header.fill = PatternFill(start_color="9C27B0", end_color="9C27B0", fill_type="solid")
-            breakdown_header.alignment = Alignment(horizontal="center")
-            results_sheet.merge_cells(f"A{row}:D{row}")
+            report.put(row, 1, "📋 POSITION TYPE BREAKDOWN", "results_section_positions")
+            report.merge(f"A{row}:D{row}")
             row += 2
             
             # Position breakdown
@@ -2092,75 +2038,42 @@ class TradeTrackerApp:
             # Headers
             breakdown_headers = ["Position Type", "Count", "Investment", "Current Value"]
             for col, header in enumerate(breakdown_headers, 1):
-                cell = results_sheet.cell(row=row, column=col, value=header)
-                cell.font = Font(name="Arial", size=11, bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="607D8B", end_color="607D8B", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
+                report.put(row, col, header, "results_position_header")
             row += 1
             
             # Position data
             for pos_type, data in position_breakdown.items():
-                results_sheet.cell(row=row, column=1, value=pos_type).font = Font(name="Arial", size=10)
-                results_sheet.cell(row=row, column=2, value=data['count']).font = Font(name="Arial", size=10)
-                
-                inv_cell = results_sheet.cell(row=row, column=3, value=data['investment'])
-                inv_cell.number_format = "$#,##0.00"
-                inv_cell.font = Font(name="Arial", size=10)
-                
-                val_cell = results_sheet.cell(row=row, column=4, value=data['current_value'])
-                val_cell.number_format = "$#,##0.00"
-                val_cell.font = Font(name="Arial", size=10)
-                
+                report.put(row, 1, pos_type, "results_row")
+                report.put(row, 2, data['count'], "results_row")
+                report.put(row, 3, data['investment'], "results_row", MONEY)
+                report.put(row, 4, data['current_value'], "results_row", MONEY)
                 row += 1
             
-            # Auto-adjust column widths
-            for col in range(1, 7):
-                max_length = 0
-                column = results_sheet.column_dimensions[chr(64 + col)]
-                for row_cells in results_sheet.iter_rows():
-                    try:
-                        if len(str(row_cells[col-1].value)) > max_length:
-                            max_length = len(str(row_cells[col-1].value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 25)
-                column.width = adjusted_width
+            # Column widths from the collected values; borders come with the named styles
+            report.auto_width(6)
             
-            # Add borders to all cells with content
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
-            
-            for row_cells in results_sheet.iter_rows():
-                for cell in row_cells:
-                    if cell.value is not None:
-                        cell.border = thin_border
-            
-            wb.save(excel_filename)
-            wb.close()
-            
-            messagebox.showinfo("Results Generated", "Comprehensive trading results with real-time data have been generated in the 'Results' sheet!")
+            # Create or clear Results sheet
+            check_cancelled()
+            report.write_to(wb_session.create_sheet("Results", replace=True))
+            wb_session.commit()
             
         except Exception as e:
-            messagebox.showerror("Results Error", f"Could not generate results.\n{e}")
             print(f"Results generation error: {e}")
             import traceback
             traceback.print_exc()
+            raise
 
-    def update_current_prices_for_all_trades(self):
+    @workbook_action(EXCEL_FILENAME)
+    def update_current_prices_for_all_trades(self, reload_gui=True):
         """Update current prices for all open trades in Excel"""
         try:
             excel_filename = "Put Transactions.xlsx"
-            wb = load_workbook(excel_filename)
+            wb_session = get_workbook_session(excel_filename)
             
-            if "Open_Trades_2025" not in wb.sheetnames:
-                wb.close()
+            if "Open_Trades_2025" not in wb_session.sheetnames:
                 return
             
-            ws = wb["Open_Trades_2025"]
+            ws = wb_session.edit("Open_Trades_2025")
             headers = [cell.value for cell in ws[1]]
             
             # Find relevant columns
@@ -2172,7 +2085,6 @@ class TradeTrackerApp:
             
             if not all([ticker_col, current_price_col, cost_col, shares_col]):
                 print("Could not find required columns for price update")
-                wb.close()
                 return
             
             updated_count = 0
@@ -2205,11 +2117,11 @@ class TradeTrackerApp:
                     print(f"Could not get price for {ticker}: {price_error}")
                     continue
             
-            wb.save(excel_filename)
-            wb.close()
+            wb_session.commit()
             
-            # Reload the GUI data to reflect updates
-            self.load_open_trades_from_excel()
+            # Reload the GUI data to reflect updates (the caller does it when running in the background)
+            if reload_gui:
+                self.load_open_trades_from_excel()
             
             print(f"Successfully updated prices for {updated_count} trades")
             
@@ -2273,109 +2185,15 @@ class TradeTrackerApp:
         
         return stats
 
-    def get_closed_trades_data(self):
-        """Get all closed trades data from Excel"""
+    def get_closed_trades_analytics(self):
+        """Closed trades aggregated by year, month, symbol and strategy (recomputed only when the sheet changes)"""
+        excel_filename = "Put Transactions.xlsx"
         try:
-            excel_filename = "Put Transactions.xlsx"
-            wb = load_workbook(excel_filename)
-            
-            if "Closed_Trades_2025" not in wb.sheetnames:
-                wb.close()
-                return []
-            
-            closed_sheet = wb["Closed_Trades_2025"]
-            headers = [cell.value for cell in closed_sheet[1]]
-            
-            closed_trades = []
-            for row in range(2, closed_sheet.max_row + 1):
-                trade = {}
-                for col, header in enumerate(headers, 1):
-                    value = closed_sheet.cell(row=row, column=col).value
-                    app_col = EXCEL_TO_APP_COLS.get(header, header)
-                    trade[app_col] = value
-                closed_trades.append(trade)
-            
-            wb.close()
-            return closed_trades
-            
+            return load_closed_trade_analytics(excel_filename, rename=EXCEL_TO_APP_COLS,
+                                               session=get_workbook_session(excel_filename))
         except Exception as e:
             print(f"Error getting closed trades data: {e}")
-            return []
-
-    def calculate_yearly_stats(self, closed_data):
-        """Calculate yearly statistics from closed trades including win rate"""
-        from datetime import datetime
-        yearly_stats = {}
-        
-        for trade in closed_data:
-            try:
-                # Get close date
-                close_date = trade.get('Close Date', '')
-                if not close_date:
-                    continue
-                
-                # Parse date to get year
-                if hasattr(close_date, 'year'):
-                    year = close_date.year
-                else:
-                    # Parse string date
-                    date_str = str(close_date).split()[0]
-                    for fmt in ["%m/%d/%Y", "%Y-%m-%d", "%m-%d-%Y"]:
-                        try:
-                            dt = datetime.strptime(date_str, fmt)
-                            year = dt.year
-                            break
-                        except:
-                            continue
-                    else:
-                        continue
-                
-                if year not in yearly_stats:
-                    yearly_stats[year] = {
-                        'total_pl': 0, 
-                        'total_percent': 0, 
-                        'trade_count': 0,
-                        'winning_trades': 0,
-                        'losing_trades': 0
-                    }
-                
-                # Add P&L
-                pl = trade.get('Realized P/L', 0) or 0
-                if isinstance(pl, str):
-                    pl = float(pl.replace('$', '').replace(',', ''))
-                yearly_stats[year]['total_pl'] += pl
-                
-                # Count wins/losses
-                if pl > 0:
-                    yearly_stats[year]['winning_trades'] += 1
-                elif pl < 0:
-                    yearly_stats[year]['losing_trades'] += 1
-                
-                # Add P&L percentage
-                pl_percent = trade.get('P&L %', 0) or 0
-                if isinstance(pl_percent, str):
-                    pl_percent = float(pl_percent.replace('%', ''))
-                elif isinstance(pl_percent, float) and pl_percent < 1:
-                    # Convert decimal to percentage
-                    pl_percent = pl_percent * 100
-                yearly_stats[year]['total_percent'] += pl_percent
-                
-                yearly_stats[year]['trade_count'] += 1
-                
-            except Exception as e:
-                print(f"Error processing trade for yearly stats: {e}")
-                continue
-        
-        # Calculate averages and win rates
-        for year, stats in yearly_stats.items():
-            if stats['trade_count'] > 0:
-                stats['avg_percent'] = stats['total_percent'] / stats['trade_count'] / 100
-                stats['win_rate'] = stats['winning_trades'] / stats['trade_count']
-            else:
-                stats['avg_percent'] = 0
-                stats['win_rate'] = 0
-        
-        return yearly_stats
+            return compute_analytics(None)
 
     def calculate_open_trades_stats(self):
         """Calculate statistics for open trades"""
@@ -7,6 +7,7 @@ from playsound import playsound
 import csv
 import re
 import pandas as pd
+from gui_tasks import get_task_runner
 
 
 # --- CONFIG ---
@@ -354,8 +355,12 @@ class SignalGUI:
         self.update_signal()
 
     def update_signal(self):
+        # Quotes are fetched on a worker; the window keeps responding until they arrive
+        get_task_runner().submit(self.root, get_signal, name="update_signal",
+                                 on_done=self.show_signal, on_error=self.show_signal_error)
+
+    def show_signal(self, signal):
         try:
-            signal = get_signal()
             open_info = signal.get("OpenInfo")
             open_label = ""
             if open_info and open_info[0] and open_info[1] is not None:
@@ -394,6 +399,10 @@ class SignalGUI:
         # Schedule next refresh
         self.root.after(REFRESH_SECONDS * 1000, self.update_signal)
 
+    def show_signal_error(self, e):
+        self.labels[0].config(text=f"Error: {e}")
+        self.root.after(REFRESH_SECONDS * 1000, self.update_signal)
+
 class TradeLogGUI:
     def __init__(self, root):
         self.root = root
@@ -401,8 +410,24 @@ class TradeLogGUI:
         self.root.minsize(900, 400)
         self.frm = tk.Frame(root, padx=40, pady=20, bg="#222244")
         self.frm.pack(fill="both", expand=True)
-        self.build_summary()  # <-- KEEP this line here
-        self.build_table()
+        self.loading_label = tk.Label(self.frm, text="Loading trade log...", font=("Arial", 14), fg="#fff", bg="#222244")
+        self.loading_label.pack()
+        get_task_runner().submit(self.root, self.load_trades, name="load_trade_log",
+                                 on_done=self.show_trades, on_error=self.show_load_error)
+
+    def load_trades(self):
+        """Reads the trade log and pairs buys with sells (runs on a worker); None if nothing is logged"""
+        if not os.path.exists(TRADE_LOG_FILE):
+            return None
+        return self.calculate_trade_pairs(pd.read_csv(TRADE_LOG_FILE))
+
+    def show_trades(self, df):
+        self.loading_label.destroy()
+        self.build_summary(df)  # <-- KEEP this line here
+        self.build_table(df)
+
+    def show_load_error(self, e):
+        self.loading_label.config(text=f"Could not load trade log: {e}")
 
     def extract_float(self, val):
         if isinstance(val, (int, float)):
@@ -461,16 +486,11 @@ class TradeLogGUI:
         
         return df
 
-    def build_summary(self):
+    def build_summary(self, df):
         """Display total P/L and P/L by ticker at the top."""
-        import pandas as pd
-        import os
-        if not os.path.exists(TRADE_LOG_FILE):
+        if df is None:
             return
         
-        df = pd.read_csv(TRADE_LOG_FILE)
-        df = self.calculate_trade_pairs(df)
-        
         # Calculate totals
         total_pl = df["P&L"].sum()
         pl_by_ticker = df.groupby("Ticker")["P&L"].sum()
@@ -488,14 +508,11 @@ class TradeLogGUI:
         label = tk.Label(self.frm, text=summary_text, font=("Arial", 14, "bold"), fg="#fff", bg="#3572b0", pady=8)
         label.pack(fill="x", pady=(0, 10))
 
-    def build_table(self):
-        if not os.path.exists(TRADE_LOG_FILE):
+    def build_table(self, df):
+        if df is None:
             tk.Label(self.frm, text="No trades logged yet.", font=("Arial", 14), fg="#fff", bg="#222244").pack()
             return
         
-        df = pd.read_csv(TRADE_LOG_FILE)
-        df = self.calculate_trade_pairs(df)
-        
         # Format P&L columns for display
         df["P&L_Display"] = df["P&L"].apply(lambda x: f"${x:.2f}" if x != 0 else "")
         df["P&L %"] = df["P&L %"].fillna("")
@@ -0,0 +1,280 @@
+"""
+Batch inference over all candidate tickers from local minute bars.
+
+Builds one feature matrix for every candidate from bars already on disk (or in
+memory in day.py), runs a single predict_proba call for the whole batch and
+returns a scored frame. Bars are aligned into right-aligned (bars x tickers)
+arrays, so every indicator is one numpy/lfilter call covering all tickers.
+No network calls are made unless fetch_missing is requested.
+"""
+import os
+import threading
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from ai_features import BASE_FEATURE_COLUMNS
+from config import AI_PROB_THRESHOLD, AI_STOP_PERCENT, AI_TARGET_PERCENT, get_volatility_threshold
+from model_registry import get_active_model
+
+LOCAL_BARS_FILE = "historical_data.csv"
+LIVE_FEATURE_COLUMNS = BASE_FEATURE_COLUMNS + ["prev_close"]
+LOOKBACK = timedelta(days=2)
+MIN_BARS = 26  # Need enough data for MACD
+
+_bars_lock = threading.Lock()
+_bars_cache = {}  # abs path -> (mtime, DataFrame)
+
+
+def load_local_bars(path=LOCAL_BARS_FILE):
+    """Reads the local minute-bar store, re-reading only when the file changes."""
+    key = os.path.abspath(path)
+    if not os.path.exists(key):
+        return pd.DataFrame()
+    mtime = os.path.getmtime(key)
+    with _bars_lock:
+        cached = _bars_cache.get(key)
+        if cached is None or cached[0] != mtime:
+            bars = pd.read_csv(key, usecols=["Datetime", "Ticker", "Open", "High", "Low", "Close", "Volume"])
+            bars["Datetime"] = pd.to_datetime(bars["Datetime"], errors="coerce")
+            cached = (mtime, bars)
+            _bars_cache[key] = cached
+        return cached[1]
+
+
+def _aligned_arrays(bars, tickers, lookback=LOOKBACK, min_bars=MIN_BARS):
+    """
+    Returns (tickers, last_rows, matrices) where each matrix is (bars x tickers),
+    right-aligned on each ticker's latest bar and left-padded with NaN, holding
+    the bars within `lookback` of that ticker's latest bar. Duplicate timestamps
+    keep the last row; tickers with fewer than `min_bars` bars are dropped.
+    """
+    subset = bars[bars["Ticker"].isin(tickers)]
+    dt = subset["Datetime"]
+    if not pd.api.types.is_datetime64_any_dtype(dt):
+        dt = pd.to_datetime(dt, errors="coerce")
+    keep = dt.notna().to_numpy()
+    subset, dt = subset[keep], dt[keep]
+    if subset.empty:
+        return [], None, {}
+
+    codes, uniques = pd.factorize(subset["Ticker"])
+    dt_ns = dt.to_numpy().astype("datetime64[ns]").view("int64")
+    order = np.lexsort((dt_ns, codes))
+    codes, dt_ns = codes[order], dt_ns[order]
+
+    # Keep the last row for duplicate (ticker, minute) pairs
+    is_last = np.ones(len(order), dtype=bool)
+    is_last[:-1] = (codes[1:] != codes[:-1]) | (dt_ns[1:] != dt_ns[:-1])
+    order, codes, dt_ns = order[is_last], codes[is_last], dt_ns[is_last]
+
+    group_end = np.flatnonzero(np.r_[codes[1:] != codes[:-1], True])
+    last_seen = np.empty(len(uniques), dtype="int64")
+    last_seen[codes[group_end]] = dt_ns[group_end]
+    in_window = dt_ns > last_seen[codes] - pd.Timedelta(lookback).value
+    order, codes = order[in_window], codes[in_window]
+
+    counts = np.bincount(codes, minlength=len(uniques))
+    enough = counts >= min_bars
+    row_mask = enough[codes]
+    order, codes = order[row_mask], codes[row_mask]
+    if len(order) == 0:
+        return [], None, {}
+
+    # Renumber surviving tickers 0..K-1 and place each bar by its position from the end
+    new_code = np.cumsum(enough) - 1
+    col = new_code[codes]
+    kept_counts = counts[enough]
+    group_start = np.r_[0, np.cumsum(kept_counts)[:-1]]
+    depth = kept_counts.max()
+    row = depth - kept_counts[col] + (np.arange(len(col)) - group_start[col])
+
+    rows = subset.iloc[order].assign(Datetime=dt.iloc[order].to_numpy())
+    matrices = {}
+    for name in ("Open", "High", "Low", "Close", "Volume"):
+        matrix = np.full((depth, len(kept_counts)), np.nan)
+        matrix[row, col] = rows[name].to_numpy(dtype="float64")
+        matrices[name] = matrix
+    last_rows = rows.iloc[np.cumsum(kept_counts) - 1]
+    return list(uniques[enough]), last_rows, matrices
+
+
+def _ewm_mean(matrix, span, min_periods=0):
+    """
+    Column-wise equivalent of DataFrame.ewm(span=span, min_periods=min_periods).mean()
+    (adjust=True, ignore_na=False) computed with a linear filter instead of a Python loop.
+    """
+    decay = 1 - 2.0 / (span + 1)
+    valid = ~np.isnan(matrix)
+    num = lfilter([1.0], [1.0, -decay], np.where(valid, matrix, 0.0), axis=0)
+    den = lfilter([1.0], [1.0, -decay], valid.astype("float64"), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ema = num / den
+    ema[np.cumsum(valid, axis=0) < max(min_periods, 1)] = np.nan
+    return ema
+
+
+def _last_window(matrix, window):
+    return matrix[-window:]
+
+
+def build_live_feature_matrix(bars, tickers, lookback=LOOKBACK, min_bars=MIN_BARS):
+    """
+    Returns one row per ticker with the live model features for its latest bar,
+    plus the bar's datetime. Tickers with fewer than `min_bars` bars are skipped.
+    Values match ai_features.add_technical_indicators on each ticker's last row.
+    """
+    if bars is None or bars.empty:
+        return pd.DataFrame()
+    kept, last_rows, m = _aligned_arrays(bars, tickers, lookback, min_bars)
+    if not kept:
+        return pd.DataFrame()
+
+    close, volume = m["Close"], m["Volume"]
+    last_20 = _last_window(close, 20)
+    sma_20 = last_20.mean(axis=0)
+    std_20 = last_20.std(axis=0, ddof=1)
+
+    # RSI over the last 14 price changes (missing changes count as 0, like compute_rsi)
+    delta = np.diff(close[-15:], axis=0)
+    gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+    loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100 - (100 / (1 + gain / loss))
+
+    macd = _ewm_mean(close, 12, min_periods=12) - _ewm_mean(close, 26, min_periods=26)
+    macd_signal = _ewm_mean(macd, 9, min_periods=9)
+
+    features = pd.DataFrame({
+        "ticker": kept,
+        "open": last_rows["Open"].to_numpy(),
+        "high": last_rows["High"].to_numpy(),
+        "low": last_rows["Low"].to_numpy(),
+        "close": last_rows["Close"].to_numpy(),
+        "volume": last_rows["Volume"].to_numpy(),
+        "sma_5": _last_window(close, 5).mean(axis=0),
+        "sma_20": sma_20,
+        "ema_5": _ewm_mean(close, 5)[-1],
+        "ema_20": _ewm_mean(close, 20)[-1],
+        "rsi_14": rsi,
+        "returns": close[-1] / close[-2] - 1,
+        "bb_upper": sma_20 + 2 * std_20,
+        "bb_lower": sma_20 - 2 * std_20,
+        "vol_sma_20": _last_window(volume, 20).mean(axis=0),
+        "macd": macd[-1],
+        "macd_signal": macd_signal[-1],
+        "prev_close": close[-2],
+        "datetime": last_rows["Datetime"].to_numpy(),
+    })
+    # Keep the caller's ticker order
+    position = {t: i for i, t in enumerate(dict.fromkeys(tickers))}
+    features["_order"] = features["ticker"].map(position)
+    return features.sort_values("_order").drop(columns="_order").reset_index(drop=True)
+
+
+def calibrate_probabilities(raw_prob, volatility_ratio):
+    """
+    Vectorized version of the day-trading probability calibration.
+    High volatility = more uncertainty, low volatility = less opportunity;
+    both pull probabilities toward 50% and the result is clipped to [25%, 75%].
+    """
+    raw_prob = np.asarray(raw_prob, dtype="float64")
+    vol = np.asarray(volatility_ratio, dtype="float64")
+    optimal_vol_min = 0.01
+    optimal_vol_max = 0.03
+    excess_vol = np.minimum(vol - optimal_vol_max, 0.05)
+    confidence_factor = np.where(
+        vol < optimal_vol_min,
+        vol / optimal_vol_min * 0.7,
+        np.where(vol > optimal_vol_max, 1 - (excess_vol / 0.05) * 0.3, 0.95),
+    )
+    calibrated = 0.5 + (raw_prob - 0.5) * confidence_factor
+    return np.clip(calibrated, 0.25, 0.75)
+
+
+def _fetch_missing_bars(tickers, bars):
+    """Fetches two days of Schwab minute bars for tickers absent from the local store."""
+    from datetime import datetime
+    from schwab_data import fetch_minute_bars_for_range
+
+    have = set(bars["Ticker"].unique()) if not bars.empty else set()
+    end_dt = datetime.now()
+    fetched = []
+    for ticker in tickers:
+        if ticker in have:
+            continue
+        df = fetch_minute_bars_for_range(ticker, end_dt - LOOKBACK, end_dt)
+        if df is not None and not df.empty:
+            fetched.append(df)
+    if not fetched:
+        return bars
+    return pd.concat([bars] + fetched, ignore_index=True)
+
+
+def _store_features(feature_store, bars, tickers):
+    """Latest stored features per ticker after materializing any newly sealed bars."""
+    feature_store.update(bars)
+    features = feature_store.latest(tickers)
+    # Same minimum history as the live path: MACD needs MIN_BARS closes
+    return features.dropna(subset=["prev_close", "macd"]).reset_index(drop=True)
+
+
+def score_candidates(tickers, bars=None, model=None, model_path="ai_model.pkl", fetch_missing=False,
+                     feature_store=None):
+    """
+    Scores every candidate in one batch.
+    bars: minute bars (Datetime, Ticker, OHLCV); defaults to the local bar store.
+    feature_store: optional feature_store.FeatureStore; when given, features are
+    read from it (the same rows training uses) instead of recomputed from bars.
+    Returns a frame with ticker, probability, raw_probability, entry, target, stop,
+    recommendation, volatility, vol_threshold and the model features, sorted by
+    probability (highest first).
+    """
+    if bars is None:
+        bars = load_local_bars()
+    if fetch_missing:
+        bars = _fetch_missing_bars(tickers, bars)
+    if feature_store is not None:
+        features = _store_features(feature_store, bars, tickers)
+    else:
+        features = build_live_feature_matrix(bars, tickers)
+    if features.empty:
+        return pd.DataFrame()
+
+    if model is None:
+        model = get_active_model("ai_model", fallback_path=model_path)
+    feature_cols = list(getattr(model, "feature_names_in_", LIVE_FEATURE_COLUMNS))
+    raw_prob = model.predict_proba(features[feature_cols])[:, 1]
+
+    close = features["close"].to_numpy(dtype="float64")
+    volatility = (features["high"] - features["low"]).to_numpy(dtype="float64") / close
+    vol_threshold = np.array([get_volatility_threshold(t) for t in features["ticker"]])
+    prob = calibrate_probabilities(raw_prob, volatility)
+    target = np.round(close * (1 + AI_TARGET_PERCENT), 2)
+    stop = np.round(close * (1 - AI_STOP_PERCENT), 2)
+
+    recommendation = np.where(
+        volatility < vol_threshold,
+        [f"❌ No trade — low volatility ({v:.3f} < {t:.3f})" for v, t in zip(volatility, vol_threshold)],
+        np.where(
+            prob >= AI_PROB_THRESHOLD,
+            [f"🔥 TRADE: Entry {e:.2f}, Target {tg:.2f}, Stop {s:.2f}" for e, tg, s in zip(close, target, stop)],
+            [f"❌ No trade (prob {p:.2%} < {AI_PROB_THRESHOLD:.2%})" for p in prob],
+        ),
+    )
+
+    scored = pd.DataFrame({
+        "ticker": features["ticker"],
+        "probability": prob,
+        "raw_probability": raw_prob,
+        "entry": close,
+        "target": target,
+        "stop": stop,
+        "recommendation": recommendation,
+        "volatility": volatility,
+        "vol_threshold": vol_threshold,
+    })
+    scored = pd.concat([scored, features[feature_cols].add_prefix("feat_")], axis=1)
+    return scored.sort_values("probability", ascending=False).reset_index(drop=True)
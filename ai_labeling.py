@@ -0,0 +1,105 @@
+"""
+Vectorized triple-barrier outcome labeling for AI training data.
+
+Same semantics as ai_module.label_barrier_outcomes: for each bar, look ahead up
+to `horizon` bars of the same ticker and label 1 if the close reaches the
+take-profit level before the stop level, 0 if the stop is reached first, and
+leave the row unlabeled if neither is hit. Instead of filtering the DataFrame
+per row, each ticker's closes are scanned as a (bars x horizon) window matrix in
+fixed-size chunks, so labeling is near-linear in the number of bars.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import AI_TARGET_PERCENT, AI_STOP_PERCENT
+
+DEFAULT_HORIZON = 30
+CHUNK_ROWS = 50_000  # Bounds the window matrix to CHUNK_ROWS x horizon floats
+
+
+def _first_true(mask):
+    """Index of the first True in each row of a 2-D mask, or -1 if there is none."""
+    first = mask.argmax(axis=1)
+    first[~mask.any(axis=1)] = -1
+    return first
+
+
+def barrier_labels(close, target_pct=AI_TARGET_PERCENT, stop_pct=AI_STOP_PERCENT, horizon=DEFAULT_HORIZON):
+    """
+    Labels a single ticker's close series.
+    Returns a float array with 1.0 (target first), 0.0 (stop first) or NaN (undetermined).
+    """
+    close = np.asarray(close, dtype="float64")
+    n = len(close)
+    labels = np.full(n, np.nan)
+    if n < 2 or horizon < 1:
+        return labels
+
+    # Pad with NaN so every bar has a full horizon of (possibly missing) future closes
+    padded = np.concatenate((close[1:], np.full(horizon, np.nan)))
+    windows = sliding_window_view(padded, horizon)[:n]
+
+    upper = close * (1 + target_pct)
+    lower = close * (1 - stop_pct)
+    for start in range(0, n, CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, n)
+        win = windows[start:stop]
+        up = upper[start:stop, None]
+        dn = lower[start:stop, None]
+
+        # Sliding max/min over the horizon rule out most bars without a search
+        missing = np.isnan(win)
+        win_max = np.where(missing, -np.inf, win).max(axis=1)
+        win_min = np.where(missing, np.inf, win).min(axis=1)
+        candidates = np.flatnonzero((win_max >= up[:, 0]) | (win_min <= dn[:, 0]))
+        if candidates.size == 0:
+            continue
+
+        sub = win[candidates]
+        hit_target = _first_true(sub >= up[candidates])
+        hit_stop = _first_true(sub <= dn[candidates])
+        # The target is checked before the stop on the same bar, so ties go to the target
+        target_first = (hit_target >= 0) & ((hit_stop < 0) | (hit_target <= hit_stop))
+        stop_first = (hit_stop >= 0) & ~target_first
+
+        chunk_labels = labels[start:stop]
+        chunk_labels[candidates[target_first]] = 1.0
+        chunk_labels[candidates[stop_first]] = 0.0
+    return labels
+
+
+def label_outcomes(df, target_pct=AI_TARGET_PERCENT, stop_pct=AI_STOP_PERCENT, horizon=DEFAULT_HORIZON,
+                   label_col="label", dropna=True):
+    """
+    Labels every row of a feature DataFrame with columns ticker, datetime, close.
+    Returns the frame sorted by ticker and datetime with a `label` column; rows
+    whose outcome could not be determined are dropped unless dropna=False.
+    """
+    df = df.sort_values(["ticker", "datetime"]).reset_index(drop=True)
+    close = df["close"].to_numpy()
+    labels = np.full(len(df), np.nan)
+    for idx in df.groupby("ticker", sort=False).indices.values():
+        labels[idx] = barrier_labels(close[idx], target_pct, stop_pct, horizon)
+    df[label_col] = labels
+    return df.dropna(subset=[label_col]) if dropna else df
+
+
+def label_outcome_grid(df, target_pcts, stop_pcts, horizons):
+    """
+    Labels the same frame under every (target, stop, horizon) combination.
+    Returns the sorted frame with one label column per setting, named
+    label_t{target}_s{stop}_h{horizon}, for barrier parameter sweeps.
+    """
+    df = df.sort_values(["ticker", "datetime"]).reset_index(drop=True)
+    groups = df.groupby("ticker", sort=False).indices
+    close = df["close"].to_numpy()
+    columns = {}
+    for target_pct in target_pcts:
+        for stop_pct in stop_pcts:
+            for horizon in horizons:
+                labels = np.full(len(df), np.nan)
+                for idx in groups.values():
+                    labels[idx] = barrier_labels(close[idx], target_pct, stop_pct, horizon)
+                columns[f"label_t{target_pct}_s{stop_pct}_h{horizon}"] = labels
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
@@ -0,0 +1,146 @@
+"""
+Model families for the AI trade model and an inference benchmark to choose between them.
+
+The production model is a deep RandomForest; "hist_gb" (histogram gradient
+boosting) and "shallow_forest" are compact alternatives that score a batch of
+candidates with far fewer node visits and a much smaller artifact. All families
+take the same feature frame, so retrain_model_from_feedback(model_family=...) and
+model_updater work with any of them.
+
+Benchmark (latency, size, accuracy and calibration on the newest labeled outcomes):
+    python ai_models.py
+    python ai_models.py --families random_forest hist_gb --output model_benchmark.csv
+"""
+import argparse
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss, roc_auc_score
+
+DEFAULT_MODEL_FAMILY = "random_forest"
+MODEL_FAMILIES = {
+    # Same settings retrain_model_from_feedback has always used
+    "random_forest": lambda: RandomForestClassifier(n_estimators=200, max_depth=6, random_state=42),
+    "hist_gb": lambda: HistGradientBoostingClassifier(
+        max_iter=100, max_leaf_nodes=15, learning_rate=0.1, early_stopping=False, random_state=42),
+    "shallow_forest": lambda: RandomForestClassifier(n_estimators=30, max_depth=4, random_state=42),
+}
+HOLDOUT_FRACTION = 0.25
+BATCH_ROWS = 30          # Roughly one minute's candidate list
+LATENCY_REPEATS = 50
+
+
+def make_model(family=DEFAULT_MODEL_FAMILY):
+    """Returns an unfitted classifier of the given family."""
+    if family not in MODEL_FAMILIES:
+        raise ValueError(f"Unknown model family '{family}'; choose from {sorted(MODEL_FAMILIES)}")
+    return MODEL_FAMILIES[family]()
+
+
+def model_size_bytes(model):
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _median_latency_ms(model, X, repeats=LATENCY_REPEATS):
+    model.predict_proba(X)  # Warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def expected_calibration_error(y, probs, bins=10):
+    """Weighted mean |observed win rate - mean predicted probability| over probability bins."""
+    y = np.asarray(y, dtype="float64")
+    probs = np.asarray(probs, dtype="float64")
+    idx = np.minimum((probs * bins).astype(int), bins - 1)
+    total = np.bincount(idx, minlength=bins)
+    hits = np.bincount(idx, weights=y, minlength=bins)
+    conf = np.bincount(idx, weights=probs, minlength=bins)
+    used = total > 0
+    return float(np.sum(np.abs(hits[used] - conf[used])) / len(y))
+
+
+def evaluate_model(model, X_test, y_test):
+    """Accuracy, calibration, size and predict_proba latency of a fitted model."""
+    probs = model.predict_proba(X_test)[:, 1]
+    batch = X_test.iloc[:BATCH_ROWS]
+    return {
+        "size_kb": round(model_size_bytes(model) / 1024, 1),
+        "latency_batch_ms": round(_median_latency_ms(model, batch), 3),
+        "latency_row_ms": round(_median_latency_ms(model, X_test.iloc[:1]), 3),
+        "accuracy": round(float(accuracy_score(y_test, (probs >= 0.5).astype(int))), 4),
+        "log_loss": round(float(log_loss(y_test, probs, labels=[0, 1])), 4),
+        "brier": round(float(brier_score_loss(y_test, probs)), 4),
+        "ece": round(expected_calibration_error(y_test, probs), 4),
+        "roc_auc": round(float(roc_auc_score(y_test, probs)), 4) if len(set(y_test)) > 1 else np.nan,
+    }
+
+
+def benchmark_models(labeled_df, families=None, feature_cols=None, holdout_fraction=HOLDOUT_FRACTION,
+                     time_col="Open Datetime", extra_models=None):
+    """
+    Trains each family on the older part of a labeled-outcomes frame and evaluates
+    it on the newest `holdout_fraction` of rows. `extra_models` ({name: fitted model})
+    are evaluated on the same hold-out, e.g. the active production model.
+    Returns one row per model, fastest batch latency first.
+    """
+    from feedback_join import feature_columns
+
+    families = families or list(MODEL_FAMILIES)
+    df = labeled_df.sort_values(time_col, kind="mergesort") if time_col in labeled_df else labeled_df
+    feature_cols = feature_cols or feature_columns(df)
+    n_test = max(int(len(df) * holdout_fraction), 1)
+    train, test = df.iloc[:-n_test], df.iloc[-n_test:]
+    X_train, y_train = train[feature_cols], train["label"].astype(int)
+    X_test, y_test = test[feature_cols], test["label"].astype(int)
+
+    rows = []
+    for family in families:
+        model = make_model(family)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        rows.append({"model": family, "fit_s": round(fit_seconds, 2), **evaluate_model(model, X_test, y_test)})
+    for name, model in (extra_models or {}).items():
+        try:
+            rows.append({"model": name, "fit_s": np.nan, **evaluate_model(model, X_test, y_test)})
+        except (ValueError, KeyError) as e:
+            print(f"⚠️ Skipping {name}: {e}")
+
+    results = pd.DataFrame(rows).sort_values("latency_batch_ms").reset_index(drop=True)
+    results.attrs.update(train_rows=len(train), test_rows=len(test))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark AI model families on held-out outcomes")
+    parser.add_argument("--families", nargs="+", default=list(MODEL_FAMILIES), choices=list(MODEL_FAMILIES))
+    parser.add_argument("--dataset", help="Labeled-outcomes file (default: rebuild from the prediction journal)")
+    parser.add_argument("--output", help="Optional CSV path for the results table")
+    args = parser.parse_args()
+
+    from feedback_join import build_labeled_outcomes, load_labeled_outcomes
+    from model_registry import get_active_model
+
+    labeled = load_labeled_outcomes(args.dataset) if args.dataset else build_labeled_outcomes()
+    if labeled.empty or labeled["label"].nunique() < 2:
+        print("❌ Need labeled outcomes with both wins and losses to benchmark.")
+        raise SystemExit(1)
+
+    extra = {}
+    try:
+        extra["active"] = get_active_model("ai_model", fallback_path="ai_model.pkl")
+    except FileNotFoundError:
+        pass
+    results = benchmark_models(labeled, args.families, extra_models=extra)
+    print(f"📊 Trained on {results.attrs['train_rows']} outcomes, evaluated on the newest {results.attrs['test_rows']}")
+    print(results.to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"💾 Saved benchmark to {args.output}")
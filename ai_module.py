@@ -2,6 +2,7 @@ import pandas as pd
 from data_provider import get_yahoo_intraday
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 import joblib  # For saving/loading models
 from sklearn.model_selection import train_test_split
@@ -20,6 +21,17 @@ import tkinter as tk
 from tkinter import ttk
 import matplotlib.pyplot as plt
 import seaborn as sns
+from ai_features import add_enrichment_features
+from feature_store import get_feature_store
+from daily_bar_sync import sync_daily_bars
+from ai_labeling import label_outcomes
+from ai_models import DEFAULT_MODEL_FAMILY, MODEL_FAMILIES, make_model
+from model_registry import get_active_model, register_model
+from ai_inference import score_candidates
+from prediction_journal import JOURNAL_DIR as PREDICTION_JOURNAL_DIR, get_journal
+from feedback_join import build_labeled_outcomes, feature_columns
+
+AI_MODEL_NAME = "ai_model"
 
 
 
@@ -128,31 +140,10 @@ def compute_macd(series, fast=12, slow=26, signal=9):
 def update_historical_daily_data(tickers, filename="historical_daily_data.csv", years_back=5):
     """
     Ensures historical_daily_data.csv contains as much daily data as possible for each ticker.
-    Downloads only missing data and appends it.
+    Fetches only the sessions after each ticker's last stored date and appends them;
+    a ticker is refetched in full only when its overlap window shows a split or adjustment.
     """
-    if os.path.exists(filename):
-        df_full = pd.read_csv(filename, parse_dates=["Datetime"])
-    else:
-        df_full = pd.DataFrame()
-
-    for ticker in tickers:
-        print(f"Updating daily historical data for {ticker}...")
-        # Always fetch the full range for now, since Schwab returns all available data for the period
-        new_data = fetch_daily_bars_for_range(ticker, years_back=years_back)
-        if new_data is not None and not new_data.empty:
-            print(f"Fetched {len(new_data)} new daily rows for {ticker}")
-            df_full = pd.concat([df_full, new_data], ignore_index=True)
-            df_full = df_full.drop_duplicates(subset=["Datetime", "Ticker"])
-        else:
-            print(f"No new daily data for {ticker}")
-
-    if not df_full.empty:
-        df_full = df_full.sort_values(["Ticker", "Datetime"])
-        df_full.to_csv(filename, index=False)
-        print(f"Saved updated daily historical data to {filename}")
-    else:
-        print("No daily historical data available to save.")
-    return df_full
+    return sync_daily_bars(tickers, filename=filename, years_back=years_back)
 
 def update_historical_minute_data(tickers, filename="historical_minute_data.csv", days_back=5):
     """
@@ -194,6 +185,8 @@ def extract_features_from_historical(df, news_df=None, whale_df=None, congress_d
     """
     Computes features for each ticker from a historical DataFrame.
     Optionally merges in news, whale, congress, and institutional features.
+    Reference (row-by-row) implementation; use ai_features.build_training_features
+    for large histories.
     """
     features = []
     grouped = df.groupby("Ticker")
@@ -281,6 +274,7 @@ def label_barrier_outcomes(df, target_pct=0.02, stop_pct=0.01, max_lookahead=30)
     """
     For each row, label as 1 if target is hit before stop, 0 if stop is hit first.
     Assumes df is sorted by ticker and datetime.
+    Reference implementation; ai_labeling.label_outcomes is the vectorized equivalent.
     """
     df = df.sort_values(["ticker", "datetime"]).reset_index(drop=True)
     labels = []
@@ -318,12 +312,16 @@ def normalize_features(df):
     df[features] = scaler.fit_transform(df[features])
     return df
 
-def train_ranking_model(X, y):
+def train_ranking_model(X, y, model_family=None):
     """
     Trains a simple classifier (e.g., RandomForest).
+    model_family: optional ai_models family name (e.g. "hist_gb") for a compact model.
     """
     from sklearn.ensemble import RandomForestClassifier
-    clf = RandomForestClassifier(n_estimators=100, random_state=42)
+    if model_family:
+        clf = make_model(model_family)
+    else:
+        clf = RandomForestClassifier(n_estimators=100, random_state=42)
     clf.fit(X, y)
     return clf
 
@@ -388,8 +386,7 @@ def get_ticker_ranking(live_tickers, model_path="ai_model.pkl"):
     """
     Loads the saved model and predicts/ranks live tickers using real-time data.
     """
-    import joblib
-    clf = joblib.load(model_path)
+    clf = get_active_model(AI_MODEL_NAME, fallback_path=model_path)
     live_df = extract_features(live_tickers, period="2d", interval="1m")  # Adjust as needed
     if live_df.empty:
         print("No live data available for ranking.")
@@ -406,8 +403,6 @@ def print_trade_recommendations(tickers, model_path="ai_model.pkl", prob_thresho
     For each ticker, print the probability of going up, entry/exit suggestion,
     or 'No trade' if probability is too low.
     """
-    import joblib
-
     # You need to implement this to get the latest features for each ticker
     live_df = extract_features(tickers, period="2d", interval="1m")
     if live_df.empty:
@@ -418,7 +413,7 @@ def print_trade_recommendations(tickers, model_path="ai_model.pkl", prob_thresho
     latest = live_df.groupby("ticker").tail(1)
     X_live = latest.drop(columns=["label", "ticker", "datetime"], errors="ignore")
 
-    clf = joblib.load(model_path)
+    clf = get_active_model(AI_MODEL_NAME, fallback_path=model_path)
     probs = clf.predict_proba(X_live)
 
     print("\nTrade Recommendations:")
@@ -434,11 +429,11 @@ def print_trade_recommendations(tickers, model_path="ai_model.pkl", prob_thresho
         else:
             print(f"{ticker}: Probability up = {prob_up:.2%} | No trade for {ticker} today (probability below threshold)")
 
-def log_prediction(ticker, entry_time, features, predicted_prob, outcome=None, log_path="prediction_log.csv"):
+def prediction_record(ticker, entry_time, features, predicted_prob, outcome=None):
     """
-    Logs model prediction, features, and (optional) outcome for later review/training.
+    Builds one prediction log row.
     """
-    row = {
+    return {
         "Ticker": ticker,
         "Datetime": entry_time.strftime("%Y-%m-%d %H:%M:%S"),
         "Predicted_Prob": predicted_prob,
@@ -446,71 +441,65 @@ def log_prediction(ticker, entry_time, features, predicted_prob, outcome=None, l
         **features
     }
 
-    # Write header only if file doesn't exist
-    write_header = not os.path.exists(log_path)
-    with open(log_path, "a", newline='', encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=row.keys())
-        if write_header:
-            writer.writeheader()
-        writer.writerow(row)
+def log_predictions(records, log_path=PREDICTION_JOURNAL_DIR):
+    """
+    Buffers a batch of prediction rows in the prediction journal (flushed in batches).
+    """
+    get_journal(log_path).append(records)
+
+def log_prediction(ticker, entry_time, features, predicted_prob, outcome=None, log_path=PREDICTION_JOURNAL_DIR):
+    """
+    Logs model prediction, features, and (optional) outcome for later review/training.
+    """
+    log_predictions([prediction_record(ticker, entry_time, features, predicted_prob, outcome)], log_path=log_path)
 
 def retrain_model_from_feedback(
-    prediction_log_path="prediction_log.csv",
+    prediction_log_path=PREDICTION_JOURNAL_DIR,
     trade_log_path="trade_log.xlsx",
-    model_output_path="ai_model_updated.pkl"
+    model_output_path="ai_model_updated.pkl",
+    model_family=DEFAULT_MODEL_FAMILY
 ):
-        # Load prediction log
-    preds_df = pd.read_csv(prediction_log_path, parse_dates=["Datetime"])
     trade_df = pd.read_excel(trade_log_path, parse_dates=["Open Datetime"])
-
-    # Clean casing
-    preds_df["Ticker"] = preds_df["Ticker"].str.upper()
     trade_df["Ticker"] = trade_df["Ticker"].str.upper()
 
-    matched = []
-    for _, trade in trade_df.iterrows():
-        tkr = trade["Ticker"]
-        open_time = trade["Open Datetime"]
-        outcome = trade["Profit/Loss"]
-        label = 1 if outcome > 0 else 0
-
-        # Match predictions within ±10 min of entry
-        candidates = preds_df[(preds_df["Ticker"] == tkr) & 
-                              (abs(preds_df["Datetime"] - open_time) <= pd.Timedelta(minutes=10))]
-        if not candidates.empty:
-            row = candidates.iloc[0].drop(["Ticker", "Datetime", "Predicted_Prob", "Outcome"])
-            feat = row.to_dict()
-            matched.append({**feat, "label": label})
-
-    if not matched:
+    # Match each trade to the nearest prediction within ±10 min of entry
+    df_train = build_labeled_outcomes(prediction_log_path, trade_df=trade_df)
+    if df_train.empty:
         print("No matching trades found for retraining.")
         return
 
-    df_train = pd.DataFrame(matched)
-    features = df_train.drop(columns=["label"])
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(features)
+    features = df_train[feature_columns(df_train)]
     y = df_train["label"]
 
-    # Train model
-    clf = RandomForestClassifier(n_estimators=200, max_depth=6, random_state=42)
-    clf.fit(X_scaled, y)
+    # Train model (ai_models.MODEL_FAMILIES; "hist_gb" / "shallow_forest" are compact alternatives).
+    # The scaler travels with the model so inference and warm-start updates see the same inputs.
+    clf = Pipeline([("scale", StandardScaler()), ("model", make_model(model_family))])
+    clf.fit(features, y)
     
     # Show feature importance
     feature_names = features.columns.tolist()
     # Pass trade_df for strategy breakdown
-    show_feature_importance(clf, feature_names, trade_df)
+    show_feature_importance(clf[-1], feature_names, trade_df)
 
     joblib.dump(clf, model_output_path)
 
     # Performance stats
-    preds = clf.predict(X_scaled)
+    preds = clf.predict(features)
     acc = accuracy_score(y, preds)
     report = classification_report(y, preds, output_dict=True)
     class_0 = report["0"]
     class_1 = report["1"]
 
-    plot_accuracy_over_time("prediction_log.csv", "trade_log.xlsx")
+    # Version the retrained model; it serves predictions only after promotion
+    version = register_model(AI_MODEL_NAME, clf, metadata={
+        "source": "retrain_model_from_feedback",
+        "model_family": model_family,
+        "features": feature_names,
+        "training_window": [str(df_train["Open Datetime"].min()), str(df_train["Open Datetime"].max())],
+        "metrics": {"train_accuracy": round(acc, 4), "samples": len(df_train)},
+    })
+
+    plot_accuracy_over_time(prediction_log_path, trade_log_path)
     plot_cumulative_pl("trade_log.xlsx")
     
     # --- GUI Display ---
@@ -524,7 +513,7 @@ def retrain_model_from_feedback(
     ✅ Accuracy: {acc:.2%}
     📊 Class 0 (Losses): Precision {class_0['precision']:.2f}, Recall {class_0['recall']:.2f}
     📈 Class 1 (Wins): Precision {class_1['precision']:.2f}, Recall {class_1['recall']:.2f}
-    💾 Saved To: {model_output_path}
+    💾 Saved To: {model_output_path} (registry v{version})
     """
 
     label = ttk.Label(root, text=summary.strip(), justify="left", font=("Segoe UI", 10), anchor="w")
@@ -537,18 +526,22 @@ def retrain_model_from_feedback(
 def show_feature_importance(model, feature_names, trade_df=None):
     """
     Plots a bar chart of feature importance from a trained model.
+    Skipped for families without feature_importances_ (e.g. hist_gb).
     """
-    importances = model.feature_importances_
-    sorted_idx = importances.argsort()[::-1]
-    sorted_features = [feature_names[i] for i in sorted_idx]
-    sorted_importances = importances[sorted_idx]
-
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x=sorted_importances, y=sorted_features, palette="viridis")
-    plt.title("Feature Importance (Random Forest)", fontsize=14)
-    plt.xlabel("Importance Score")
-    plt.tight_layout()
-    plt.show()
+    importances = getattr(model, "feature_importances_", None)
+    if importances is None:
+        print(f"ℹ️ {type(model).__name__} has no feature importances; skipping the chart.")
+    else:
+        sorted_idx = importances.argsort()[::-1]
+        sorted_features = [feature_names[i] for i in sorted_idx]
+        sorted_importances = importances[sorted_idx]
+
+        plt.figure(figsize=(10, 6))
+        sns.barplot(x=sorted_importances, y=sorted_features, palette="viridis")
+        plt.title(f"Feature Importance ({type(model).__name__})", fontsize=14)
+        plt.xlabel("Importance Score")
+        plt.tight_layout()
+        plt.show()
 
     # Strategy accuracy breakdown
     if trade_df is not None and "Strategy" in trade_df.columns:
@@ -565,33 +558,20 @@ def show_feature_importance(model, feature_names, trade_df=None):
         plt.tight_layout()
         plt.show()
 
-def plot_accuracy_over_time(prediction_log_path="prediction_log.csv", trade_log_path="trade_log.xlsx"):
+def plot_accuracy_over_time(prediction_log_path=PREDICTION_JOURNAL_DIR, trade_log_path="trade_log.xlsx"):
     """
     Plots daily win/loss accuracy based on matched trades and predictions.
     """
     
-    preds_df = pd.read_csv(prediction_log_path, parse_dates=["Datetime"])
     trades_df = pd.read_excel(trade_log_path, parse_dates=["Open Datetime"])
-
-    preds_df["Ticker"] = preds_df["Ticker"].str.upper()
     trades_df["Ticker"] = trades_df["Ticker"].str.upper()
-
-    outcomes = []
-    for _, trade in trades_df.iterrows():
-        tkr = trade["Ticker"]
-        time = trade["Open Datetime"]
-        label = 1 if trade["Profit/Loss"] > 0 else 0
-        match = preds_df[(preds_df["Ticker"] == tkr) & (abs(preds_df["Datetime"] - time) <= pd.Timedelta(minutes=10))]
-        if not match.empty:
-            trade_day = time.date()
-            outcomes.append({"date": trade_day, "label": label})
-
-    if not outcomes:
+    matched = build_labeled_outcomes(prediction_log_path, trade_df=trades_df, output_path=None)
+    if matched.empty:
         print("No matches found for accuracy tracking.")
         return
 
-    df_acc = pd.DataFrame(outcomes)
-    daily = df_acc.groupby("date")["label"].mean()
+    outcomes = pd.DataFrame({"date": matched["Open Datetime"].dt.date, "label": matched["label"]})
+    daily = outcomes.groupby("date")["label"].mean()
 
     plt.figure(figsize=(8, 5))
     plt.plot(daily.index, daily.values, marker="o", linewidth=2)
@@ -646,125 +626,49 @@ def get_trade_recommendations(
     model_path="ai_model.pkl",
     prob_threshold=0.55,  # Lowered from 0.6
     return_df=False,
-    log_path="prediction_log.csv",
-    volatility_settings=None  # New parameter
+    log_path=PREDICTION_JOURNAL_DIR,
+    volatility_settings=None,  # New parameter
+    bars=None,
+    fetch_missing=True,
+    feature_store=None
 ):
     """
     For each ticker, compute the probability of going up, entry/exit suggestion,
     and a trade recommendation. Returns a DataFrame for further use.
+    Uses the registry's active ai_model version if one is promoted, else model_path.
+    Features come from `bars` (e.g. day.py's historical_data) or the local bar store
+    and are scored in one batch; only tickers missing locally are fetched from Schwab.
+    Pass feature_store (feature_store.get_feature_store()) to serve the stored features.
     """
-    import joblib
-    from config import get_volatility_threshold, AI_PROB_THRESHOLD, AI_TARGET_PERCENT, AI_STOP_PERCENT
+    from config import AI_PROB_THRESHOLD
 
-    live_df = extract_features(tickers, period="2d", interval="1m")
-    if live_df.empty:
+    df_results = score_candidates(tickers, bars=bars, model_path=model_path, fetch_missing=fetch_missing,
+                                  feature_store=feature_store)
+    if df_results.empty:
         print("No live data available for trade recommendations.")
         return pd.DataFrame() if return_df else None
 
-    # Use only the latest row per ticker
-    latest = live_df.groupby("ticker").tail(1)
-    X_live = latest.drop(columns=["ticker"], errors="ignore")
-
-    clf = joblib.load(model_path)
-    probs = clf.predict_proba(X_live)
-
-    # **IMPROVED: Calibrate probabilities to be more realistic for day trading**
-    def calibrate_probability(raw_prob, volatility_ratio):
-        """
-        Calibrate AI probabilities to be more realistic for day trading.
-        High volatility = more uncertainty = lower confidence
-        Low volatility = less opportunity = lower confidence
-        """
-        # Optimal volatility range for day trading ETFs is 0.01-0.03 (1-3%)
-        optimal_vol_min = 0.01
-        optimal_vol_max = 0.03
-        
-        if volatility_ratio < optimal_vol_min:
-            # Too low volatility - reduce confidence significantly
-            confidence_factor = volatility_ratio / optimal_vol_min * 0.7  # Max 70% of original
-        elif volatility_ratio > optimal_vol_max:
-            # Too high volatility - reduce confidence due to uncertainty
-            excess_vol = min(volatility_ratio - optimal_vol_max, 0.05)  # Cap at 5% excess
-            confidence_factor = 1 - (excess_vol / 0.05) * 0.3  # Reduce up to 30%
-        else:
-            # Optimal volatility range - keep most confidence
-            confidence_factor = 0.95
-        
-        # Apply calibration - pull probabilities toward 50% (neutral)
-        calibrated = 0.5 + (raw_prob - 0.5) * confidence_factor
-        
-        # Additional realism: day trading should rarely exceed 75% confidence
-        calibrated = min(calibrated, 0.75)
-        calibrated = max(calibrated, 0.25)  # Never go below 25%
-        
-        return calibrated
-
-    results = []
-    for i, ticker in enumerate(latest["ticker"]):
-        raw_prob_up = probs[i][1]
-        current_price = latest.iloc[i]["close"]
-        
-        # Calculate volatility metrics (use actual volatility from recent returns)
-        # Use the returns column that was already calculated in extract_features
-        try:
-            ticker_returns = live_df[live_df["ticker"] == ticker]["returns"].dropna()
-            if len(ticker_returns) > 5:
-                # Use standard deviation of returns as volatility measure
-                range_pct = ticker_returns.std()
-            else:
-                # Fallback to single-bar range if insufficient return data
-                avg_range = latest.iloc[i]["high"] - latest.iloc[i]["low"] 
-                range_pct = avg_range / current_price
-        except:
-            # Final fallback to single-bar range
-            avg_range = latest.iloc[i]["high"] - latest.iloc[i]["low"]
-            range_pct = avg_range / current_price
-        
-        volatility_threshold = get_volatility_threshold(ticker)
-        
-        # **NEW: Apply probability calibration**
-        prob_up = calibrate_probability(raw_prob_up, range_pct)
-        
-        entry = current_price
-        target = round(entry * (1 + AI_TARGET_PERCENT), 2)
-        stop = round(entry * (1 - AI_STOP_PERCENT), 2)
-
-        # Debug output
-        print(f"🔍 {ticker}: Vol {range_pct:.3f} vs Thresh {volatility_threshold:.3f}")
-        print(f"    Raw Prob: {raw_prob_up:.2%} → Calibrated: {prob_up:.2%}")
-
-        # Decision logic
-        if range_pct < volatility_threshold:
-            recommendation = f"❌ No trade — low volatility ({range_pct:.3f} < {volatility_threshold:.3f})"
-        elif prob_up >= AI_PROB_THRESHOLD:
-            recommendation = f"🔥 TRADE: Entry {entry:.2f}, Target {target:.2f}, Stop {stop:.2f}"
-        else:
-            recommendation = f"❌ No trade (prob {prob_up:.2%} < {AI_PROB_THRESHOLD:.2%})"
-
-        # Log prediction for feedback loop
-        entry_time = latest.iloc[i]["datetime"] if "datetime" in latest.columns else datetime.now()
-        features_to_log = X_live.iloc[i].to_dict()
-        log_prediction(ticker, entry_time, features_to_log, prob_up, outcome=None, log_path=log_path)
-
-        results.append({
-            "ticker": ticker,
-            "probability": prob_up,
-            "raw_probability": raw_prob_up,  # Keep original for debugging
-            "entry": entry,
-            "target": target,
-            "stop": stop,
-            "recommendation": recommendation,
-            "volatility": range_pct,
-            "vol_threshold": volatility_threshold
-        })
+    # Debug output
+    for row in df_results.itertuples(index=False):
+        print(f"🔍 {row.ticker}: Vol {row.volatility:.3f} vs Thresh {row.vol_threshold:.3f}")
+        print(f"    Raw Prob: {row.raw_probability:.2%} → Calibrated: {row.probability:.2%}")
+
+    # Log predictions for feedback loop
+    feature_cols = [c for c in df_results.columns if c.startswith("feat_")]
+    entry_time = datetime.now()
+    records = []
+    for ticker, prob, features in zip(df_results["ticker"], df_results["probability"],
+                                      df_results[feature_cols].rename(columns=lambda c: c[5:]).to_dict("records")):
+        records.append(prediction_record(ticker, entry_time, features, prob))
+    log_predictions(records, log_path=log_path)
+    df_results = df_results.drop(columns=feature_cols)
 
-    df_results = pd.DataFrame(results).sort_values("probability", ascending=False)
-    
     # **Debug Summary**
-    total_tickers = len(results)
-    low_vol_filtered = len([r for r in results if "low volatility" in r["recommendation"]])
-    low_prob_filtered = len([r for r in results if "probability below threshold" in r["recommendation"]])
-    trade_candidates = len([r for r in results if "TRADE:" in r["recommendation"]])
+    recommendations = df_results["recommendation"]
+    total_tickers = len(df_results)
+    low_vol_filtered = recommendations.str.contains("low volatility").sum()
+    low_prob_filtered = recommendations.str.contains("probability below threshold").sum()
+    trade_candidates = recommendations.str.contains("TRADE:").sum()
     
     print(f"📊 AI RECOMMENDATION SUMMARY:")
     print(f"   Total tickers: {total_tickers}")
@@ -780,11 +684,20 @@ def get_trade_recommendations(
             print(f"{row['ticker']}: {row['recommendation']}")
         return df_results
 
+def is_retrain_day(day_threshold=1):
+    """
+    Returns True if today is within the first `day_threshold` days of the month.
+    """
+    today = date.today()
+    return today.day <= day_threshold
+
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="AI Stock Predictor")
     parser.add_argument("--tickers", type=str, help="Comma-separated ticker symbols to analyze (e.g. TSLA,SPY,QQQ)")
+    parser.add_argument("--model-family", default=DEFAULT_MODEL_FAMILY, choices=list(MODEL_FAMILIES),
+                        help="Model family for the monthly retrain (see ai_models.py benchmark)")
     args = parser.parse_args()
 
     if args.tickers:
@@ -820,27 +733,27 @@ if __name__ == "__main__":
     trade_df = load_trade_log("trade_log.xlsx")
     print("Loaded manual trade outcomes:", trade_df.shape)
 
-    # 3. Extract features from minute data for training, with news
-    feat_df = extract_features_from_historical(
-    minute_df,
-    news_df=news_df,
-    whale_df=whale_df,
-    congress_df=congress_df,
-    inst_df=inst_df
-)
-    print("Labeled data for training:", feat_df.shape)
-
-
-def is_retrain_day(day_threshold=1):
-    """
-    Returns True if today is within the first `day_threshold` days of the month.
-    """
-    today = date.today()
-    return today.day <= day_threshold
-
-if is_retrain_day():
-    retrain_model_from_feedback(
-        prediction_log_path="prediction_log.csv",
-        trade_log_path="trade_log.xlsx",
-        model_output_path="ai_model_updated.pkl"
-    )
\ No newline at end of file
+    # 3. Materialize new minute bars in the feature store, then read the training
+    #    window back and add news/whale/Quiver features as of each bar
+    feature_store = get_feature_store()
+    feature_store.update(minute_df)
+    feat_df = add_enrichment_features(
+        feature_store.read(tickers=tickers, start=pd.to_datetime(minute_df["Datetime"]).min()),
+        news_df=news_df,
+        whale_df=whale_df,
+        congress_df=congress_df,
+        inst_df=inst_df
+    )
+    labeled_df = label_outcomes(feat_df.reset_index())
+    print("Labeled data for training:", labeled_df.shape)
+
+
+    # Monthly full retrain. Daily freshness comes from model_updater's
+    # off-hours incremental job, so importing this module never retrains.
+    if is_retrain_day():
+        retrain_model_from_feedback(
+            prediction_log_path=PREDICTION_JOURNAL_DIR,
+            trade_log_path="trade_log.xlsx",
+            model_output_path="ai_model_updated.pkl",
+            model_family=args.model_family
+        )
\ No newline at end of file
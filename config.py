@@ -22,15 +22,19 @@ LEVERAGED_ETFS = ["TQQQ", "TECL", "MSTX", "BITU", "ETHU", "NVDU", "LABU",
                   "GDXU", "NUGT", "SMCX", "JNUG", "NAIL", "DFEN", "ERX", 
                   "SDOW", "BOIL", "MSFU", "TSLT", "SSO", "SDS", "AGQ"]
 
-def get_volatility_threshold(ticker):
-    """Get appropriate volatility threshold based on ticker type"""
+def get_volatility_category(ticker):
+    """VOLATILITY_THRESHOLDS key for a ticker"""
     ticker = ticker.upper()
     
     if ticker in LEVERAGED_ETFS:
-        return VOLATILITY_THRESHOLDS["leveraged_etf"]
+        return "leveraged_etf"
     elif ticker.endswith("ETH") or ticker.endswith("BTC") or ticker in ["BITU", "ETHU"]:
-        return VOLATILITY_THRESHOLDS["crypto_etf"] 
+        return "crypto_etf"
     elif ticker == "AMD":  # Individual stock in your list
-        return VOLATILITY_THRESHOLDS["individual_stock"]
+        return "individual_stock"
     else:
-        return VOLATILITY_THRESHOLDS["default"]
\ No newline at end of file
+        return "default"
+
+def get_volatility_threshold(ticker):
+    """Get appropriate volatility threshold based on ticker type"""
+    return VOLATILITY_THRESHOLDS[get_volatility_category(ticker)]
\ No newline at end of file
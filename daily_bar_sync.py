@@ -0,0 +1,131 @@
+"""
+Incremental daily-bar sync for historical_daily_data.csv.
+
+For each ticker, only the sessions after the last stored date are fetched
+(plus a short overlap window). If the overlapping closes no longer match what is
+stored, the provider has adjusted the history (split, reverse split, correction)
+and that ticker alone is refetched in full. New sessions are appended to the
+CSV; the file is only rewritten when a ticker's history had to be replaced.
+"""
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytz
+
+OVERLAP_SESSIONS = 5       # Stored sessions refetched to detect adjustments
+PRICE_TOLERANCE = 0.005    # Relative close difference treated as an adjustment
+MARKET_CLOSE_HOUR = 16     # ET; today's session is only stored after the close
+BAR_COLUMNS = ["Datetime", "Ticker", "Open", "High", "Low", "Close", "Volume"]
+
+
+def load_daily_bars(filename):
+    """Reads the daily CSV with parsed datetimes, one row per (ticker, session date)."""
+    if not os.path.exists(filename):
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    df = pd.read_csv(filename)
+    df["Datetime"] = pd.to_datetime(df["Datetime"], format="mixed", errors="coerce")
+    df = df.dropna(subset=["Datetime"])
+    session = df["Datetime"].dt.normalize()
+    df = df[~pd.DataFrame({"Ticker": df["Ticker"], "session": session}).duplicated(keep="last")]
+    return df.sort_values(["Ticker", "Datetime"], kind="mergesort").reset_index(drop=True)
+
+
+def last_closed_session(now=None):
+    """Date of the latest completed trading session (weekends roll back to Friday)."""
+    now = now or datetime.now(pytz.timezone("US/Eastern"))
+    day = pd.Timestamp(now.date())
+    if now.hour < MARKET_CLOSE_HOUR:
+        day -= pd.Timedelta(days=1)
+    return pd.offsets.BDay().rollback(day)
+
+
+def overlap_consistent(stored, fetched, tolerance=PRICE_TOLERANCE):
+    """
+    True if the fetched bars agree with the stored closes on every shared session.
+    False if they disagree or share no session at all (the overlap cannot be verified).
+    """
+    left = stored.assign(session=stored["Datetime"].dt.normalize())[["session", "Close"]]
+    right = fetched.assign(session=fetched["Datetime"].dt.normalize())[["session", "Close"]]
+    shared = left.merge(right, on="session", suffixes=("_stored", "_fetched"))
+    if shared.empty:
+        return False
+    diff = (shared["Close_fetched"] - shared["Close_stored"]).abs() / shared["Close_stored"].abs()
+    return bool((diff <= tolerance).all())
+
+
+def _as_bars(df):
+    df = df[BAR_COLUMNS].copy()
+    df["Datetime"] = pd.to_datetime(df["Datetime"], format="mixed", errors="coerce")
+    return df.dropna(subset=["Datetime"])
+
+
+def sync_daily_bars(tickers, filename="historical_daily_data.csv", years_back=5, fetch=None, now=None):
+    """
+    Brings the daily CSV up to the last closed session for every ticker and
+    returns the full, sorted history. `fetch` defaults to
+    schwab_data.fetch_daily_bars_for_range (symbol, years_back=, start_dt=, end_dt=).
+    """
+    if fetch is None:
+        from schwab_data import fetch_daily_bars_for_range as fetch
+
+    stored = load_daily_bars(filename)
+    sealed = last_closed_session(now)
+    by_ticker = dict(tuple(stored.groupby("Ticker", sort=False)))
+    appended, replaced = [], {}
+
+    for ticker in tickers:
+        tstored = by_ticker.get(ticker)
+        if tstored is None or tstored.empty:
+            print(f"Fetching {years_back} years of daily bars for new ticker {ticker}...")
+            full = fetch(ticker, years_back=years_back)
+            if full is not None and not full.empty:
+                replaced[ticker] = _as_bars(full)
+            continue
+
+        last_session = tstored["Datetime"].iloc[-1].normalize()
+        if last_session >= sealed:
+            print(f"Daily bars for {ticker} are up to date ({last_session.date()})")
+            continue
+
+        overlap = tstored.tail(OVERLAP_SESSIONS)
+        fetched = fetch(ticker, years_back=years_back,
+                        start_dt=overlap["Datetime"].iloc[0].normalize().to_pydatetime(),
+                        end_dt=datetime.now())
+        if fetched is None or fetched.empty:
+            print(f"No new daily data for {ticker}")
+            continue
+        fetched = _as_bars(fetched)
+
+        if not overlap_consistent(overlap, fetched):
+            print(f"⚠️ {ticker} history changed in the overlap window (split/adjustment); refetching in full")
+            full = fetch(ticker, years_back=years_back)
+            if full is not None and not full.empty:
+                replaced[ticker] = _as_bars(full)
+            continue
+
+        sessions = fetched["Datetime"].dt.normalize()
+        new_rows = fetched[(sessions > last_session) & (sessions <= sealed)]
+        if not new_rows.empty:
+            print(f"Fetched {len(new_rows)} new daily rows for {ticker}")
+            appended.append(new_rows)
+
+    for ticker, full in replaced.items():
+        sessions = full["Datetime"].dt.normalize()
+        replaced[ticker] = full[sessions <= sealed].drop_duplicates(subset=["Datetime"], keep="last")
+
+    new_rows = pd.concat(appended, ignore_index=True) if appended else pd.DataFrame(columns=BAR_COLUMNS)
+    if replaced:
+        kept = stored[~stored["Ticker"].isin(list(replaced))]
+        df_full = pd.concat([kept, new_rows] + list(replaced.values()), ignore_index=True)
+        df_full = df_full.sort_values(["Ticker", "Datetime"], kind="mergesort").reset_index(drop=True)
+        df_full.to_csv(filename, index=False, date_format="%Y-%m-%d %H:%M")
+        print(f"Rewrote {filename} ({len(replaced)} tickers replaced, {len(new_rows)} rows appended)")
+        return df_full
+
+    if not new_rows.empty:
+        new_rows.to_csv(filename, mode="a", index=False, header=not os.path.exists(filename),
+                        date_format="%Y-%m-%d %H:%M")
+        print(f"Appended {len(new_rows)} daily rows to {filename}")
+    df_full = pd.concat([stored, new_rows], ignore_index=True)
+    return df_full.sort_values(["Ticker", "Datetime"], kind="mergesort").reset_index(drop=True)
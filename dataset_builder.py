@@ -0,0 +1,245 @@
+"""
+Parallel, chunked builder for the labeled AI training dataset.
+
+Replaces the single-process load -> features -> labels -> enrichment pipeline:
+
+1. The minute-history CSV is streamed in CHUNK_ROWS pieces and split into
+   per-ticker bar parts on disk, so the full history is never held in memory.
+   Each ticker's parts are indexed by time span, so a task reads only the
+   parts around its range.
+2. Work is split into (ticker, date range) tasks and run in a process pool.
+   Each task reads its ticker's bars with WARMUP_BARS of indicator history
+   before the range and `horizon` bars after it for the barrier labels,
+   computes features (the same ai_features code the feature store uses),
+   labels them, adds news/whale/Quiver features and writes one part file.
+3. assemble_dataset() concatenates the parts into the final training matrix,
+   downcasting feature columns to float32.
+
+    python dataset_builder.py historical_minute_data.csv --workers 8
+"""
+import glob
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from ai_features import add_enrichment_features, technical_feature_frame
+from ai_labeling import DEFAULT_HORIZON, label_outcomes
+from config import AI_STOP_PERCENT, AI_TARGET_PERCENT
+from feature_store import WARMUP_BARS
+from prediction_journal import PART_FORMAT, read_frame, write_frame
+
+BUILD_DIR = "dataset_build"
+DATASET_FILE = f"training_dataset.{PART_FORMAT}"
+CHUNK_ROWS = 500_000                 # CSV rows read per streaming chunk
+TASK_SPAN = pd.DateOffset(months=3)  # Date range handled by one task
+BAR_COLUMNS = ["Datetime", "Ticker", "Open", "High", "Low", "Close", "Volume"]
+PART_INDEX = "_parts.json"           # Per-ticker list of bar parts with their time spans
+
+
+def partition_bars(csv_path, build_dir=BUILD_DIR, chunk_rows=CHUNK_ROWS):
+    """
+    Streams the minute CSV into build_dir/bars/<TICKER>/part-<n> files, with a
+    PART_INDEX per ticker recording each part's time span and row count.
+    Returns {ticker: (first datetime, last datetime)}.
+    """
+    bars_dir = os.path.join(build_dir, "bars")
+    if os.path.isdir(bars_dir):
+        shutil.rmtree(bars_dir)
+    spans = {}
+    index = {}
+    for n, chunk in enumerate(pd.read_csv(csv_path, usecols=BAR_COLUMNS, chunksize=chunk_rows)):
+        chunk["Ticker"] = chunk["Ticker"].astype(str).str.upper()
+        chunk["Datetime"] = pd.to_datetime(chunk["Datetime"], errors="coerce")
+        chunk = chunk.dropna(subset=["Datetime"])
+        for ticker, part in chunk.groupby("Ticker", sort=False):
+            ticker_dir = os.path.join(bars_dir, ticker)
+            os.makedirs(ticker_dir, exist_ok=True)
+            name = f"part-{n:05d}.{PART_FORMAT}"
+            write_frame(part.reset_index(drop=True), os.path.join(ticker_dir, name))
+            first, last = part["Datetime"].min(), part["Datetime"].max()
+            index.setdefault(ticker, []).append(
+                {"path": name, "first": str(first), "last": str(last), "rows": int(part["Datetime"].nunique())})
+            if ticker in spans:
+                first, last = min(first, spans[ticker][0]), max(last, spans[ticker][1])
+            spans[ticker] = (first, last)
+    for ticker, parts in index.items():
+        with open(os.path.join(bars_dir, ticker, PART_INDEX), "w", encoding="utf-8") as f:
+            json.dump(parts, f)
+    return spans
+
+
+def plan_tasks(spans, task_span=TASK_SPAN):
+    """Splits each ticker's history into [start, end) ranges of at most task_span."""
+    tasks = []
+    for ticker, (first, last) in sorted(spans.items()):
+        start = first.normalize()
+        while start <= last:
+            end = start + task_span
+            tasks.append((ticker, start, end))
+            start = end
+    return tasks
+
+
+def _parts_for_range(parts, start, end, before=0, after=0):
+    """
+    Names of the bar parts needed for [start, end) plus `before` bars ahead of it
+    and `after` bars past it. The nearest earlier/later parts are taken until they
+    hold enough rows, then every part overlapping the resulting span is read, so
+    no bar inside it is missed even when parts overlap in time.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    parts = [dict(p, first=pd.Timestamp(p["first"]), last=pd.Timestamp(p["last"])) for p in parts]
+    lo, hi = start, end
+    rows = 0
+    for p in sorted((p for p in parts if p["last"] < start), key=lambda p: p["last"], reverse=True):
+        if rows >= before:
+            break
+        rows += p["rows"]
+        lo = min(lo, p["first"])
+    rows = 0
+    for p in sorted((p for p in parts if p["first"] >= end), key=lambda p: p["first"]):
+        if rows >= after:
+            break
+        rows += p["rows"]
+        hi = max(hi, p["last"])
+    return [p["path"] for p in parts if p["first"] <= hi and p["last"] >= lo]
+
+
+def _load_ticker_bars(build_dir, ticker, start=None, end=None, before=0, after=0):
+    """
+    One ticker's bars sorted by time. Given start/end, only the parts listed in
+    PART_INDEX as overlapping the range (with its before/after margin) are read.
+    """
+    ticker_dir = os.path.join(build_dir, "bars", ticker)
+    index_path = os.path.join(ticker_dir, PART_INDEX)
+    if start is not None and os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            names = _parts_for_range(json.load(f), start, end, before, after)
+        paths = sorted(os.path.join(ticker_dir, name) for name in names)
+    else:
+        paths = sorted(glob.glob(os.path.join(ticker_dir, "part-*")))
+    if not paths:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    bars = pd.concat([read_frame(p) for p in paths], ignore_index=True)
+    bars = bars.drop_duplicates(["Datetime"], keep="last")
+    return bars.sort_values("Datetime", kind="mergesort").reset_index(drop=True)
+
+
+def build_task(build_dir, ticker, start, end, events=None, target_pct=AI_TARGET_PERCENT,
+               stop_pct=AI_STOP_PERCENT, horizon=DEFAULT_HORIZON):
+    """
+    Builds labeled, enriched feature rows for one ticker with start <= datetime < end.
+    `events` holds this ticker's news/whale/congress/inst frames. Returns (path, rows).
+    """
+    bars = _load_ticker_bars(build_dir, ticker, start, end, before=WARMUP_BARS, after=horizon)
+    dt = bars["Datetime"].to_numpy()
+    lo = np.searchsorted(dt, np.datetime64(start), side="left")
+    hi = np.searchsorted(dt, np.datetime64(end), side="left")
+    if lo == hi:
+        return None, 0
+
+    # Indicator warm-up before the range and label lookahead after it
+    window = bars.iloc[max(lo - WARMUP_BARS, 0):min(hi + horizon, len(bars))]
+    features = technical_feature_frame(ticker, window)
+    labeled = label_outcomes(features, target_pct, stop_pct, horizon)
+    labeled = labeled[(labeled["datetime"] >= start) & (labeled["datetime"] < end)]
+    if labeled.empty:
+        return None, 0
+
+    events = events or {}
+    labeled = add_enrichment_features(labeled, news_df=events.get("news"), whale_df=events.get("whale"),
+                                      congress_df=events.get("congress"), inst_df=events.get("inst"))
+    out_dir = os.path.join(build_dir, "parts", ticker)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{pd.Timestamp(start):%Y%m%d}.{PART_FORMAT}")
+    write_frame(labeled.reset_index(), path)
+    return path, len(labeled)
+
+
+def _events_for(events, ticker):
+    """
+    News and whale frames limited to one ticker, so tasks only pickle what they use.
+    Quiver frames are passed whole: an empty per-ticker slice would drop their columns.
+    """
+    subset = dict(events or {})
+    for name in ("news", "whale"):
+        df = subset.get(name)
+        if df is not None and not df.empty:
+            subset[name] = df[df["Ticker"].astype(str).str.upper() == ticker]
+    return subset
+
+
+def build_dataset(csv_path="historical_minute_data.csv", build_dir=BUILD_DIR, events=None,
+                  workers=None, task_span=TASK_SPAN, output_path=DATASET_FILE, **label_kwargs):
+    """
+    Runs the whole build and returns the assembled training frame.
+    events: optional {"news", "whale", "congress", "inst": DataFrame} as loaded by ai_module.
+    workers: process count (default: all cores but one).
+    """
+    workers = workers or max((os.cpu_count() or 2) - 1, 1)
+    shutil.rmtree(os.path.join(build_dir, "parts"), ignore_errors=True)
+    spans = partition_bars(csv_path, build_dir)
+    tasks = plan_tasks(spans, task_span)
+    print(f"🧱 {len(tasks)} dataset tasks for {len(spans)} tickers on {workers} processes")
+
+    parts = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(build_task, build_dir, ticker, start, end, _events_for(events, ticker), **label_kwargs)
+            for ticker, start, end in tasks
+        ]
+        for future in as_completed(futures):
+            path, rows = future.result()
+            if path:
+                parts.append({"path": path, "rows": rows})
+
+    with open(os.path.join(build_dir, "_manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"source": csv_path, "parts": sorted(parts, key=lambda p: p["path"])}, f, indent=2)
+    return assemble_dataset(build_dir, output_path)
+
+
+def assemble_dataset(build_dir=BUILD_DIR, output_path=DATASET_FILE):
+    """
+    Concatenates the part files listed in the build manifest into the final
+    training matrix (float64 feature columns stored as float32).
+    """
+    with open(os.path.join(build_dir, "_manifest.json"), "r", encoding="utf-8") as f:
+        parts = json.load(f)["parts"]
+    frames = []
+    for part in parts:
+        df = read_frame(part["path"])
+        floats = df.select_dtypes("float64").columns.drop("label", errors="ignore")
+        frames.append(df.astype({c: "float32" for c in floats}))
+    if not frames:
+        return pd.DataFrame()
+    dataset = pd.concat(frames, ignore_index=True).sort_values(["ticker", "datetime"], kind="mergesort")
+    dataset = dataset.reset_index(drop=True)
+    if output_path:
+        write_frame(dataset, output_path)
+        print(f"💾 Training dataset: {len(dataset)} rows x {dataset.shape[1]} columns → {output_path}")
+    return dataset
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the labeled training dataset in parallel")
+    parser.add_argument("csv", nargs="?", default="historical_minute_data.csv", help="Minute-bar CSV")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: cores - 1)")
+    parser.add_argument("--no-events", action="store_true", help="Skip news/whale/Quiver enrichment")
+    args = parser.parse_args()
+
+    event_frames = None
+    if not args.no_events:
+        from ai_module import load_news_cache, load_quiver_cache, load_whale_cache
+        event_frames = {
+            "news": load_news_cache("news_cache.json"),
+            "whale": load_whale_cache("whale_cache.json"),
+            "congress": load_quiver_cache("quiver_congress_cache.json"),
+            "inst": load_quiver_cache("quiver_institutional_cache.json"),
+        }
+    build_dataset(args.csv, events=event_frames, workers=args.workers)
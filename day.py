@@ -147,6 +147,7 @@ import subprocess
 from schwab_data import fetch_schwab_latest_minute
 from schwab_data import refresh_access_token
 from ai_module import get_trade_recommendations
+from model_updater import launch_incremental_update
 import pyttsx3
 import logging
 from day_settings_gui import load_settings, save_settings
@@ -1474,7 +1475,7 @@ def check_trade_alerts(historical_data, top5_tickers=None):
 
     # Get current AI recommendations for correlation
     try:
-        current_ai_recs = get_trade_recommendations(top5_tickers or tickers, return_df=True)
+        current_ai_recs = get_trade_recommendations(top5_tickers or tickers, return_df=True, bars=historical_data)
     except Exception as e:
         print(f"⚠️ Could not get AI recommendations for alerts: {e}")
         current_ai_recs = pd.DataFrame()
@@ -3183,6 +3184,7 @@ def start_dashboard(historical_data, filtered_df, tickers, dashboard_ranks):
         import dash
         import pandas as pd
         from datetime import datetime
+        from report_writer import MONEY, write_report
 
         ctx = dash.callback_context
         triggered = ctx.triggered[0]['prop_id'] if ctx.triggered else ''
@@ -3192,6 +3194,7 @@ def start_dashboard(historical_data, filtered_df, tickers, dashboard_ranks):
             "Type", "Ticker", "Trade QTY", "Open Datetime", "Open Price",
             "Close Datetime", "Close Price", "Profit/Loss", "Profit/Loss %", "Notes"
         ]
+        TRADE_LOG_FORMATS = {"Open Price": MONEY, "Close Price": MONEY, "Profit/Loss": MONEY}
 
         trade_log_df = pd.DataFrame(table_data) if table_data else pd.DataFrame(columns=TRADE_LOG_COLUMNS)
 
@@ -3261,7 +3264,7 @@ def start_dashboard(historical_data, filtered_df, tickers, dashboard_ranks):
                     trade_log_df.at[i, "Profit/Loss"] = ""
                     trade_log_df.at[i, "Profit/Loss %"] = ""
             try:
-                trade_log_df.to_excel(TRADE_LOG_FILE, index=False)
+                write_report(TRADE_LOG_FILE, {"Sheet1": trade_log_df}, column_formats=TRADE_LOG_FORMATS)
             except Exception as e:
                 print("Excel save error:", e)
             today_str = datetime.now().strftime("%Y-%m-%d")
@@ -3306,7 +3309,7 @@ def start_dashboard(historical_data, filtered_df, tickers, dashboard_ranks):
                         trade_log_df.at[i, "Profit/Loss"] = ""
                         trade_log_df.at[i, "Profit/Loss %"] = ""
                 try:
-                    trade_log_df.to_excel(TRADE_LOG_FILE, index=False)
+                    write_report(TRADE_LOG_FILE, {"Sheet1": trade_log_df}, column_formats=TRADE_LOG_FORMATS)
                 except Exception as e:
                     print("Excel save error:", e)
                 today_str = datetime.now().strftime("%Y-%m-%d")
@@ -4772,7 +4775,7 @@ def run_realtime_job():
 
     # Get top 5 tickers from AI
     from ai_module import get_trade_recommendations
-    recommendations = get_trade_recommendations(tickers, return_df=True)
+    recommendations = get_trade_recommendations(tickers, return_df=True, bars=historical_data)
     top5_tickers = recommendations.head(5)["ticker"].tolist()
 
     check_trade_alerts(historical_data, top5_tickers)
@@ -5084,7 +5087,7 @@ def refresh_ai_recommendations():
         return
         
     try:
-        ai_recommendations = get_trade_recommendations(tickers, return_df=True)
+        ai_recommendations = get_trade_recommendations(tickers, return_df=True, bars=historical_data)
         top5_ai = ai_recommendations.head(5)
         print(f"✅ AI recommendations updated for {len(ai_recommendations)} tickers")
         print(f"Trade candidates: {len([r for r in ai_recommendations['recommendation'] if 'TRADE:' in r])}")
@@ -5183,6 +5186,8 @@ def reschedule_jobs():
     schedule.every().day.at("11:30").do(refresh_news_cache)
     schedule.every().day.at("10:30").do(refresh_whale_cache)
     schedule.every().day.at("11:30").do(refresh_whale_cache)
+    # Off-hours incremental model update in a low-priority background process
+    schedule.every().day.at("18:30").do(launch_incremental_update)
 
 reschedule_jobs()
 
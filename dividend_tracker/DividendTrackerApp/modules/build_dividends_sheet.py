@@ -7,7 +7,6 @@ Location: C:\Python_Projects\DividendTrackerApp\modules\build_dividends_sheet.py
 """
 
 import os
-from openpyxl import Workbook
 from modules import dividend_loader, excel_generator, summary_builder, estimated_income_tracker
 
 # ------------------------- Configuration -------------------------
@@ -17,8 +16,7 @@ TARGET_FILE = os.path.join(OUTPUT_PATH, "Dividends_2025.xlsx")
 
 def process_etrade_files():
     """Process all E*TRADE dividend files and build Excel workbook"""
-    wb = Workbook()
-    wb.remove(wb.active)
+    sheets = []
 
     for filename in os.listdir(INPUT_PATH):
         # Skip estimate files - they're handled separately
@@ -41,9 +39,9 @@ def process_etrade_files():
                 print(f"⚠️ Unknown account type in file: {filename}")
                 continue
 
-            excel_generator.write_to_workbook(wb, sheet_name, df)
+            sheets.append((sheet_name, df))
 
-    wb.save(TARGET_FILE)
+    excel_generator.export_workbook(TARGET_FILE, sheets)
     print(f"✅ E*TRADE workbook saved: {TARGET_FILE}")
 
     # Add Totals 2025 sheet with summary tables
@@ -182,6 +182,15 @@ def get_etrade_session(force_new=False):
     """
     from requests_oauthlib import OAuth1Session
 
+    # Share the main app's session manager (token keep-alive) when it is available
+    main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+    if os.path.exists(os.path.join(main_dir, "etrade_session_manager.py")):
+        import sys
+        if main_dir not in sys.path:
+            sys.path.append(main_dir)
+        from etrade_session_manager import get_session_manager
+        return get_session_manager().get_session(force_new=force_new)
+
     oauth_token, oauth_token_secret = authorize_etrade(force_new=force_new)
     if not oauth_token or not oauth_token_secret:
         raise Exception("❌ Could not obtain valid OAuth tokens. Please re-authorize.")
@@ -30,6 +30,27 @@ BOX_BORDER = Border(
     bottom=Side(style='thin')
 )
 
+# ------------------------- Report Writer -------------------------
+def _load_report_writer():
+    """
+    The main app's report_writer (streamed, write-only output with named styles)
+    when the dividend tracker runs inside it; None when it runs standalone.
+    """
+    main_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+    if not os.path.exists(os.path.join(main_dir, "report_writer.py")):
+        return None
+    import sys
+    if main_dir not in sys.path:
+        sys.path.append(main_dir)
+    import report_writer
+    return report_writer
+
+
+def _blank_empty(df):
+    """Replace NaN and 0.0 with blank before exporting"""
+    return df.replace({pd.NA: '', 'NaN': '', 'nan': '', 0.0: '', 0: '', None: ''})
+
+
 # ------------------------- Function: Export DataFrame -------------------------
 def export_to_excel(df, filename="dividends_export.xlsx", sheet_name="Dividends"):
     """
@@ -37,44 +58,38 @@ def export_to_excel(df, filename="dividends_export.xlsx", sheet_name="Dividends"
     - Bold headers with box borders
     - Regular cells: Arial 12, blank if value is 0.0 or NaN
     """
-
-    # Replace NaN and 0.0 with blank before exporting
-    df = df.replace({pd.NA: '', 'NaN': '', 'nan': '', 0.0: '', 0: '', None: ''})
-
     # Define full output file path
     file_path = os.path.join(OUTPUT_PATH, filename)
 
-    # Create workbook and worksheet
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = sheet_name
-
-    # Write DataFrame rows to worksheet with formatting
-    for row_index, row in enumerate(dataframe_to_rows(df, index=False, header=True), start=1):
-        for col_index, value in enumerate(row, start=1):
-            cell = ws.cell(row=row_index, column=col_index, value=value)
-
-            # Apply header style to first row
-            if row_index == 1:
-                cell.font = HEADER_FONT
-                cell.border = BOX_BORDER
-            else:
-                cell.font = NORMAL_FONT
-                cell.border = BOX_BORDER
-
-    # Auto-adjust column widths
-    for column_cells in ws.columns:
-        length = max(len(str(cell.value)) if cell.value is not None else 0 for cell in column_cells)
-        ws.column_dimensions[column_cells[0].column_letter].width = length + 2
-
-    # Save the workbook
     print(f"Saving to 71: {file_path}")
     try:
-        wb.save(file_path)
+        export_workbook(file_path, [(sheet_name, df)])
         print(f"✅ Excel export complete: {file_path}")
     except Exception as e:
         print(f"❌ Excel export failed: {e}")
 
+def export_workbook(file_path, sheets):
+    """
+    Writes (sheet name, DataFrame) pairs as one formatted workbook (same styling as
+    export_to_excel). Each frame is written whole through report_writer when the
+    main app is available, otherwise cell by cell with write_to_workbook.
+    """
+    report_writer = _load_report_writer()
+    if report_writer is not None:
+        with report_writer.ReportWriter(file_path) as report:
+            for sheet_name, df in sheets:
+                report.write_frame(sheet_name, _blank_empty(df), freeze_header=False)
+        return file_path
+
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for sheet_name, df in sheets:
+        write_to_workbook(wb, sheet_name, df)
+    if not wb.worksheets:
+        wb.create_sheet()
+    wb.save(file_path)
+    return file_path
+
 def write_to_workbook(wb, sheet_name, df):
     """
     Appends a formatted DataFrame to an existing workbook object under a new sheet name.
@@ -82,8 +97,7 @@ def write_to_workbook(wb, sheet_name, df):
     - Bold headers with box borders
     - Auto-adjusts column widths
     """
-    # Replace NaN and 0.0 with blank before exporting
-    df = df.replace({pd.NA: '', 'NaN': '', 'nan': '', 0.0: '', 0: '', None: ''})
+    df = _blank_empty(df)
 
     # Create a new sheet
     ws = wb.create_sheet(title=sheet_name)
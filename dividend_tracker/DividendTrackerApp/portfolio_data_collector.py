@@ -163,32 +163,31 @@ class PortfolioDataCollector:
                 print("❌ Could not get E*TRADE session for quotes")
                 return {}
             
+            # One quote request per 25 tickers instead of one per ticker
+            sys.path.append(self.main_dir)
+            from etrade_quote_client import fetch_quote_records
+            try:
+                quote_records = fetch_quote_records(tickers, session, base_url)
+            except Exception as quote_error:
+                print(f"❌ Batched quote request failed: {quote_error}")
+                quote_records = {}
+            
             print("🔍 Getting dividend data for each ticker...")
             for ticker in tickers:
                 try:
                     print(f"   📊 Getting dividend data for {ticker}...")
                     
-                    # Use E*TRADE Quote API (correct endpoint)
-                    quote_url = f"{base_url}/v1/market/quote/{ticker}.json"
-                    quote_response = session.get(quote_url)
+                    all_data = quote_records.get(ticker.upper())
                     
-                    if quote_response.status_code == 200:
-                        quote_data = quote_response.json()
-                        
+                    if all_data is not None:
                         # Extract dividend data from E*TRADE Quote API response structure
                         dividend_yield = 0.0
                         dividend_amount = 0.0
                         annual_dividend = 0.0
                         last_price = 0.0
                         
-                        # Parse E*TRADE Quote API response structure
-                        if ('QuoteResponse' in quote_data and 
-                            'QuoteData' in quote_data['QuoteResponse'] and 
-                            isinstance(quote_data['QuoteResponse']['QuoteData'], list) and
-                            len(quote_data['QuoteResponse']['QuoteData']) > 0):
-                            
-                            quote_info = quote_data['QuoteResponse']['QuoteData'][0]
-                            all_data = quote_info.get('All', {})
+                        # all_data is the quote's "All" block from the batched request
+                        if all_data:
                             
                             # Extract dividend information - try multiple field names
                             dividend_yield = float(all_data.get('yield', 0))
@@ -267,7 +266,7 @@ class PortfolioDataCollector:
                             print(f"      ⚪ {ticker}: No dividend data available")
                     
                     else:
-                        print(f"      ⚠️ Quote API error for {ticker}: {quote_response.status_code}")
+                        print(f"      ⚠️ No quote returned for {ticker}")
                         ticker_yields[ticker] = {
                             'yield': 0.0,
                             'dividend_amount': 0.0,
@@ -279,9 +278,6 @@ class PortfolioDataCollector:
                             'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                         }
                     
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.1)
-                    
                 except Exception as ticker_error:
                     print(f"      ❌ Error getting {ticker}: {ticker_error}")
                     ticker_yields[ticker] = {
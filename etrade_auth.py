@@ -33,7 +33,8 @@ def save_tokens(oauth_token, oauth_token_secret):
         json.dump({
             "oauth_token": oauth_token,
             "oauth_token_secret": oauth_token_secret,
-            "date": datetime.now().strftime("%Y-%m-%d")
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "issued_at": datetime.now().isoformat(timespec="seconds")
         }, file)
     print(f"[DEBUG] Tokens saved to {auth_file_path}")
 
@@ -167,146 +168,48 @@ def authorize_etrade(force_new=False):
       
 
 
-# --- Global session/base_url cache ---
-_etrade_session_cache = {
-    'session': None,
-    'base_url': None,
-    'token': None,
-    'secret': None
-}
-
 def get_etrade_session(force_new=False):
     """
-    Returns a cached authenticated OAuth1Session and base_url.
-    Only triggers OAuth flow if no valid session or force_new is True.
+    Returns the shared authenticated OAuth1Session and base_url.
+    The session manager keeps the token alive in the background and only triggers
+    the OAuth flow when the token has expired or cannot be renewed (see etrade_session_manager).
     """
-    from requests_oauthlib import OAuth1Session
-    global _etrade_session_cache
-
-    if not force_new and _etrade_session_cache['session'] is not None:
-        return _etrade_session_cache['session'], _etrade_session_cache['base_url']
-
-    oauth_token, oauth_token_secret = authorize_etrade(force_new=force_new)
-    if not oauth_token or not oauth_token_secret:
-        raise Exception("❌ Could not obtain valid OAuth tokens. Please re-authorize.")
-    session = OAuth1Session(
-        consumer_key,
-        consumer_secret,
-        resource_owner_key=oauth_token,
-        resource_owner_secret=oauth_token_secret
-    )
-    base_url = prod_base_url
-    # Cache for reuse
-    _etrade_session_cache['session'] = session
-    _etrade_session_cache['base_url'] = base_url
-    _etrade_session_cache['token'] = oauth_token
-    _etrade_session_cache['secret'] = oauth_token_secret
-    return session, base_url
+    from etrade_session_manager import get_session_manager
+    return get_session_manager().get_session(force_new=force_new)
+
+MARKET_DATA_COLUMNS = [
+    "Ticker", "bid", "ask", "bidSize", "askSize", "prevClose", "change", "changePercent",
+    "marketCap", "averageVolume10day", "week52High", "week52Low", "week52HiDate", "week52LowDate",
+]
 
 def fetch_etrade_market_data(tickers, retry=True):
-    # Fetches daily market data (quote) for each ticker, including 52-week high/low and their dates.
-    # Returns a DataFrame.
-    # If a 401 error is encountered, refreshes the OAuth token and retries once.
-    # Cleans ticker symbols and skips any that return an error in the API response.
-    import time
+    # Fetches daily market data (quote) for the tickers, including 52-week high/low and their dates.
+    # Returns a DataFrame and saves it to market_data.csv.
+    # Quotes are requested in batches of 25 symbols (see etrade_quote_client); a 401 refreshes
+    # the OAuth token and retries once. Symbols E*TRADE rejects are skipped.
     import pandas as pd
-    from datetime import datetime
-
-    status = None
-    global session, base_url  # Ensure we update the global session/base_url
-    # Debug: print current session and base_url
-    print(f"[DEBUG] fetch_etrade_market_data: session={{session if 'session' in globals() else None}}, base_url={{base_url if 'base_url' in globals() else None}}")
-    print("Tickers to fetch market data for 1926:", tickers)
-    def _pull_market_data(session, base_url, tickers):
-        all_market_data = []
-        # Clean ticker symbols: uppercase, strip spaces, remove empties/None
-        clean_tickers = [
-            str(t).strip().upper()
-            for t in tickers
-            if t and isinstance(t, str) and t.strip().isalpha() and len(t.strip()) > 1
-        ]
-        for symbol in clean_tickers:
-            url_q = f"{base_url}/v1/market/quote/{symbol}.json"
-            response_q = session.get(url_q)
-            if response_q.status_code == 401:
-                return None, 401
-            print("=== E*TRADE HTTP Response ===")
-            print("Requesting symbol:", symbol)
-            print("Status Code:", response_q.status_code)
-            print("Headers:", dict(response_q.headers))
-            print("Body:", response_q.text)
-            print("=============================")
-            data_q = response_q.json()
-            # Skip if error message in response
-            if "Messages" in data_q.get("QuoteResponse", {}):
-                print(f"⚠️ Skipping invalid or unsupported symbol: {symbol} - {data_q['QuoteResponse']['Messages']}")
-                continue
-            quote_data = data_q.get("QuoteResponse", {}).get("QuoteData", [{}])
-            all_data = quote_data[0].get("All", {})
-            week52High = all_data.get("high52", None)
-            week52Low = all_data.get("low52", None)
-            week52HiDate = all_data.get("week52HiDate", None)
-            week52LowDate = all_data.get("week52LowDate", None)
-            week52HiDate = datetime.fromtimestamp(week52HiDate) if week52HiDate else None
-            week52LowDate = datetime.fromtimestamp(week52LowDate) if week52LowDate else None
-
-            all_market_data.append({
-                "Ticker": symbol,
-                "bid": round(all_data.get("bid", 0), 2),
-                "ask": round(all_data.get("ask", 0), 2),
-                "bidSize": all_data.get("bidSize", 0),
-                "askSize": all_data.get("askSize", 0),
-                "prevClose": round(all_data.get("previousClose", 0), 2),
-                "change": round(all_data.get("changeClose", 0), 2),
-                "changePercent": round(all_data.get("changeClosePercentage", 0), 2),
-                "marketCap": all_data.get("marketCap", 0),
-                "averageVolume10day": round(all_data.get("averageVolume", 0), 2),
-                "week52High": round(week52High, 2) if week52High else None,
-                "week52Low": round(week52Low, 2) if week52Low else None,
-                "week52HiDate": week52HiDate,
-                "week52LowDate": week52LowDate
-            })
-            time.sleep(0.3)
-        return pd.DataFrame(all_market_data), 200
-
-    # Get session and base_url if not already set
-    # Always use cached session unless a 401 triggers a refresh
-    from etrade_auth import get_etrade_session as _get_etrade_session
-    global session, base_url
-    session, base_url = _get_etrade_session()
-
-
-    df_market, status = _pull_market_data(session, base_url, tickers)
-    if status == 401 and retry:
-        print("❌ 401 Unauthorized: OAuth token expired. Refreshing token...")
-        # Refresh token and create a new session, update globals
-        session, base_url = get_etrade_session(force_new=True)
-        globals()['session'] = session
-        globals()['base_url'] = base_url
-        # Debug: print new session and token info
-        try:
-            from etrade_auth import load_tokens
-            oauth_token, oauth_token_secret = load_tokens()
-            print(f"[DEBUG] Loaded new tokens after refresh: oauth_token={oauth_token}, oauth_token_secret={oauth_token_secret}")
-        except Exception as e:
-            print(f"[DEBUG] Could not load tokens after refresh: {e}")
-        print(f"[DEBUG] New session after token refresh: session={{session}}, base_url={{base_url}}")
-        # Wait briefly to ensure file flush
-        import time
-        time.sleep(1)
-        # Retry with new session (guaranteed to use new token)
-        df_market, status = _pull_market_data(session, base_url, tickers)
-        if status == 401:
-            print("[DEBUG] Still getting 401 after token refresh. Token may not be saving/loading correctly.")
-            raise Exception("❌ Failed to refresh OAuth token. Please re-authorize manually.")
-    elif status == 401:
-        print("[DEBUG] 401 error with no retry. Not refreshing token.")
-        raise Exception("❌ Failed to refresh OAuth token. Please re-authorize manually.")
-
-    if df_market is None:
+    from etrade_quote_client import fetch_quotes
+
+    # Clean ticker symbols: uppercase, strip spaces, remove empties/None and non-stock symbols
+    clean_tickers = [
+        str(t).strip().upper()
+        for t in tickers
+        if t and isinstance(t, str) and t.strip().isalpha() and len(t.strip()) > 1
+    ]
+    print(f"Fetching E*TRADE market data for {len(clean_tickers)} tickers...")
+    quotes = fetch_quotes(clean_tickers, refresh_on_401=retry)
+
+    if quotes.empty:
         print("❌ No market data fetched.")
         return pd.DataFrame()
 
+    df_market = quotes[MARKET_DATA_COLUMNS].copy()
+    price_cols = ["bid", "ask", "prevClose", "change", "changePercent", "averageVolume10day",
+                  "week52High", "week52Low"]
+    df_market[price_cols] = df_market[price_cols].round(2)
+    zero_fill = ["bid", "ask", "bidSize", "askSize", "prevClose", "change", "changePercent",
+                 "marketCap", "averageVolume10day"]
+    df_market[zero_fill] = df_market[zero_fill].fillna(0)
     df_market.to_csv("market_data.csv", index=False)
     print("✅ Market data saved to CSV.")
     return df_market
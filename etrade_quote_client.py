@@ -0,0 +1,156 @@
+"""
+Batched E*TRADE quote client.
+
+The quote endpoint takes up to MAX_SYMBOLS_PER_REQUEST comma-separated symbols,
+so symbol lists are split into full batches and the batches are requested
+concurrently under the shared "etrade" provider limit (screen_engine). A 100-symbol
+refresh is 4 requests instead of 100 requests with sleeps in between.
+
+    from etrade_quote_client import fetch_quotes
+    quotes = fetch_quotes(["O", "MAIN", "AGNC"])   # one typed row per symbol
+
+A 401 refreshes the OAuth session once (get_etrade_session(force_new=True)) and
+retries only the batches that failed.
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from screen_engine import provider, run_ordered
+
+MAX_SYMBOLS_PER_REQUEST = 25
+QUOTE_WORKERS = 4
+REQUEST_TIMEOUT = 10
+
+# Column -> (field in the quote's "All" block, dtype)
+QUOTE_COLUMNS = {
+    "lastTrade": ("lastTrade", "float64"),
+    "bid": ("bid", "float64"),
+    "ask": ("ask", "float64"),
+    "bidSize": ("bidSize", "Int64"),
+    "askSize": ("askSize", "Int64"),
+    "prevClose": ("previousClose", "float64"),
+    "change": ("changeClose", "float64"),
+    "changePercent": ("changeClosePercentage", "float64"),
+    "volume": ("totalVolume", "Int64"),
+    "averageVolume10day": ("averageVolume", "float64"),
+    "marketCap": ("marketCap", "float64"),
+    "week52High": ("high52", "float64"),
+    "week52Low": ("low52", "float64"),
+    "week52HiDate": ("week52HiDate", "datetime64[ns]"),
+    "week52LowDate": ("week52LowDate", "datetime64[ns]"),
+    "dividend": ("dividend", "float64"),
+    "declaredDividend": ("declaredDividend", "float64"),
+    "annualDividend": ("annualDividend", "float64"),
+    "yield": ("yield", "float64"),
+    "exDividendDate": ("exDividendDate", "datetime64[ns]"),
+    "dividendPayableDate": ("dividendPayableDate", "datetime64[ns]"),
+    "eps": ("eps", "float64"),
+    "pe": ("pe", "float64"),
+    "beta": ("beta", "float64"),
+}
+
+
+class QuoteAuthError(Exception):
+    """Raised when E*TRADE still answers 401 after a session refresh."""
+
+
+def clean_symbols(symbols):
+    """Upper-cased, stripped, de-duplicated symbols in their original order."""
+    cleaned = (str(s).strip().upper() for s in symbols if s is not None and str(s).strip())
+    return list(dict.fromkeys(cleaned))
+
+
+def chunk_symbols(symbols, size=MAX_SYMBOLS_PER_REQUEST):
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+
+def parse_quote_response(data):
+    """{symbol: quote "All" block} from one quote response; symbol errors are reported and skipped."""
+    response = data.get("QuoteResponse", {})
+    messages = response.get("Messages", {}).get("Message", [])
+    for message in messages if isinstance(messages, list) else [messages]:
+        print(f"⚠️ E*TRADE quote message: {message.get('description', message)}")
+    records = {}
+    for quote in response.get("QuoteData", []):
+        symbol = quote.get("Product", {}).get("symbol")
+        if symbol:
+            records[symbol.upper()] = dict(quote.get("All", {}), dateTimeUTC=quote.get("dateTimeUTC"))
+    return records
+
+
+def _fetch_chunk(session, base_url, chunk):
+    """Returns (status code, records) for one batch of at most MAX_SYMBOLS_PER_REQUEST symbols."""
+    url = f"{base_url}/v1/market/quote/{','.join(chunk)}.json"
+    with provider("etrade"):
+        response = session.get(url, params={"detailFlag": "ALL"}, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        if response.status_code != 401:
+            print(f"⚠️ Quote batch {chunk[0]}..{chunk[-1]} failed: {response.status_code} – {response.text[:200]}")
+        return response.status_code, {}
+    return 200, parse_quote_response(response.json())
+
+
+def fetch_quote_records(symbols, session=None, base_url=None, workers=QUOTE_WORKERS, refresh_on_401=True):
+    """
+    Raw quote blocks for `symbols` as {symbol: dict}, fetched in concurrent batches.
+    Uses the shared E*TRADE session unless one is passed in.
+    """
+    symbols = clean_symbols(symbols)
+    if not symbols:
+        return {}
+    own_session = session is None
+    if own_session:
+        from etrade_auth import get_etrade_session
+        session, base_url = get_etrade_session()
+
+    chunks = chunk_symbols(symbols)
+    results = run_ordered(chunks, lambda chunk: _fetch_chunk(session, base_url, chunk), workers)
+    unauthorized = [chunk for chunk, result in zip(chunks, results) if result and result[0] == 401]
+    if unauthorized:
+        if not own_session or not refresh_on_401:
+            raise QuoteAuthError("❌ E*TRADE returned 401 Unauthorized. Please re-authorize.")
+        print("❌ 401 Unauthorized: OAuth token expired. Refreshing token...")
+        session, base_url = get_etrade_session(force_new=True)
+        retried = run_ordered(unauthorized, lambda chunk: _fetch_chunk(session, base_url, chunk), workers)
+        if any(result and result[0] == 401 for result in retried):
+            raise QuoteAuthError("❌ Failed to refresh OAuth token. Please re-authorize manually.")
+        results += retried
+
+    records = {}
+    for result in results:
+        if result:
+            records.update(result[1])
+    return {symbol: records[symbol] for symbol in symbols if symbol in records}
+
+
+def _epoch_to_datetime(value):
+    try:
+        return datetime.fromtimestamp(int(value)) if value else None
+    except (TypeError, ValueError, OSError):
+        return None
+
+
+def quotes_frame(records):
+    """Typed quote table (one row per symbol, QUOTE_COLUMNS) from fetch_quote_records output."""
+    rows = []
+    for symbol, block in records.items():
+        row = {"Ticker": symbol}
+        for column, (field, dtype) in QUOTE_COLUMNS.items():
+            value = block.get(field)
+            row[column] = _epoch_to_datetime(value) if dtype.startswith("datetime") else value
+        rows.append(row)
+    df = pd.DataFrame(rows, columns=["Ticker"] + list(QUOTE_COLUMNS))
+    for column, (_, dtype) in QUOTE_COLUMNS.items():
+        if dtype.startswith("datetime"):
+            df[column] = pd.to_datetime(df[column])
+        elif dtype == "Int64":
+            df[column] = pd.to_numeric(df[column], errors="coerce").round().astype(dtype)
+        else:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+    return df
+
+
+def fetch_quotes(symbols, session=None, base_url=None, workers=QUOTE_WORKERS, refresh_on_401=True):
+    """Typed quote table for `symbols`, in input order; symbols E*TRADE rejects are omitted."""
+    return quotes_frame(fetch_quote_records(symbols, session, base_url, workers, refresh_on_401))
@@ -0,0 +1,216 @@
+"""
+Shared E*TRADE OAuth session with background keep-alive.
+
+E*TRADE access tokens go inactive after two idle hours and expire at midnight
+US/Eastern. The manager keeps one OAuth1Session per process, built from the local
+token store (etrade_auth.auth_file_path, shared by TradeTracker, PutTracker, the
+dividend collector and day.py), and:
+
+* renews the token via /oauth/renew_access_token from a daemon thread whenever the
+  session has been idle for RENEW_AFTER, so the first call after a quiet spell
+  does not hit an inactive token;
+* picks up a token another app stored (re-authorized) without prompting again;
+* tracks token age and only falls back to the interactive authorize_etrade()
+  flow when the token has expired at midnight or a renewal is rejected.
+
+    from etrade_auth import get_etrade_session   # delegates here
+    session, base_url = get_etrade_session()
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytz
+
+import etrade_auth
+
+EASTERN = pytz.timezone("US/Eastern")
+INACTIVITY_LIMIT = timedelta(hours=2)   # E*TRADE deactivates tokens idle this long
+RENEW_AFTER = timedelta(minutes=90)     # Renew well before the inactivity limit
+CHECK_INTERVAL = 300                    # Seconds between keep-alive checks
+RENEW_URL = etrade_auth.prod_base_url + "/oauth/renew_access_token"
+
+
+def read_token_store(path=None):
+    """The stored token record ({} if missing or unreadable)."""
+    path = path or etrade_auth.auth_file_path
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_token_store(path=None, **fields):
+    """Merges fields into the stored record (atomic replace); no-op if there is no token."""
+    path = path or etrade_auth.auth_file_path
+    record = read_token_store(path)
+    if not record.get("oauth_token"):
+        return
+    record.update(fields)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(record, f)
+    os.replace(tmp, path)
+
+
+def token_issued_at(record):
+    """When the stored token was issued; tokens saved before this field existed use their date."""
+    issued = record.get("issued_at") or record.get("date")
+    return datetime.fromisoformat(issued) if issued else None
+
+
+def token_expired(record, now=None):
+    """True once midnight US/Eastern has passed since the token was issued."""
+    issued = token_issued_at(record)
+    if issued is None:
+        return True
+    now = now or datetime.now()
+    issued_et = EASTERN.localize(issued) if issued.tzinfo is None else issued.astimezone(EASTERN)
+    now_et = EASTERN.localize(now) if now.tzinfo is None else now.astimezone(EASTERN)
+    # Local wall times are treated as Eastern, which is what the desktop apps run on
+    return issued_et.date() < now_et.date()
+
+
+class EtradeSessionManager:
+    def __init__(self, store_path=None, check_interval=CHECK_INTERVAL, clock=datetime.now):
+        self.store_path = store_path or etrade_auth.auth_file_path
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._session = None
+        self._token = None
+        self._last_activity = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- session ---------------------------------------------------------
+    def _build_session(self, token, secret):
+        from requests_oauthlib import OAuth1Session
+
+        session = OAuth1Session(etrade_auth.consumer_key, etrade_auth.consumer_secret,
+                                resource_owner_key=token, resource_owner_secret=secret)
+        session.hooks["response"].append(self._on_response)
+        self._session, self._token = session, token
+        self._last_activity = self._clock()
+        return session
+
+    def _on_response(self, response, *args, **kwargs):
+        if response.status_code != 401:
+            self._last_activity = self._clock()
+        return response
+
+    def _authorize(self, force_new):
+        token, secret = etrade_auth.authorize_etrade(force_new=force_new)
+        if not token or not secret:
+            raise Exception("❌ Could not obtain valid OAuth tokens. Please re-authorize.")
+        if not read_token_store(self.store_path).get("issued_at"):
+            update_token_store(self.store_path, issued_at=self._clock().isoformat(timespec="seconds"))
+        return self._build_session(token, secret)
+
+    def get_session(self, force_new=False):
+        """(session, base_url), renewing or re-authorizing only when the stored token needs it."""
+        with self._lock:
+            record = read_token_store(self.store_path)
+            if force_new:
+                # Callers force a new session after a 401; a renewal avoids the prompt if it works
+                renewable = (self._session is not None and record.get("oauth_token") == self._token
+                             and not token_expired(record, self._clock()))
+                if not (renewable and self.renew()):
+                    self._authorize(force_new=True)
+            elif not record.get("oauth_token") or token_expired(record, self._clock()):
+                if record.get("oauth_token"):
+                    print("🔑 E*TRADE token expired at midnight ET; re-authorizing...")
+                self._authorize(force_new=bool(record.get("oauth_token")))
+            elif self._session is None or record["oauth_token"] != self._token:
+                # First use in this process, or another app stored a newer token
+                self._build_session(record["oauth_token"], record["oauth_token_secret"])
+                if self._stored_idle(record) >= INACTIVITY_LIMIT and not self.renew():
+                    self._authorize(force_new=True)
+            elif self.idle_for() >= INACTIVITY_LIMIT and not self.renew():
+                self._authorize(force_new=True)
+            self.start_keepalive()
+            return self._session, etrade_auth.prod_base_url
+
+    def _stored_idle(self, record):
+        """Idle time according to the token store (activity recorded by any app)."""
+        stamps = [record.get("last_renewed"), record.get("issued_at")]
+        stamps = [datetime.fromisoformat(s) for s in stamps if s]
+        return self._clock() - max(stamps) if stamps else INACTIVITY_LIMIT
+
+    # --- keep-alive ------------------------------------------------------
+    def idle_for(self):
+        return None if self._last_activity is None else self._clock() - self._last_activity
+
+    def renew(self):
+        """Reactivates the current token; True on success. Never prompts."""
+        with self._lock:
+            if self._session is None:
+                return False
+            try:
+                response = self._session.get(RENEW_URL, timeout=10)
+            except Exception as e:
+                print(f"⚠️ E*TRADE token renewal failed: {e}")
+                return False
+            if response.status_code != 200:
+                print(f"⚠️ E*TRADE token renewal rejected: {response.status_code}")
+                return False
+            now = self._clock()
+            self._last_activity = now
+            update_token_store(self.store_path, last_renewed=now.isoformat(timespec="seconds"))
+            return True
+
+    def keepalive_once(self):
+        """One keep-alive check: renew if idle for RENEW_AFTER and the token has not expired."""
+        with self._lock:
+            if self._session is None:
+                return
+            record = read_token_store(self.store_path)
+            if record.get("oauth_token") != self._token or token_expired(record, self._clock()):
+                return  # Re-authorization happens on the next get_session(), where a prompt is expected
+            idle = min(self.idle_for(), self._stored_idle(record))
+            if idle >= RENEW_AFTER and self.renew():
+                print("🔄 E*TRADE token renewed in the background")
+
+    def _keepalive_loop(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.keepalive_once()
+            except Exception as e:
+                print(f"⚠️ E*TRADE keep-alive error: {e}")
+
+    def start_keepalive(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._keepalive_loop, name="etrade-keepalive", daemon=True)
+            self._thread.start()
+
+    def stop_keepalive(self):
+        self._stop.set()
+
+    def status(self):
+        """Token age, idle time and expiry of the current token, for logs and status bars."""
+        record = read_token_store(self.store_path)
+        issued = token_issued_at(record)
+        now = self._clock()
+        return {
+            "has_token": bool(record.get("oauth_token")),
+            "token_age": now - issued if issued else None,
+            "idle_for": self.idle_for(),
+            "last_renewed": record.get("last_renewed"),
+            "expired": token_expired(record, now) if record else True,
+        }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager():
+    """The process-wide session manager."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = EtradeSessionManager()
+        return _manager
@@ -0,0 +1,218 @@
+"""
+Offline feature store of per-minute technical features keyed by (ticker, datetime).
+
+Features are materialized once per sealed bar by ai_features.technical_feature_frame,
+the same code for training and live scoring, and stored as immutable rows under
+
+    feature_store/<FEATURE_VERSION>/<TICKER>/<YYYY-MM-DD>.<parquet|pkl>
+
+update() only computes bars newer than the last stored bar of each ticker, warming
+the rolling/EWM indicators up on the last WARMUP_BARS stored bars, so appending one
+minute costs a small tail recompute instead of a full-history rebuild. Every stored
+value only depends on bars at or before its own timestamp, so reads bounded by
+`as_of` are point-in-time correct for both training sets and live inference.
+
+Bump FEATURE_VERSION whenever add_technical_indicators changes; each version is
+materialized side by side so older models keep reading the columns they were trained on.
+"""
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from ai_features import BASE_FEATURE_COLUMNS, technical_feature_frame
+from prediction_journal import PART_FORMAT, read_frame, write_frame
+
+FEATURE_VERSION = "tech-v1"
+STORE_DIR = "feature_store"
+FEATURE_COLUMNS = BASE_FEATURE_COLUMNS + ["prev_close"]
+WARMUP_BARS = 500  # EWM weight left outside the warm-up is below float precision
+
+
+def _normalize_bars(bars):
+    """Upper-case tickers, datetime column, no NaT rows, last row kept per (ticker, minute)."""
+    bars = bars[["Datetime", "Ticker", "Open", "High", "Low", "Close", "Volume"]].copy()
+    bars["Ticker"] = bars["Ticker"].astype(str).str.upper()
+    if not pd.api.types.is_datetime64_any_dtype(bars["Datetime"]):
+        bars["Datetime"] = pd.to_datetime(bars["Datetime"], errors="coerce")
+    bars = bars.dropna(subset=["Datetime"])
+    return bars.drop_duplicates(["Ticker", "Datetime"], keep="last")
+
+
+class FeatureStore:
+    def __init__(self, root=STORE_DIR, version=FEATURE_VERSION):
+        self.root = root
+        self.version = version
+        self.base = os.path.join(root, version)
+        self._tails = {}  # ticker -> last WARMUP_BARS stored rows
+        self._lock = threading.RLock()
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.base, ticker.upper())
+
+    def _day_path(self, ticker, day):
+        return os.path.join(self._ticker_dir(ticker), f"{day}.{PART_FORMAT}")
+
+    def _days(self, ticker):
+        return sorted(glob.glob(os.path.join(self._ticker_dir(ticker), f"*.{PART_FORMAT}")))
+
+    def tickers(self):
+        if not os.path.isdir(self.base):
+            return []
+        return sorted(name for name in os.listdir(self.base) if os.path.isdir(os.path.join(self.base, name)))
+
+    def _write_meta(self):
+        os.makedirs(self.base, exist_ok=True)
+        meta_path = os.path.join(self.base, "_meta.json")
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.version, "columns": FEATURE_COLUMNS,
+                           "created_at": datetime.now().isoformat(timespec="seconds")}, f, indent=2)
+
+    def _tail(self, ticker):
+        """Last WARMUP_BARS stored rows of a ticker, read from disk on first use."""
+        tail = self._tails.get(ticker)
+        if tail is None:
+            frames, rows = [], 0
+            for path in reversed(self._days(ticker)):
+                frames.append(read_frame(path))
+                rows += len(frames[-1])
+                if rows >= WARMUP_BARS:
+                    break
+            tail = pd.concat(frames[::-1], ignore_index=True).tail(WARMUP_BARS) if frames else pd.DataFrame()
+            self._tails[ticker] = tail
+        return tail
+
+    def _append(self, ticker, rows):
+        """Writes new feature rows into their day partitions."""
+        os.makedirs(self._ticker_dir(ticker), exist_ok=True)
+        for day, part in rows.groupby(rows["datetime"].dt.strftime("%Y-%m-%d")):
+            path = self._day_path(ticker, day)
+            if os.path.exists(path):
+                part = pd.concat([read_frame(path), part], ignore_index=True)
+            write_frame(part.reset_index(drop=True), path)
+
+    def update(self, bars, sealed_before=None):
+        """
+        Materializes features for bars not yet in the store and returns the number
+        of new rows. Bars at or after `sealed_before` (the still-forming minute) are
+        ignored. Bars at or before a ticker's last stored bar are treated as already
+        sealed and skipped; use rebuild() to backfill or correct history.
+        """
+        if bars is None or bars.empty:
+            return 0
+        bars = _normalize_bars(bars)
+        if sealed_before is not None:
+            bars = bars[bars["Datetime"] < pd.Timestamp(sealed_before)]
+
+        added = 0
+        with self._lock:
+            self._write_meta()
+            for ticker, tdf in bars.groupby("Ticker", sort=False):
+                tail = self._tail(ticker)
+                history = tdf.iloc[:0].drop(columns="Ticker")
+                if not tail.empty:
+                    tdf = tdf[tdf["Datetime"] > tail["datetime"].iloc[-1]]
+                    history = tail.rename(columns={"datetime": "Datetime", "open": "Open", "high": "High",
+                                                   "low": "Low", "close": "Close", "volume": "Volume"})
+                    history = history[["Datetime", "Open", "High", "Low", "Close", "Volume"]]
+                if tdf.empty:
+                    continue
+                computed = technical_feature_frame(ticker, pd.concat([history, tdf], ignore_index=True))
+                new_rows = computed.iloc[len(history):].reset_index(drop=True)
+                self._append(ticker, new_rows)
+                self._tails[ticker] = pd.concat([tail, new_rows], ignore_index=True).tail(WARMUP_BARS)
+                added += len(new_rows)
+        return added
+
+    def rebuild(self, bars):
+        """Drops the stored rows of every ticker in `bars` and recomputes them from scratch."""
+        bars = _normalize_bars(bars)
+        with self._lock:
+            for ticker in bars["Ticker"].unique():
+                for path in self._days(ticker):
+                    os.remove(path)
+                self._tails.pop(ticker, None)
+        return self.update(bars)
+
+    def read(self, tickers=None, start=None, end=None, as_of=None, columns=None):
+        """
+        Returns stored feature rows with start <= datetime <= min(end, as_of),
+        sorted by ticker and datetime. Only the day partitions in range are opened.
+        """
+        if as_of is not None:
+            end = as_of if end is None else min(pd.Timestamp(end), pd.Timestamp(as_of))
+        first = pd.Timestamp(start).strftime("%Y-%m-%d") if start is not None else None
+        last = pd.Timestamp(end).strftime("%Y-%m-%d") if end is not None else None
+        wanted = [t.upper() for t in tickers] if tickers is not None else self.tickers()
+
+        frames = []
+        for ticker in wanted:
+            for path in self._days(ticker):
+                day = os.path.basename(path).split(".")[0]
+                if (first is None or day >= first) and (last is None or day <= last):
+                    frames.append(read_frame(path))
+        if not frames:
+            return pd.DataFrame(columns=["ticker", "datetime"] + FEATURE_COLUMNS)
+
+        df = pd.concat(frames, ignore_index=True)
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= df["datetime"] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= df["datetime"] <= pd.Timestamp(end)
+        df = df[mask]
+        if columns is not None:
+            df = df[["ticker", "datetime"] + [c for c in columns if c in df.columns]]
+        return df.sort_values(["ticker", "datetime"], kind="mergesort").reset_index(drop=True)
+
+    def latest(self, tickers, as_of=None):
+        """
+        One row per ticker with the newest features at or before `as_of`, in the
+        caller's ticker order. Served from the in-memory tails when possible.
+        """
+        rows = []
+        with self._lock:
+            for ticker in dict.fromkeys(t.upper() for t in tickers):
+                tail = self._tail(ticker)
+                if as_of is not None and not tail.empty:
+                    tail = tail[tail["datetime"] <= pd.Timestamp(as_of)]
+                    if tail.empty:
+                        tail = self.read([ticker], end=as_of).tail(1)
+                if not tail.empty:
+                    rows.append(tail.iloc[[-1]])
+        if not rows:
+            return pd.DataFrame(columns=["ticker", "datetime"] + FEATURE_COLUMNS)
+        return pd.concat(rows, ignore_index=True)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_feature_store(root=STORE_DIR, version=FEATURE_VERSION):
+    """Returns the shared store for (root, version) so tails stay cached across calls."""
+    key = (os.path.abspath(root), version)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = FeatureStore(root, version)
+            _stores[key] = store
+        return store
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Materialize features from a minute-bar CSV")
+    parser.add_argument("bars", nargs="?", default="historical_data.csv", help="CSV with Datetime, Ticker, OHLCV")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute stored tickers from scratch")
+    args = parser.parse_args()
+
+    store = get_feature_store()
+    bars_df = pd.read_csv(args.bars)
+    added = store.rebuild(bars_df) if args.rebuild else store.update(bars_df)
+    print(f"🧮 Stored {added} feature rows ({store.version}) for {bars_df['Ticker'].nunique()} tickers")
@@ -0,0 +1,93 @@
+"""
+As-of join between logged trades and model predictions.
+
+Replaces the per-trade scan of the whole prediction log in
+retrain_model_from_feedback with one sort of each side and a per-ticker,
+tolerance-bounded nearest merge_asof. The result is written as a reusable
+labeled-outcomes table (prediction features + trade result + label) that any
+training job can load.
+"""
+import os
+
+import pandas as pd
+
+from prediction_journal import JOURNAL_DIR, PART_FORMAT, load_predictions, read_frame, write_frame
+
+MATCH_TOLERANCE = pd.Timedelta(minutes=10)
+LABELED_OUTCOMES_FILE = f"labeled_outcomes.{PART_FORMAT}"
+PREDICTION_KEY_COLUMNS = ["Ticker", "Datetime", "Predicted_Prob", "Outcome"]
+TRADE_COLUMNS = ["Open Datetime", "Close Datetime", "Profit/Loss", "Strategy", "Type"]
+
+
+def match_trades_to_predictions(trade_df, preds_df, tolerance=MATCH_TOLERANCE):
+    """
+    Matches each trade to the prediction for the same ticker nearest to its
+    Open Datetime, within `tolerance`. Unmatched trades are dropped.
+    Returns one row per matched trade with the prediction's columns, a
+    Prediction Datetime column, the trade columns and a binary `label`.
+    """
+    if trade_df.empty or preds_df.empty:
+        return pd.DataFrame()
+
+    trades = trade_df[[c for c in ["Ticker"] + TRADE_COLUMNS if c in trade_df.columns]].copy()
+    trades["Ticker"] = trades["Ticker"].astype(str).str.upper()
+    trades["Open Datetime"] = pd.to_datetime(trades["Open Datetime"], errors="coerce")
+    trades = trades.dropna(subset=["Open Datetime"]).sort_values("Open Datetime", kind="mergesort")
+
+    preds = preds_df.copy()
+    preds["Ticker"] = preds["Ticker"].astype(str).str.upper()
+    preds["Datetime"] = pd.to_datetime(preds["Datetime"], errors="coerce")
+    preds = preds.dropna(subset=["Datetime"]).sort_values("Datetime", kind="mergesort")
+    preds["Prediction Datetime"] = preds["Datetime"]
+
+    # merge_asof needs identical key dtypes on both sides
+    trades["Open Datetime"] = trades["Open Datetime"].astype("datetime64[ns]")
+    preds["Datetime"] = preds["Datetime"].astype("datetime64[ns]")
+
+    matched = pd.merge_asof(
+        trades, preds,
+        left_on="Open Datetime", right_on="Datetime",
+        by="Ticker", direction="nearest", tolerance=tolerance,
+    )
+    matched = matched.dropna(subset=["Prediction Datetime"]).drop(columns=["Datetime"])
+    matched["label"] = (matched["Profit/Loss"] > 0).astype(int)
+    return matched.reset_index(drop=True)
+
+
+def feature_columns(labeled_df):
+    """Model feature columns of a labeled-outcomes table (everything logged with the prediction)."""
+    excluded = set(PREDICTION_KEY_COLUMNS + TRADE_COLUMNS + ["Prediction Datetime", "label"])
+    return [c for c in labeled_df.columns if c not in excluded]
+
+
+def build_labeled_outcomes(prediction_log_path=JOURNAL_DIR, trade_log_path="trade_log.xlsx",
+                           output_path=LABELED_OUTCOMES_FILE, trade_df=None, tolerance=MATCH_TOLERANCE):
+    """
+    Joins the trade log with the predictions around each trade and writes the
+    labeled-outcomes table. Only the prediction window spanned by the trades is read.
+    """
+    if trade_df is None:
+        trade_df = pd.read_excel(trade_log_path, parse_dates=["Open Datetime"])
+    trade_df = trade_df.copy()
+    trade_df["Ticker"] = trade_df["Ticker"].astype(str).str.upper()
+    open_times = pd.to_datetime(trade_df["Open Datetime"], errors="coerce")
+    if open_times.isna().all():
+        return pd.DataFrame()
+
+    preds_df = load_predictions(
+        prediction_log_path,
+        start=open_times.min() - tolerance,
+        end=open_times.max() + tolerance,
+        tickers=trade_df["Ticker"].dropna().unique().tolist(),
+    )
+    labeled = match_trades_to_predictions(trade_df, preds_df, tolerance)
+    if output_path and not labeled.empty:
+        write_frame(labeled, output_path)
+        print(f"🔗 Matched {len(labeled)} of {len(trade_df)} trades to predictions → {output_path}")
+    return labeled
+
+
+def load_labeled_outcomes(path=LABELED_OUTCOMES_FILE):
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return read_frame(path)
@@ -0,0 +1,142 @@
+"""
+Keyed SQLite cache for FMP API responses.
+
+Replaces fmp_dividend_cache.json, which was loaded whole at import and rewritten
+whole on every save. Each (endpoint, symbol) entry is its own row holding the JSON
+payload plus fetched_at/expires_at timestamps, so a lookup is a primary-key read
+and a save writes one row. The JSON cache is migrated once on first open (entries
+are dated by the file's modification time but expire one TTL after the
+migration) and then left in place untouched.
+
+    cache = get_fmp_cache()
+    entry = cache.get("O")          # CacheEntry or None
+    if entry is None or entry.expired:
+        cache.put("O", fetched_history)
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+CACHE_DB = "fmp_cache.sqlite"
+LEGACY_JSON = "fmp_dividend_cache.json"
+DIVIDENDS = "stock_dividend"
+DEFAULT_TTL = timedelta(days=30)  # Monthly payers add a record roughly every 30 days
+
+CacheEntry = namedtuple("CacheEntry", ["data", "fetched_at", "expires_at", "expired"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fmp_cache (
+    endpoint   TEXT NOT NULL,
+    symbol     TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    expires_at TEXT,
+    PRIMARY KEY (endpoint, symbol)
+);
+CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class FmpCache:
+    def __init__(self, path=CACHE_DB, endpoint=DIVIDENDS, ttl=DEFAULT_TTL, legacy_json=LEGACY_JSON):
+        self.path = path
+        self.endpoint = endpoint
+        self.ttl = ttl
+        self._local = threading.local()  # sqlite3 connections are per thread
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        if legacy_json:
+            self.migrate_json(legacy_json)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def migrate_json(self, json_path):
+        """Copies a legacy {symbol: payload} JSON cache into the table once; returns rows added."""
+        conn = self._connect()
+        key = f"migrated:{os.path.abspath(json_path)}"
+        if not os.path.exists(json_path) or conn.execute(
+                "SELECT 1 FROM cache_meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        with open(json_path, "r") as f:
+            legacy = json.load(f)
+        # fetched_at keeps the file's age for refresh planning, but the TTL runs from the
+        # migration: an old file would otherwise arrive already expired and be refetched whole
+        fetched_at = datetime.fromtimestamp(os.path.getmtime(json_path))
+        migrated_at = max(fetched_at, datetime.now())
+        expires_at = (migrated_at + self.ttl).isoformat(timespec="seconds") if self.ttl else None
+        rows = [(self.endpoint, symbol, json.dumps(payload), fetched_at.isoformat(timespec="seconds"), expires_at)
+                for symbol, payload in legacy.items()]
+        with conn:
+            # Entries already fetched into SQLite are newer than the legacy file
+            conn.executemany("INSERT OR IGNORE INTO fmp_cache VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT INTO cache_meta VALUES (?, ?)", (key, datetime.now().isoformat(timespec="seconds")))
+        print(f"📦 Migrated {len(rows)} FMP cache entries from {json_path} to {self.path}")
+        return len(rows)
+
+    def get(self, symbol, now=None):
+        """The cached entry for a symbol (expired entries included, flagged), or None."""
+        row = self._connect().execute(
+            "SELECT payload, fetched_at, expires_at FROM fmp_cache WHERE endpoint = ? AND symbol = ?",
+            (self.endpoint, symbol)).fetchone()
+        if row is None:
+            return None
+        payload, fetched_at, expires_at = row
+        now = now or datetime.now()
+        expired = expires_at is not None and datetime.fromisoformat(expires_at) <= now
+        return CacheEntry(json.loads(payload), datetime.fromisoformat(fetched_at),
+                          datetime.fromisoformat(expires_at) if expires_at else None, expired)
+
+    def put(self, symbol, data, ttl=None, now=None):
+        """Stores one symbol's payload, stamped now and expiring after ttl (default: self.ttl)."""
+        now = now or datetime.now()
+        ttl = ttl or self.ttl
+        expires_at = (now + ttl).isoformat(timespec="seconds") if ttl else None
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO fmp_cache VALUES (?, ?, ?, ?, ?)",
+                         (self.endpoint, symbol, json.dumps(data), now.isoformat(timespec="seconds"), expires_at))
+
+    def fetched_times(self):
+        """{symbol: fetched_at} for every cached symbol, without loading payloads."""
+        rows = self._connect().execute(
+            "SELECT symbol, fetched_at FROM fmp_cache WHERE endpoint = ?", (self.endpoint,)).fetchall()
+        return {symbol: datetime.fromisoformat(fetched_at) for symbol, fetched_at in rows}
+
+    def __contains__(self, symbol):
+        return self._connect().execute(
+            "SELECT 1 FROM fmp_cache WHERE endpoint = ? AND symbol = ?", (self.endpoint, symbol)).fetchone() is not None
+
+    def __getitem__(self, symbol):
+        entry = self.get(symbol)
+        if entry is None:
+            raise KeyError(symbol)
+        return entry.data
+
+    def __len__(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM fmp_cache WHERE endpoint = ?", (self.endpoint,)).fetchone()[0]
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_fmp_cache(path=CACHE_DB, endpoint=DIVIDENDS):
+    """Returns the shared cache for (path, endpoint), migrating the legacy JSON on first use."""
+    key = (os.path.abspath(path), endpoint)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = FmpCache(path, endpoint, legacy_json=LEGACY_JSON if endpoint == DIVIDENDS else None)
+            _caches[key] = cache
+        return cache
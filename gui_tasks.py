@@ -0,0 +1,235 @@
+"""
+Background tasks for the Tk GUIs.
+
+Price refreshes, option chain lookups and workbook saves used to run directly in
+Tk callbacks, freezing the window until they finished. Here the slow part runs on
+a shared worker pool and its outcome is handed back to the Tk main loop:
+
+* workers never touch widgets - progress, results and errors are put on a
+  thread-safe queue per Tk root, which that root drains with after() polling;
+* on_done / on_error / on_progress callbacks therefore run on the main thread;
+* tasks are cancelled cooperatively (check_cancelled() inside the work, or
+  Task.cancel() before it starts); a cancelled task's on_done is never called;
+* a named task is not started twice while it is still running, so a repeated
+  button press or timer tick cannot pile up refreshes, while different names
+  run side by side.
+
+    tasks = get_task_runner()
+    tasks.submit(self.root, self.fetch_prices, trades, name="prices",
+                 on_done=self.show_prices, on_progress=self.show_status)
+
+Workbook work is safe to run here: each workbook_action holds the session's lock
+for its unit of work, so two workers on the same file take turns. Keep network
+calls outside those actions (fetch first, then write in a short workbook_action),
+or the main thread's own workbook calls wait for the whole fetch.
+"""
+import itertools
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4
+POLL_MS = 50
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that was asked to stop."""
+
+
+class Task:
+    """Handle on a submitted task; safe to use from the main thread and from its worker."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, root, name, on_done=None, on_error=None, on_progress=None):
+        self.id = next(Task._ids)
+        self.root = root
+        self.name = name or f"task-{self.id}"
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self._cancel = threading.Event()
+        self._queue = None
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def cancel(self):
+        """Asks the task to stop; it is dropped outright if it has not started yet."""
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        if self.cancelled:
+            raise TaskCancelled(self.name)
+
+    def report(self, value=None, message=None):
+        """Sends progress (a fraction, a count, anything) and/or a status message to on_progress."""
+        self._queue.put(("progress", self, (value, message)))
+
+    def __repr__(self):
+        return f"Task({self.name!r}, cancelled={self.cancelled}, done={self.done})"
+
+
+_local = threading.local()
+
+
+def current_task():
+    """The Task running on this thread (None on the main thread)."""
+    return getattr(_local, "task", None)
+
+
+def report_progress(value=None, message=None):
+    """Progress from inside task code; a no-op when the code runs outside a task."""
+    task = current_task()
+    if task is not None:
+        task.report(value, message)
+
+
+def check_cancelled():
+    """Raises TaskCancelled if the running task was cancelled; a no-op outside a task."""
+    task = current_task()
+    if task is not None:
+        task.check()
+
+
+class TaskRunner:
+    """Worker pool shared by every Tk window in the process."""
+
+    def __init__(self, max_workers=MAX_WORKERS, poll_ms=POLL_MS):
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-task")
+        self._lock = threading.Lock()
+        self._queues = {}       # root -> queue.Queue of (kind, task, payload)
+        self._active = {}       # root -> {name: Task} submitted and not yet delivered
+        self._polling = set()
+
+    def submit(self, root, fn, *args, name=None, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on a worker; call from the Tk main thread.
+        Returns the Task, or the already running one if `name` is still busy.
+        """
+        with self._lock:
+            running = self._active.setdefault(root, {})
+            if name is not None and name in running:
+                print(f"⏳ {name} is already running")
+                return running[name]
+            task = Task(root, name, on_done, on_error, on_progress)
+            task._queue = self._queues.setdefault(root, queue.Queue())
+            running[task.name] = task
+        task.future = self._executor.submit(self._run, task, fn, args, kwargs)
+        task.future.add_done_callback(lambda future: self._dropped(task, future))
+        self._ensure_polling(root)
+        return task
+
+    @staticmethod
+    def _dropped(task, future):
+        # Cancelled before a worker picked it up: _run never reports, so report here
+        if future.cancelled():
+            task._queue.put(("error", task, TaskCancelled(task.name)))
+
+    def _run(self, task, fn, args, kwargs):
+        _local.task = task
+        try:
+            task.check()
+            task._queue.put(("done", task, fn(*args, **kwargs)))
+        except BaseException as e:
+            task._queue.put(("error", task, e))
+        finally:
+            _local.task = None
+
+    def running(self, root, name=None):
+        """Tasks of a window still in flight (optionally only the one called `name`)."""
+        with self._lock:
+            tasks = list(self._active.get(root, {}).values())
+        return [t for t in tasks if name is None or t.name == name]
+
+    def cancel(self, root, name=None):
+        """Cancels a window's tasks (or the one called `name`); returns how many were asked to stop."""
+        tasks = self.running(root, name)
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    def _ensure_polling(self, root):
+        if root in self._polling:
+            return
+        self._polling.add(root)
+        root.after(self.poll_ms, self._poll, root)
+
+    def _poll(self, root):
+        """Delivers queued outcomes on the main thread; polls while the window has tasks in flight."""
+        q = self._queues.get(root)
+        while q is not None:
+            try:
+                kind, task, payload = q.get_nowait()
+            except queue.Empty:
+                break
+            if kind != "progress":
+                with self._lock:
+                    running = self._active.get(root, {})
+                    if running.get(task.name) is task:
+                        del running[task.name]
+            self._deliver(kind, task, payload)
+
+        with self._lock:
+            busy = bool(self._active.get(root)) or (q is not None and not q.empty())
+        if not busy:
+            self._polling.discard(root)
+            return
+        try:
+            root.after(self.poll_ms, self._poll, root)
+        except Exception:
+            # Window was destroyed; its pending outcomes have nowhere to go
+            self._polling.discard(root)
+            self.cancel(root)
+
+    def _deliver(self, kind, task, payload):
+        try:
+            if kind == "progress":
+                if task.on_progress and not task.cancelled:
+                    task.on_progress(*payload)
+            elif kind == "done":
+                if task.cancelled:
+                    print(f"🛑 {task.name} cancelled")
+                elif task.on_done:
+                    task.on_done(payload)
+            elif isinstance(payload, TaskCancelled) or task.cancelled:
+                print(f"🛑 {task.name} cancelled")
+            elif task.on_error:
+                task.on_error(payload)
+            else:
+                print(f"❌ {task.name} failed: {payload}")
+                traceback.print_exception(type(payload), payload, payload.__traceback__)
+        except Exception as e:
+            # A failing callback must not stop delivery for the other tasks
+            print(f"❌ {task.name} callback error: {e}")
+            traceback.print_exc()
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            tasks = [t for running in self._active.values() for t in running.values()]
+        for task in tasks:
+            task.cancel()
+        self._executor.shutdown(wait=wait)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_task_runner():
+    """Process-wide TaskRunner."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = TaskRunner()
+        return _runner
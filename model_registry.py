@@ -0,0 +1,194 @@
+"""
+Versioned model registry with in-memory caching and hot reload.
+
+Each model name gets a directory under model_registry/ holding versioned joblib
+artifacts (v0001.joblib, v0002.joblib, ...) and a manifest.json with per-version
+metadata (features, training window, metrics) and the active version.
+
+Inference code calls get_active_model(), which keeps the active model loaded in
+memory and only re-reads the manifest when its mtime changes, so predictions
+never pay joblib deserialization cost. Promoting or rolling back a version is a
+manifest rewrite; running processes pick it up on their next call.
+
+Command line:
+    python model_registry.py list ai_model
+    python model_registry.py promote ai_model 3
+    python model_registry.py rollback ai_model
+"""
+import argparse
+import json
+import os
+import threading
+from datetime import datetime
+
+import joblib
+
+REGISTRY_DIR = "model_registry"
+
+_lock = threading.RLock()
+_active_cache = {}   # (abs registry dir, name) -> {"manifest_mtime", "version", "model"}
+_file_cache = {}     # abs path -> {"mtime", "model"}
+
+
+def _model_dir(name, registry_dir=REGISTRY_DIR):
+    return os.path.join(registry_dir, name)
+
+
+def _manifest_path(name, registry_dir=REGISTRY_DIR):
+    return os.path.join(_model_dir(name, registry_dir), "manifest.json")
+
+
+def _artifact_path(name, version, registry_dir=REGISTRY_DIR):
+    return os.path.join(_model_dir(name, registry_dir), f"v{version:04d}.joblib")
+
+
+def _write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(name, registry_dir=REGISTRY_DIR):
+    """Returns the manifest dict for a model, or an empty manifest if none exists."""
+    path = _manifest_path(name, registry_dir)
+    if not os.path.exists(path):
+        return {"name": name, "active_version": None, "promotion_history": [], "versions": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def register_model(name, model, metadata=None, promote=False, registry_dir=REGISTRY_DIR):
+    """
+    Saves a new version of a model with its metadata and returns the version number.
+    Metadata typically holds features, training_window and metrics.
+    The new version only serves predictions once promoted.
+    """
+    with _lock:
+        os.makedirs(_model_dir(name, registry_dir), exist_ok=True)
+        manifest = load_manifest(name, registry_dir)
+        version = max((int(v) for v in manifest["versions"]), default=0) + 1
+        artifact = _artifact_path(name, version, registry_dir)
+        tmp_artifact = artifact + ".tmp"
+        joblib.dump(model, tmp_artifact)
+        os.replace(tmp_artifact, artifact)
+
+        manifest["versions"][str(version)] = {
+            "artifact": os.path.basename(artifact),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            **(metadata or {}),
+        }
+        _write_json_atomic(_manifest_path(name, registry_dir), manifest)
+        print(f"📦 Registered {name} v{version}")
+
+        if promote:
+            promote_version(name, version, registry_dir)
+        return version
+
+
+def promote_version(name, version, registry_dir=REGISTRY_DIR):
+    """Makes `version` the active model for `name`."""
+    with _lock:
+        manifest = load_manifest(name, registry_dir)
+        if str(version) not in manifest["versions"]:
+            raise ValueError(f"{name} has no version {version}")
+        manifest["active_version"] = int(version)
+        manifest["promotion_history"].append(int(version))
+        _write_json_atomic(_manifest_path(name, registry_dir), manifest)
+        print(f"✅ Promoted {name} v{version} to active")
+
+
+def rollback(name, registry_dir=REGISTRY_DIR):
+    """Re-activates the previously promoted version and returns it."""
+    with _lock:
+        manifest = load_manifest(name, registry_dir)
+        history = manifest["promotion_history"]
+        if len(history) < 2:
+            raise ValueError(f"{name} has no earlier promoted version to roll back to")
+        history.pop()
+        manifest["active_version"] = history[-1]
+        _write_json_atomic(_manifest_path(name, registry_dir), manifest)
+        print(f"↩️ Rolled {name} back to v{history[-1]}")
+        return history[-1]
+
+
+def load_cached_file(path):
+    """Loads a plain joblib/pickle model file, reusing the in-memory copy until the file changes."""
+    key = os.path.abspath(path)
+    mtime = os.path.getmtime(key)  # Raises FileNotFoundError like joblib.load would
+    with _lock:
+        entry = _file_cache.get(key)
+        if entry is None or entry["mtime"] != mtime:
+            entry = {"mtime": mtime, "model": joblib.load(key)}
+            _file_cache[key] = entry
+        return entry["model"]
+
+
+def get_active_model(name, fallback_path=None, registry_dir=REGISTRY_DIR):
+    """
+    Returns the active in-memory model for `name`.
+    Hot-swaps when a different version is promoted (detected by manifest mtime).
+    Falls back to the legacy model file when the registry has no active version.
+    """
+    try:
+        stat = os.stat(_manifest_path(name, registry_dir))
+        manifest_mtime = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        manifest_mtime = None
+
+    cache_key = (os.path.abspath(registry_dir), name)
+    with _lock:
+        cached = _active_cache.get(cache_key)
+        if manifest_mtime is not None and cached is not None and cached["manifest_mtime"] == manifest_mtime:
+            return cached["model"]
+
+        if manifest_mtime is not None:
+            manifest = load_manifest(name, registry_dir)
+            version = manifest.get("active_version")
+            if version is not None:
+                if cached is None or cached["version"] != version:
+                    model = joblib.load(_artifact_path(name, version, registry_dir))
+                    print(f"🔄 Loaded {name} v{version} into memory")
+                else:
+                    model = cached["model"]
+                _active_cache[cache_key] = {"manifest_mtime": manifest_mtime, "version": version, "model": model}
+                return model
+
+    if fallback_path is None:
+        raise FileNotFoundError(f"No active version of '{name}' in {registry_dir} and no fallback file")
+    return load_cached_file(fallback_path)
+
+
+def get_active_metadata(name, registry_dir=REGISTRY_DIR):
+    """Returns the metadata dict of the active version, or None."""
+    manifest = load_manifest(name, registry_dir)
+    version = manifest.get("active_version")
+    if version is None:
+        return None
+    return {"version": version, **manifest["versions"][str(version)]}
+
+
+def list_versions(name, registry_dir=REGISTRY_DIR):
+    manifest = load_manifest(name, registry_dir)
+    active = manifest.get("active_version")
+    for version, meta in sorted(manifest["versions"].items(), key=lambda kv: int(kv[0])):
+        marker = "*" if active == int(version) else " "
+        metrics = meta.get("metrics", {})
+        print(f"{marker} v{version}  {meta.get('created_at', '')}  {metrics}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model registry")
+    parser.add_argument("command", choices=["list", "promote", "rollback"])
+    parser.add_argument("name", help="Model name (e.g. ai_model, div_continuity)")
+    parser.add_argument("version", nargs="?", type=int, help="Version to promote")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        list_versions(args.name)
+    elif args.command == "promote":
+        if args.version is None:
+            parser.error("promote needs a version")
+        promote_version(args.name, args.version)
+    else:
+        rollback(args.name)
@@ -0,0 +1,198 @@
+"""
+Incremental (warm-start) updates of the AI trade model.
+
+Instead of refitting a 200-tree RandomForest on the full feedback history, each
+run takes only the labeled outcomes newer than the active model's training
+window, grows a few new trees on them (warm_start) and keeps the existing ones.
+The candidate is validated on the most recent slice of the new window against
+the active model and is only promoted in the model registry if it is no worse.
+
+Meant to run off-hours as a low-priority background process:
+    python model_updater.py            # run one update now
+    launch_incremental_update()        # from day.py's scheduler; no-op during market hours
+"""
+import argparse
+import copy
+import os
+import subprocess
+import sys
+import threading
+from datetime import datetime
+
+import pandas as pd
+import pytz
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.pipeline import Pipeline
+from threadpoolctl import threadpool_limits
+
+from feedback_join import build_labeled_outcomes, feature_columns
+from model_registry import get_active_metadata, get_active_model, register_model
+from prediction_journal import JOURNAL_DIR
+
+MODEL_NAME = "ai_model"
+FALLBACK_MODEL_PATH = "ai_model.pkl"
+TREES_PER_WINDOW = 25          # New trees grown per update
+MAX_WINDOW_ROWS = 20000        # Cap on new rows per update (most recent kept)
+VALIDATION_FRACTION = 0.25     # Most recent share of the new window held out
+MIN_VALIDATION_ROWS = 20
+LOG_LOSS_TOLERANCE = 0.01      # Candidate may be at most this much worse than the active model
+OFF_HOURS_START = 17           # ET hour after which updates may run on weekdays
+OFF_HOURS_END = 8              # ET hour before which updates may run on weekdays
+
+_update_process = None         # Popen of the last launched background update
+_update_lock = threading.Lock()
+
+
+def is_off_hours(now=None):
+    """True on weekends and on weekdays outside 08:00-17:00 US/Eastern."""
+    now = now or datetime.now(pytz.timezone("US/Eastern"))
+    return now.weekday() >= 5 or now.hour >= OFF_HOURS_START or now.hour < OFF_HOURS_END
+
+
+def _lower_priority():
+    """Runs the update at below-normal CPU priority so it never competes with live work."""
+    try:
+        import psutil
+        proc = psutil.Process()
+        if os.name == "nt":
+            proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+        else:
+            proc.nice(10)
+    except Exception:
+        if hasattr(os, "nice"):
+            try:
+                os.nice(10)
+            except OSError:
+                pass
+
+
+def _grow_trees(model, X, y, n_new):
+    """
+    Returns a copy of `model` with n_new extra trees/iterations fit on (X, y).
+    For a Pipeline only the final estimator grows; the fitted preprocessing steps
+    (the scaler) are kept as they are so old and new trees see the same inputs.
+    """
+    candidate = copy.deepcopy(model)
+    estimator = candidate
+    if isinstance(candidate, Pipeline):
+        X = candidate[:-1].transform(X)
+        estimator = candidate[-1]
+    params = estimator.get_params()
+    if "n_estimators" in params:        # RandomForest / ExtraTrees
+        estimator.set_params(warm_start=True, n_estimators=params["n_estimators"] + n_new, n_jobs=1)
+    elif "max_iter" in params:          # HistGradientBoosting
+        estimator.set_params(warm_start=True, max_iter=params["max_iter"] + n_new)
+    else:
+        raise ValueError(f"{type(estimator).__name__} does not support warm-start updates")
+    estimator.fit(X, y)
+    return candidate
+
+
+def _score(model, X, y):
+    probs = model.predict_proba(X)[:, 1]
+    return {
+        "accuracy": round(float(accuracy_score(y, (probs >= 0.5).astype(int))), 4),
+        "log_loss": round(float(log_loss(y, probs, labels=[0, 1])), 4),
+        "samples": int(len(y)),
+    }
+
+
+def incremental_update(prediction_log_path=JOURNAL_DIR, trade_log_path="trade_log.xlsx",
+                       fallback_path=FALLBACK_MODEL_PATH, n_new_trees=TREES_PER_WINDOW):
+    """
+    Grows the active model on labeled outcomes newer than its training window.
+    Returns the registered version number, or None if there was nothing to do.
+    """
+    labeled = build_labeled_outcomes(prediction_log_path, trade_log_path)
+    if labeled.empty:
+        print("🟡 No labeled outcomes available for an incremental update.")
+        return None
+
+    active_meta = get_active_metadata(MODEL_NAME) or {}
+    trained_until = (active_meta.get("training_window") or [None, None])[1]
+    if trained_until:
+        labeled = labeled[labeled["Open Datetime"] > pd.Timestamp(trained_until)]
+    labeled = labeled.sort_values("Open Datetime").tail(MAX_WINDOW_ROWS)
+    if labeled["label"].nunique() < 2:
+        print(f"🟡 {len(labeled)} new outcomes, need both wins and losses to update.")
+        return None
+
+    active = get_active_model(MODEL_NAME, fallback_path=fallback_path)
+    if active_meta.get("source") == "retrain_model_from_feedback" and not isinstance(active, Pipeline):
+        # Older retrains registered the bare model fit on scaled features without the scaler
+        print("❌ Active model was trained on scaled features it does not carry; run a full retrain instead.")
+        return None
+    features = list(getattr(active, "feature_names_in_", feature_columns(labeled)))
+    missing = [c for c in features if c not in labeled.columns]
+    if missing:
+        print(f"❌ Labeled outcomes lack model features {missing}; run a full retrain instead.")
+        return None
+
+    n_val = max(int(len(labeled) * VALIDATION_FRACTION), MIN_VALIDATION_ROWS)
+    train, val = labeled.iloc[:-n_val], labeled.iloc[-n_val:]
+    if len(train) < MIN_VALIDATION_ROWS or train["label"].nunique() < 2:
+        print(f"🟡 Only {len(labeled)} new outcomes; not enough to train and validate.")
+        return None
+
+    with threadpool_limits(limits=1):
+        candidate = _grow_trees(active, train[features], train["label"], n_new_trees)
+        candidate_metrics = _score(candidate, val[features], val["label"])
+        active_metrics = _score(active, val[features], val["label"])
+
+    passed = (candidate_metrics["log_loss"] <= active_metrics["log_loss"] + LOG_LOSS_TOLERANCE and
+              candidate_metrics["accuracy"] >= active_metrics["accuracy"])
+    print(f"📊 Validation on {len(val)} newest outcomes: candidate {candidate_metrics} vs active {active_metrics}")
+
+    version = register_model(MODEL_NAME, candidate, metadata={
+        "source": "model_updater.incremental_update",
+        "mode": "incremental",
+        "parent_version": active_meta.get("version"),
+        "features": features,
+        "training_window": [str(train["Open Datetime"].min()), str(train["Open Datetime"].max())],
+        "metrics": candidate_metrics,
+        "baseline_metrics": active_metrics,
+        "validation_passed": bool(passed),
+    }, promote=passed)
+    if not passed:
+        print(f"⛔ v{version} failed the validation gate and was not promoted.")
+    return version
+
+
+def launch_incremental_update():
+    """
+    Starts an incremental update in a separate low-priority process and returns
+    immediately. Does nothing during weekday market hours.
+    """
+    if not is_off_hours():
+        print("⏸️ Skipping incremental model update during market hours.")
+        return None
+    global _update_process
+    with _update_lock:
+        if _update_process is not None and _update_process.poll() is None:
+            print("⏳ Incremental model update is still running.")
+            return _update_process
+        script = os.path.abspath(__file__)
+        print("🌙 Launching background incremental model update...")
+        _update_process = subprocess.Popen([sys.executable, script], cwd=os.getcwd())
+        threading.Thread(target=_reap, args=(_update_process,), name="model-update-reaper", daemon=True).start()
+        return _update_process
+
+
+def _reap(proc):
+    """Waits for a launched update so it does not linger as a zombie, and logs how it ended."""
+    code = proc.wait()
+    if code != 0:
+        print(f"❌ Incremental model update exited with code {code}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental AI model update")
+    parser.add_argument("--trees", type=int, default=TREES_PER_WINDOW, help="New trees to grow")
+    parser.add_argument("--force", action="store_true", help="Run even during market hours")
+    args = parser.parse_args()
+
+    if not args.force and not is_off_hours():
+        print("⏸️ Market hours; use --force to update anyway.")
+        sys.exit(0)
+    _lower_priority()
+    incremental_update(n_new_trees=args.trees)
@@ -0,0 +1,177 @@
+"""
+Option quote cache for the trade trackers.
+
+get_option_price_from_etrade used to fetch the expiration list and then a whole
+option chain for every option trade, even when a book of puts shares a handful of
+underlyings and expiries. The cache fetches:
+
+* each underlying's expiration list once per day, and
+* each (underlying, expiry) chain once per refresh cycle (or CHAIN_TTL seconds),
+  requesting calls and puts together and indexing the contracts by (strike, type),
+
+so every contract on the same chain is served from memory.
+
+    cache = get_option_quote_cache()
+    cache.begin_cycle()                                   # start of a price refresh
+    price = cache.option_price("O", 55, "put", "06/20/2025")
+"""
+import threading
+import time
+from datetime import date, datetime
+
+from screen_engine import provider
+
+CHAIN_TTL = 60            # Seconds an option chain is served before it is refetched
+REQUEST_TIMEOUT = 10
+EXPIRY_FORMATS = ["%m/%d/%Y", "%Y-%m-%d"]
+
+
+def parse_expiry(value):
+    """Expiry as a date from a string (m/d/Y or Y-m-d), datetime or date; None if unparseable."""
+    if isinstance(value, str):
+        for fmt in EXPIRY_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), fmt).date()
+            except ValueError:
+                continue
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else None
+
+
+def parse_expirations(data):
+    """Sorted expiration dates from an optionexpiredate response."""
+    dates = data.get("OptionExpireDateResponse", {}).get("ExpirationDate", [])
+    if isinstance(dates, dict):
+        dates = [dates]
+    return sorted(date(d["year"], d["month"], d["day"]) for d in dates)
+
+
+def parse_option_chain(data):
+    """{(strike, "CALL"|"PUT"): option dict} from an optionchains response."""
+    table = {}
+    pairs = data.get("OptionChainResponse", {}).get("OptionPair", [])
+    if isinstance(pairs, dict):
+        pairs = [pairs]
+    for pair in pairs:
+        for side in ("Call", "Put"):
+            option = pair.get(side)
+            if option and option.get("strikePrice") is not None:
+                table[(float(option["strikePrice"]), side.upper())] = option
+    return table
+
+
+def closest_expiry(expirations, target):
+    return min(expirations, key=lambda d: abs((d - target).days)) if expirations else None
+
+
+def closest_option(table, strike, option_type):
+    """The contract of `option_type` whose strike is nearest to `strike`, or None."""
+    kind = option_type.upper()
+    option = table.get((float(strike), kind))
+    if option is not None:
+        return option
+    candidates = [(abs(k - float(strike)), k) for k, t in table if t == kind]
+    return table[(min(candidates)[1], kind)] if candidates else None
+
+
+class OptionQuoteCache:
+    def __init__(self, session=None, base_url=None, chain_ttl=CHAIN_TTL, clock=time.monotonic):
+        self._session, self._base_url = session, base_url
+        self.chain_ttl = chain_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._expirations = {}   # symbol -> (day fetched, [dates])
+        self._chains = {}        # (symbol, expiry) -> (fetched at, {(strike, type): option})
+        self.requests = 0
+
+    def _get(self, path, params):
+        if self._session is not None:
+            session, base_url = self._session, self._base_url
+        else:
+            from etrade_auth import get_etrade_session
+            session, base_url = get_etrade_session()
+        with provider("etrade"):
+            response = session.get(f"{base_url}{path}", params=params, timeout=REQUEST_TIMEOUT)
+        self.requests += 1
+        if response.status_code != 200:
+            print(f"⚠️ E*TRADE {path} {params.get('symbol')} failed: {response.status_code}")
+            return None
+        return response.json()
+
+    def _key_lock(self, key):
+        # One fetch per key; concurrent lookups of the same chain wait for it
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def begin_cycle(self):
+        """Starts a refresh cycle: chains are refetched, the day's expiration lists are kept."""
+        with self._lock:
+            self._chains.clear()
+
+    def expirations(self, symbol):
+        """The symbol's expiration dates, fetched once per day."""
+        symbol = symbol.strip().upper()
+        with self._key_lock(("exp", symbol)):
+            cached = self._expirations.get(symbol)
+            if cached and cached[0] == date.today():
+                return cached[1]
+            data = self._get("/v1/market/optionexpiredate.json", {"symbol": symbol})
+            if data is None:
+                return []
+            dates = parse_expirations(data)
+            self._expirations[symbol] = (date.today(), dates)
+            return dates
+
+    def chain(self, symbol, expiry):
+        """{(strike, type): option} for one expiry, served from cache within the cycle/TTL."""
+        symbol = symbol.strip().upper()
+        key = (symbol, expiry)
+        with self._key_lock(key):
+            cached = self._chains.get(key)
+            if cached and self._clock() - cached[0] < self.chain_ttl:
+                return cached[1]
+            data = self._get("/v1/market/optionchains.json", {
+                "symbol": symbol, "expiryDay": f"{expiry.day:02d}", "expiryMonth": f"{expiry.month:02d}",
+                "expiryYear": expiry.year, "chainType": "CALLPUT"})
+            if data is None:
+                return {}
+            table = parse_option_chain(data)
+            self._chains[key] = (self._clock(), table)
+            return table
+
+    def option_quote(self, symbol, strike, option_type, expiry_date):
+        """The nearest listed contract (closest expiry, then closest strike), or None."""
+        target = parse_expiry(expiry_date)
+        if target is None:
+            print(f"Could not parse expiry date: {expiry_date}")
+            return None
+        expiry = closest_expiry(self.expirations(symbol), target)
+        if expiry is None:
+            print(f"No expiration dates found for {symbol}")
+            return None
+        return closest_option(self.chain(symbol, expiry), strike, option_type)
+
+    def option_price(self, symbol, strike, option_type, expiry_date):
+        """Last price of the nearest contract, or None."""
+        option = self.option_quote(symbol, strike, option_type, expiry_date)
+        last_price = option.get("lastPrice") if option else None
+        if last_price:
+            print(f"Found {option_type} option for {symbol}: Strike ${option.get('strikePrice')}, Price ${last_price}")
+            return float(last_price)
+        return None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_option_quote_cache():
+    """The process-wide option quote cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = OptionQuoteCache()
+        return _cache
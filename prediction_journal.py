@@ -0,0 +1,200 @@
+"""
+Buffered, partitioned prediction journal replacing per-row appends to prediction_log.csv.
+
+Predictions are buffered in memory and flushed in batches as immutable, typed part
+files under prediction_journal/<YYYY-MM-DD>/ (Parquet when pyarrow is installed,
+otherwise pandas pickles). Day partitions act as the time index, so range queries
+for the feedback join only open the days they need.
+
+The legacy prediction_log.csv is migrated into the journal once, the first time the
+default journal is opened.
+"""
+import atexit
+import glob
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PART_FORMAT = "parquet"
+except ImportError:
+    PART_FORMAT = "pkl"
+
+JOURNAL_DIR = "prediction_journal"
+LEGACY_CSV_LOG = "prediction_log.csv"
+MIGRATION_MARKER = "_migrated_from_csv"
+FLUSH_ROWS = 500          # Flush once this many predictions are buffered
+FLUSH_SECONDS = 300       # ...or when the oldest buffered prediction is this old
+KEY_COLUMNS = ["Ticker", "Datetime", "Predicted_Prob", "Outcome"]
+
+
+def _typed_frame(records):
+    """Applies the journal schema: string ticker, datetime index column, float everything else."""
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+    df["Ticker"] = df["Ticker"].astype(str).str.upper()
+    df["Datetime"] = pd.to_datetime(df["Datetime"], errors="coerce")
+    for col in df.columns:
+        if col not in ("Ticker", "Datetime"):
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    return df.sort_values("Datetime", kind="mergesort").reset_index(drop=True)
+
+
+def write_frame(df, path):
+    """Atomically writes a typed frame as Parquet or pickle, chosen by file extension."""
+    tmp_path = path + ".tmp"
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_frame(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _write_part(df, partition_dir):
+    os.makedirs(partition_dir, exist_ok=True)
+    name = f"part-{datetime.now():%H%M%S}-{uuid.uuid4().hex[:8]}.{PART_FORMAT}"
+    return write_frame(df, os.path.join(partition_dir, name))
+
+
+class PredictionJournal:
+    def __init__(self, root=JOURNAL_DIR, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._buffer = []
+        self._oldest = None
+        self._lock = threading.Lock()
+
+    def append(self, records):
+        """Buffers prediction rows; flushes when the buffer is large or old enough."""
+        if not records:
+            return
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.extend(records)
+            due = (len(self._buffer) >= self.flush_rows or
+                   time.monotonic() - self._oldest >= self.flush_seconds)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Writes buffered rows as one part file per day partition."""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+            self._oldest = None
+        if not records:
+            return 0
+        df = _typed_frame(records)
+        for day, part in df.groupby(df["Datetime"].dt.strftime("%Y-%m-%d")):
+            _write_part(part.reset_index(drop=True), os.path.join(self.root, day))
+        return len(df)
+
+    def partitions(self, start=None, end=None):
+        """Day partition directories overlapping [start, end]."""
+        if not os.path.isdir(self.root):
+            return []
+        first = pd.Timestamp(start).strftime("%Y-%m-%d") if start is not None else None
+        last = pd.Timestamp(end).strftime("%Y-%m-%d") if end is not None else None
+        days = []
+        for name in sorted(os.listdir(self.root)):
+            if not os.path.isdir(os.path.join(self.root, name)):
+                continue
+            if (first is None or name >= first) and (last is None or name <= last):
+                days.append(os.path.join(self.root, name))
+        return days
+
+    def read(self, start=None, end=None, tickers=None, columns=None):
+        """
+        Returns predictions with start <= Datetime <= end (either bound optional),
+        optionally limited to `tickers` and `columns`, sorted by Datetime.
+        Includes rows still waiting in the buffer.
+        """
+        frames = []
+        for day_dir in self.partitions(start, end):
+            for path in sorted(glob.glob(os.path.join(day_dir, "part-*"))):
+                if not path.endswith(".tmp"):
+                    frames.append(read_frame(path))
+        with self._lock:
+            pending = list(self._buffer)
+        if pending:
+            frames.append(_typed_frame(pending))
+        if not frames:
+            return pd.DataFrame(columns=KEY_COLUMNS)
+
+        df = pd.concat(frames, ignore_index=True)
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= df["Datetime"] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= df["Datetime"] <= pd.Timestamp(end)
+        if tickers is not None:
+            mask &= df["Ticker"].isin([t.upper() for t in tickers])
+        df = df[mask]
+        if columns is not None:
+            df = df[[c for c in KEY_COLUMNS + list(columns) if c in df.columns]]
+        return df.sort_values("Datetime", kind="mergesort").reset_index(drop=True)
+
+    def migrate_csv(self, csv_path=LEGACY_CSV_LOG):
+        """One-time import of the legacy CSV log into day partitions."""
+        marker = os.path.join(self.root, MIGRATION_MARKER)
+        if os.path.exists(marker) or not os.path.exists(csv_path):
+            return 0
+        legacy = _typed_frame(pd.read_csv(csv_path).to_dict("records"))
+        legacy = legacy.dropna(subset=["Datetime"])
+        for day, part in legacy.groupby(legacy["Datetime"].dt.strftime("%Y-%m-%d")):
+            _write_part(part.reset_index(drop=True), os.path.join(self.root, day))
+        os.makedirs(self.root, exist_ok=True)
+        with open(marker, "w", encoding="utf-8") as f:
+            f.write(f"{csv_path} migrated {datetime.now().isoformat(timespec='seconds')}, {len(legacy)} rows\n")
+        print(f"📒 Migrated {len(legacy)} predictions from {csv_path} into {self.root}")
+        return len(legacy)
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(root=JOURNAL_DIR):
+    """Returns the shared journal for `root`, migrating the legacy CSV log on first use."""
+    key = os.path.abspath(root)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = PredictionJournal(root)
+            if key == os.path.abspath(JOURNAL_DIR):
+                journal.migrate_csv(LEGACY_CSV_LOG)
+            _journals[key] = journal
+            atexit.register(journal.flush)
+        return journal
+
+
+def load_predictions(path=JOURNAL_DIR, start=None, end=None, tickers=None):
+    """
+    Reads predictions for [start, end] from a journal directory, or from a legacy
+    CSV log when `path` points at a file.
+    """
+    if os.path.isfile(path):
+        df = pd.read_csv(path, parse_dates=["Datetime"])
+        df["Ticker"] = df["Ticker"].str.upper()
+        if start is not None:
+            df = df[df["Datetime"] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df["Datetime"] <= pd.Timestamp(end)]
+        if tickers is not None:
+            df = df[df["Ticker"].isin([t.upper() for t in tickers])]
+        return df.reset_index(drop=True)
+    return get_journal(path).read(start=start, end=end, tickers=tickers)
@@ -0,0 +1,233 @@
+"""
+Priority-based refresh planner for the dividend screen.
+
+The daily FMP quota (and a soft yfinance budget) used to be spent in list order.
+The planner scores every ticker instead:
+
+* staleness  - age of its cached FMP history relative to the cache TTL
+* value      - position size for holdings, continuation/yield rank for candidates
+* ex-div     - how close the next expected ex-dividend date is (an overdue one
+               means the cached history is probably missing a payment)
+
+and fills the day's remaining budgets with the highest scores first. A ticker
+whose FMP history is still fresh only costs yfinance calls. The plan is saved to
+PLAN_FILE so later runs the same day continue it instead of starting over.
+
+    python refresh_planner.py            # print today's plan
+"""
+import json
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+PLAN_FILE = "refresh_plan.json"
+HOLDINGS_FILE = "dividend_stocks.xlsx"
+CANDIDATES_FILE = "scored_candidates.csv"
+YF_DAILY_BUDGET = 1200       # Soft cap; yfinance has no published quota
+YF_CALLS_PER_TICKER = 4      # fast_info, financials, cashflow, get_info
+EX_DIV_WINDOW_DAYS = 10      # Ex-dates closer than this get a proximity boost
+WEIGHTS = {"staleness": 0.45, "value": 0.35, "ex_div": 0.20}
+HOLDING_FLOOR = 0.5          # Any holding is worth at least this much "value"
+FMP_DAILY_LIMIT = 250        # screen_dividends.MAX_FMP_CALLS
+
+
+def next_ex_date(history, lookback=6):
+    """Expected next ex-dividend date from an FMP history (last date + mean recent interval)."""
+    if not history or len(history) < 2:
+        return None
+    dates = sorted(pd.to_datetime([h["date"] for h in history if h.get("date")]), reverse=True)[:lookback + 1]
+    if len(dates) < 2:
+        return None
+    intervals = [(a - b).days for a, b in zip(dates[:-1], dates[1:])]
+    return dates[0] + pd.Timedelta(days=sum(intervals) / len(intervals))
+
+
+def _value_scores(tickers, position_values, candidate_scores):
+    """Holdings scaled by position size (with a floor); candidates by their 0..1 rank score."""
+    biggest = max([v for v in position_values.values() if v > 0], default=0)
+    values = {}
+    for ticker in tickers:
+        if ticker in position_values:
+            size = position_values[ticker] / biggest if biggest else 0.0
+            values[ticker] = HOLDING_FLOOR + (1 - HOLDING_FLOOR) * max(size, 0.0)
+        else:
+            values[ticker] = candidate_scores.get(ticker, 0.0) * HOLDING_FLOOR
+    return values
+
+
+def score_tickers(tickers, fetched_at, ttl_days, position_values=None, candidate_scores=None,
+                  ex_dates=None, now=None):
+    """
+    One row per ticker with its priority components and total score.
+    fetched_at: {ticker: datetime of cached FMP history}; ex_dates: {ticker: expected ex-date}.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    position_values = position_values or {}
+    values = _value_scores(tickers, position_values, candidate_scores or {})
+    ex_dates = ex_dates or {}
+
+    rows = []
+    for ticker in dict.fromkeys(tickers):
+        fetched = fetched_at.get(ticker)
+        age_days = (now - pd.Timestamp(fetched)).total_seconds() / 86400 if fetched is not None else None
+        staleness = 1.0 if age_days is None else min(age_days / ttl_days, 1.0)
+
+        ex_date = ex_dates.get(ticker)
+        ex_div = 0.0
+        if ex_date is not None:
+            days_until = (pd.Timestamp(ex_date) - now).days
+            if days_until < 0:
+                # Expected payment is missing from the cached history
+                ex_div = 1.0 if fetched is None or pd.Timestamp(fetched) < pd.Timestamp(ex_date) else 0.0
+            elif days_until <= EX_DIV_WINDOW_DAYS:
+                ex_div = 1.0 - days_until / (EX_DIV_WINDOW_DAYS + 1)
+
+        score = (WEIGHTS["staleness"] * staleness + WEIGHTS["value"] * values[ticker]
+                 + WEIGHTS["ex_div"] * ex_div)
+        if age_days is not None and age_days < 1 and ex_div < 1.0:
+            score = 0.0  # Refreshed within the last day; nothing new to learn
+        rows.append({
+            "ticker": ticker, "score": round(score, 4), "staleness": round(staleness, 3),
+            "value": round(values[ticker], 3), "ex_div": round(ex_div, 3),
+            "holding": ticker in position_values,
+            "fmp_calls": 1 if age_days is None or age_days >= ttl_days or ex_div >= 1.0 else 0,
+            "yf_calls": YF_CALLS_PER_TICKER,
+        })
+    columns = ["ticker", "score", "staleness", "value", "ex_div", "holding", "fmp_calls", "yf_calls"]
+    return pd.DataFrame(rows, columns=columns).sort_values(
+        ["score", "ticker"], ascending=[False, True], kind="mergesort").reset_index(drop=True)
+
+
+def build_plan(scores, fmp_budget, yf_budget=YF_DAILY_BUDGET):
+    """
+    Greedy fill of both budgets in score order: a ticker is planned if its FMP and
+    yfinance calls still fit, otherwise skipped so cheaper tickers further down can
+    use what is left. Tickers with a zero score are never planned.
+    """
+    plan = []
+    for entry in scores.to_dict(orient="records"):
+        if entry["score"] <= 0:
+            break
+        if entry["fmp_calls"] > fmp_budget or entry["yf_calls"] > yf_budget:
+            continue
+        fmp_budget -= entry["fmp_calls"]
+        yf_budget -= entry["yf_calls"]
+        plan.append(entry)
+    return plan
+
+
+def save_plan(plan, path=PLAN_FILE, day=None):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"date": (day or date.today()).isoformat(), "plan": plan, "done": []}, f, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def load_plan(path=PLAN_FILE, day=None):
+    """Today's saved plan entries not yet marked done, or None if there is no plan for today."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        state = json.load(f)
+    if state.get("date") != (day or date.today()).isoformat():
+        return None
+    done = set(state.get("done", []))
+    return [entry for entry in state["plan"] if entry["ticker"] not in done]
+
+
+def mark_done(tickers, path=PLAN_FILE):
+    """Records refreshed tickers so a rerun today skips them."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r") as f:
+        state = json.load(f)
+    state["done"] = sorted(set(state.get("done", [])) | set(tickers))
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def load_position_values(path=HOLDINGS_FILE):
+    """{ticker: current position value} from the holdings workbook."""
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_excel(path)
+    if "Ticker" not in df.columns or "Current Value $" not in df.columns:
+        return {}
+    df = df.dropna(subset=["Ticker"])
+    values = pd.to_numeric(df["Current Value $"], errors="coerce").fillna(0.0)
+    return dict(zip(df["Ticker"].astype(str).str.upper(), values))
+
+
+def load_holding_tickers(path=HOLDINGS_FILE):
+    """Tickers in the first column of the holdings workbook (as screen_dividends reads them)."""
+    if not os.path.exists(path):
+        return []
+    df = pd.read_excel(path, usecols=[0], skiprows=1, header=None)
+    return df[0].dropna().astype(str).str.upper().tolist()
+
+
+def load_candidate_scores(path=CANDIDATES_FILE):
+    """{ticker: 0..1 percentile rank} by continuation probability, then yield."""
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path)
+    if "Ticker" not in df.columns or df.empty:
+        return {}
+    missing = pd.Series(0.0, index=df.index)
+    prob = pd.to_numeric(df.get("Continuation Prob (%)", missing), errors="coerce").fillna(0.0)
+    yld = pd.to_numeric(df.get("Yield Est (%)", missing), errors="coerce").fillna(0.0)
+    rank = (prob.rank(pct=True) * 0.7 + yld.rank(pct=True) * 0.3)
+    return dict(zip(df["Ticker"].astype(str).str.upper(), rank.round(4)))
+
+
+def score_universe(tickers, cache=None, now=None):
+    """score_tickers() for `tickers` using the FMP cache, holdings workbook and candidate file."""
+    if cache is None:
+        from fmp_cache import get_fmp_cache
+        cache = get_fmp_cache()
+    wanted = sorted({str(t).upper() for t in tickers})
+    fetched_at = cache.fetched_times()
+    ex_dates = {}
+    for ticker in set(wanted) & set(fetched_at):
+        entry = cache.get(ticker)
+        ex_dates[ticker] = next_ex_date(entry.data if entry else None)
+    ttl_days = cache.ttl.days if cache.ttl else 365
+    return score_tickers(wanted, fetched_at, ttl_days, load_position_values(), load_candidate_scores(),
+                         ex_dates, now)
+
+
+def prioritize(tickers, cache=None):
+    """All of `tickers`, highest refresh priority first (for screens that visit every ticker)."""
+    order = {t: i for i, t in enumerate(score_universe(tickers, cache)["ticker"])}
+    return sorted(tickers, key=lambda t: order.get(str(t).upper(), len(order)))
+
+
+def plan_refresh(tickers, fmp_budget, yf_budget=YF_DAILY_BUDGET, cache=None, path=PLAN_FILE, replan=False):
+    """
+    Returns today's plan for `tickers` (list of entry dicts, highest priority first),
+    continuing a saved plan when one exists for today unless replan=True.
+    """
+    wanted = {str(t).upper() for t in tickers}
+    if not replan:
+        saved = load_plan(path)
+        if saved is not None and {entry["ticker"] for entry in saved} <= wanted:
+            return saved
+
+    plan = build_plan(score_universe(wanted, cache), fmp_budget, yf_budget)
+    save_plan(plan, path)
+    print(f"🗺️ Refresh plan: {len(plan)} of {len(wanted)} tickers, "
+          f"{sum(e['fmp_calls'] for e in plan)} FMP calls (budget {fmp_budget})")
+    return plan
+
+
+if __name__ == "__main__":
+    # screen_engine's budget reads the count the screener persists; importing
+    # screen_dividends here would run its model and GUI setup
+    from screen_engine import CallBudget
+
+    universe = set(load_holding_tickers()) | set(load_candidate_scores())
+    today_plan = plan_refresh(universe, CallBudget(FMP_DAILY_LIMIT).remaining, replan=True)
+    print(pd.DataFrame(today_plan).to_string(index=False))
@@ -0,0 +1,250 @@
+"""
+Report writer for generated Excel output.
+
+Generated sheets (the trackers' Results sheet, day.py's trade_log.xlsx, the dividend
+tracker exports) were built cell by cell in fully editable workbooks, with new
+Font/Fill/Alignment objects assigned to every cell and a second pass for borders.
+This module writes them instead:
+
+* with named styles - each look in REPORT_STYLES is registered once per workbook
+  and a cell just references it by name (border and number format included);
+* whole frames at once - write_frame() derives one style per column and streams
+  the rows;
+* in write-only mode for standalone files (ReportWriter), so memory stays flat as
+  the trade history grows. Sheets that live inside an editable workbook (Results)
+  are collected in a ReportSheet and written with write_to().
+
+    write_report("trade_log.xlsx", {"Sheet1": trade_log_df}, column_formats={"Open Price": MONEY})
+"""
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+MONEY = "$#,##0.00"
+PERCENT = "0.0%"
+MAX_COLUMN_WIDTH = 60
+FONT_NAME = "Arial"
+
+_THIN = Side(style="thin")
+BOX_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+# name -> font kwargs, fill colour, horizontal alignment (every style has a thin box border)
+REPORT_STYLES = {
+    # Plain tables (dividend exports, trade log)
+    "report_header": dict(font=dict(size=12, bold=True)),
+    "report_body": dict(font=dict(size=12)),
+    # Trackers' Results dashboard
+    "results_title": dict(font=dict(size=20, bold=True, color="FFFFFF"), fill="1F4E79", align="center"),
+    "results_timestamp": dict(font=dict(size=10, italic=True, color="666666"), align="center"),
+    "results_section_closed": dict(font=dict(size=16, bold=True, color="FFFFFF"), fill="4CAF50", align="center"),
+    "results_section_open": dict(font=dict(size=16, bold=True, color="FFFFFF"), fill="E91E63", align="center"),
+    "results_section_positions": dict(font=dict(size=14, bold=True, color="FFFFFF"), fill="9C27B0", align="center"),
+    "results_header": dict(font=dict(size=12, bold=True, color="FFFFFF"), fill="2196F3", align="center"),
+    "results_subheader": dict(font=dict(size=11, bold=True, color="FFFFFF"), fill="2196F3", align="center"),
+    "results_group_header": dict(font=dict(size=13, bold=True, color="FFFFFF"), fill="607D8B", align="center"),
+    "results_position_header": dict(font=dict(size=11, bold=True, color="FFFFFF"), fill="607D8B", align="center"),
+    "results_label": dict(font=dict(size=11, bold=True)),
+    "results_value": dict(font=dict(size=11)),
+    "results_good": dict(font=dict(size=11), fill="E8F5E8"),
+    "results_bad": dict(font=dict(size=11), fill="FFF2F2"),
+    "results_up": dict(font=dict(size=11, bold=True, color="006400"), fill="E8F5E8"),
+    "results_down": dict(font=dict(size=11, bold=True, color="CC0000"), fill="FFF2F2"),
+    "results_bold_good": dict(font=dict(size=11, bold=True), fill="E8F5E8"),
+    "results_total_label": dict(font=dict(size=12, bold=True)),
+    "results_total_up": dict(font=dict(size=12, bold=True, color="FFFFFF"), fill="4CAF50"),
+    "results_total_down": dict(font=dict(size=12, bold=True, color="FFFFFF"), fill="F44336"),
+    "results_total": dict(font=dict(size=12, bold=True, color="FFFFFF"), fill="FF9800"),
+    "results_note": dict(font=dict(size=11, italic=True)),
+    "results_row_label": dict(font=dict(size=10, bold=True)),
+    "results_row": dict(font=dict(size=10)),
+    "results_row_up": dict(font=dict(size=10, color="006400")),
+    "results_row_down": dict(font=dict(size=10, color="CC0000")),
+    "results_metric_name": dict(font=dict(size=11, bold=True), fill="F8F9FA"),
+    "results_count": dict(font=dict(size=11, bold=True, color="1F4E79"), fill="E3F2FD"),
+}
+
+
+def _named_style(name, spec, number_format=None):
+    style = NamedStyle(name=name)
+    style.font = Font(name=FONT_NAME, **spec.get("font", {}))
+    if spec.get("fill"):
+        style.fill = PatternFill(start_color=spec["fill"], end_color=spec["fill"], fill_type="solid")
+    if spec.get("align"):
+        style.alignment = Alignment(horizontal=spec["align"])
+    style.border = BOX_BORDER
+    style.number_format = number_format or "General"
+    return style
+
+
+def style_name(base, number_format=None):
+    """Name of `base` with a different number format (registered on first use)."""
+    return f"{base} {number_format}" if number_format else base
+
+
+def register_style(wb, name, spec=None):
+    """Adds a named style to a workbook once; `name` may be a style_name() variant of a REPORT_STYLES entry."""
+    if name in wb.named_styles:
+        return name
+    base, _, number_format = name.partition(" ")
+    spec = spec or REPORT_STYLES[base]
+    wb.add_named_style(_named_style(name, spec, number_format or None))
+    return name
+
+
+def signed_style(value, positive, negative, neutral):
+    """Style for a P&L-like value by its sign."""
+    if value > 0:
+        return positive
+    if value < 0:
+        return negative
+    return neutral
+
+
+def column_widths(df, max_width=MAX_COLUMN_WIDTH):
+    """Header/value text width per column, computed on the frame rather than cell by cell."""
+    widths = []
+    for column in df.columns:
+        values = df[column].dropna().astype(str)
+        longest = int(values.str.len().max()) if len(values) else 0
+        widths.append(min(max(longest, len(str(column))) + 2, max_width))
+    return widths
+
+
+def frame_rows(df):
+    """Rows of plain values with NaN/NaT as empty cells."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+class ReportSheet:
+    """Cells of a generated sheet, collected as (value, named style) and written in one pass."""
+
+    def __init__(self):
+        self.cells = {}      # (row, column) -> (value, style name)
+        self.merges = []
+        self.widths = {}
+
+    def put(self, row, column, value, style="report_body", number_format=None):
+        self.cells[(row, column)] = (value, style_name(style, number_format) if style else None)
+
+    def merge(self, ref):
+        self.merges.append(ref)
+
+    def auto_width(self, columns, max_width=25):
+        """Fits columns 1..columns to their longest value (capped), like the old per-cell scan."""
+        longest = {}
+        for (_, column), (value, _) in self.cells.items():
+            if column <= columns and value is not None:
+                longest[column] = max(longest.get(column, 0), len(str(value)))
+        for column in range(1, columns + 1):
+            self.widths[column] = min(max(longest.get(column, 0), 4) + 2, max_width)
+
+    def _rows(self):
+        last_row = max((r for r, _ in self.cells), default=0)
+        last_col = max((c for _, c in self.cells), default=0)
+        for r in range(1, last_row + 1):
+            yield r, [self.cells.get((r, c)) for c in range(1, last_col + 1)]
+
+    def _register(self, wb):
+        for name in {style for _, style in self.cells.values() if style}:
+            register_style(wb, name)
+
+    def write_to(self, ws):
+        """Writes into a sheet of an editable workbook (e.g. Results inside the transactions file)."""
+        self._register(ws.parent)
+        for (r, c), (value, style) in self.cells.items():
+            cell = ws.cell(row=r, column=c, value=value)
+            if style:
+                cell.style = style
+        for ref in self.merges:
+            ws.merge_cells(ref)
+        for column, width in self.widths.items():
+            ws.column_dimensions[get_column_letter(column)].width = width
+
+    def stream_to(self, ws):
+        """Writes into a write-only sheet, row by row."""
+        self._register(ws.parent)
+        for column, width in self.widths.items():
+            ws.column_dimensions[get_column_letter(column)].width = width
+        for _, entries in self._rows():
+            row = []
+            for entry in entries:
+                if entry is None:
+                    row.append(None)
+                    continue
+                cell = WriteOnlyCell(ws, value=entry[0])
+                if entry[1]:
+                    cell.style = entry[1]
+                row.append(cell)
+            ws.append(row)
+        for ref in self.merges:
+            ws.merged_cells.add(ref)
+
+
+class ReportWriter:
+    """Write-only workbook for a generated report file; saved atomically by save() or on leaving a with block."""
+
+    def __init__(self, path):
+        self.path = path
+        self.wb = Workbook(write_only=True)
+
+    def write_frame(self, sheet_name, df, header_style="report_header", body_style="report_body",
+                    column_formats=None, widths=True, freeze_header=True):
+        """Writes a whole DataFrame as one sheet: styled header, one named style per column."""
+        ws = self.wb.create_sheet(title=sheet_name)
+        column_formats = column_formats or {}
+        styles = [register_style(self.wb, style_name(body_style, column_formats.get(c))) for c in df.columns]
+        register_style(self.wb, header_style)
+        if widths:
+            for idx, width in enumerate(column_widths(df), start=1):
+                ws.column_dimensions[get_column_letter(idx)].width = width
+        if freeze_header:
+            ws.freeze_panes = "A2"
+
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(ws, value=str(column))
+            cell.style = header_style
+            header.append(cell)
+        ws.append(header)
+        for values in frame_rows(df):
+            row = []
+            for value, style in zip(values, styles):
+                cell = WriteOnlyCell(ws, value=value)
+                cell.style = style
+                row.append(cell)
+            ws.append(row)
+        return ws
+
+    def write_sheet(self, sheet_name, report):
+        report.stream_to(self.wb.create_sheet(title=sheet_name))
+
+    def save(self):
+        if not self.wb.worksheets:
+            self.wb.create_sheet()
+        tmp = f"{self.path}.tmp"
+        try:
+            self.wb.save(tmp)
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.save()
+
+
+def write_report(path, frames, column_formats=None, **kwargs):
+    """Writes {sheet name: DataFrame} to `path` as a write-only report; returns the path."""
+    with ReportWriter(path) as report:
+        for sheet_name, df in frames.items():
+            report.write_frame(sheet_name, pd.DataFrame(df), column_formats=column_formats, **kwargs)
+    return path
@@ -250,7 +250,11 @@ def fetch_minute_bars_for_range(symbol, start_dt, end_dt, max_retries=3):
             
     return pd.DataFrame()
     
-def fetch_daily_bars_for_range(symbol, years_back=5):
+def fetch_daily_bars_for_range(symbol, years_back=5, start_dt=None, end_dt=None):
+    """
+    Fetches daily bars for a symbol: the last `years_back` years, or only
+    start_dt..end_dt (end defaults to now) when start_dt is given.
+    """
     import pandas as pd
     endpoint = "https://api.schwabapi.com/marketdata/v1/pricehistory"
     access_token = load_schwab_access_token()
@@ -265,6 +269,11 @@ def fetch_daily_bars_for_range(symbol, years_back=5):
         "frequencyType": "daily",
         "frequency": 1
     }
+    if start_dt is not None:
+        end_dt = end_dt or datetime.now()
+        del params["period"]
+        params["startDate"] = int(start_dt.timestamp() * 1000)
+        params["endDate"] = int(end_dt.timestamp() * 1000)
     response = requests.get(endpoint, headers=headers, params=params)
     if response.status_code == 200:
         data = response.json()
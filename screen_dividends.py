@@ -17,6 +17,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import accuracy_score
+from model_registry import get_active_model, register_model
 
 def get_dividend_info_from_yahoo(ticker: str) -> dict:
     """
@@ -118,14 +119,22 @@ REFRESH_META = "screening_meta.json"
 PENDING_TICKERS_FILE = "tickers_pending.json"
 MAX_FMP_CALLS = 250 # FMP free tier limit is really 250 calls per day, but we want to leave some buffer
 DIVIDEND_CACHE_FILE = "fmp_dividend_cache.json"
+SCREEN_WORKERS = 8  # Tickers screened concurrently (provider caps live in screen_engine)
 
 
 MODEL_PATH = "div_continuity_model.joblib"
+CONTINUITY_MODEL_NAME = "div_continuity"
 RETRAIN_INTERVAL_DAYS = 30
 global fmp_calls
 
 # ========== ETRADE API INTEGRATION ==========
 from etrade_auth import get_etrade_session  # Already used in your etrade_quote app
+from fmp_cache import get_fmp_cache
+from refresh_planner import mark_done, plan_refresh, prioritize
+from screen_engine import CallBudget, provider, run_ordered
+from screen_journal import MATCH, REJECTED, ScreenJournal, journal_path, remove_stale_journals
+
+FMP_BUDGET = CallBudget(MAX_FMP_CALLS)  # Shared by all screening threads, persisted per day
 
 def remap_frequency(val):
     freq_map = {
@@ -158,21 +167,25 @@ def incremental_update_candidates(candidate_file="scored_candidates.csv"):
     if "Source" not in df.columns:
         df["Source"] = "FMP"
 
-    # Update all tickers (including manual entries)
-    tickers_to_update = df["Ticker"].tolist()
+    # Spend today's budget on the highest-priority tickers (including manual entries)
+    plan = plan_refresh(df["Ticker"].tolist(), FMP_BUDGET.remaining)
+    tickers_to_update = [entry["ticker"] for entry in plan]
 
     print(f"🔄 {len(tickers_to_update)} tickers to update out of {len(df)} total (including manual entries).")
 
     # Pull new data for those tickers
     if tickers_to_update:
+        refetch = [entry["ticker"] for entry in plan if entry["fmp_calls"]]
+        run_ordered(refetch, lambda symbol: get_fmp_dividends(symbol, refresh=True))
         updated_df = build_feature_dataframe(tickers_to_update)
         if not updated_df.empty:
             scored_df = predict_dividend_continuity(updated_df)
             merge_new_screen_with_existing(candidate_file, scored_df)
+            mark_done(updated_df["Ticker"].tolist())
         else:
             print("⚠️ No new data pulled for updates.")
     else:
-        print("✅ All candidate tickers are up to date (manual entries only).")
+        print("✅ All candidate tickers are up to date.")
 
     # Reload and return updated DataFrame
     return pd.read_csv(candidate_file)
@@ -256,7 +269,7 @@ def get_etrade_dividend_data(tickers):
                                             # ========== FMP API Caching ==========
                                             # This is to avoid hitting the FMP API rate limit too quickly
 
-fmp_calls = 0  # This tracks how many FMP calls we've made today
+fmp_calls = FMP_BUDGET.used  # This tracks how many FMP calls we've made today
 
 def fetch_dividend_data(ticker: str, source_a_func) -> dict:
     data = source_a_func(ticker)
@@ -303,45 +316,50 @@ def fetch_dividend_dates_for_df(df):
     df["Payout Date"] = payouts
     return df
 
-def load_dividend_cache():
-    if os.path.exists(DIVIDEND_CACHE_FILE):
-        with open(DIVIDEND_CACHE_FILE, "r") as f:
-            return json.load(f)
-    return {}
+dividend_cache = get_fmp_cache()  # SQLite-backed; migrates DIVIDEND_CACHE_FILE on first run
 
-def save_dividend_cache(cache):
-    with open(DIVIDEND_CACHE_FILE, "w") as f:
-        json.dump(cache, f)
+class FmpBudgetExhausted(Exception):
+    """Raised by get_fmp_dividends(raise_on_limit=True) once today's FMP quota is used up."""
 
-dividend_cache = load_dividend_cache()
 
-def get_fmp_dividends(symbol):
-    global fmp_calls, dividend_cache
+def get_fmp_dividends(symbol, raise_on_limit=False, refresh=False):
+    """
+    Dividend history for a symbol from the FMP cache, refetched when the entry has
+    expired (or refresh=True). Without budget, or on a failed call, the cached
+    entry is still returned.
+    """
+    global fmp_calls
 
-    if symbol in dividend_cache:
-        return dividend_cache[symbol]
+    cached = dividend_cache.get(symbol)
+    if cached is not None and not cached.expired and not refresh:
+        return cached.data
 
-    if fmp_calls >= MAX_FMP_CALLS:
+    if not FMP_BUDGET.try_acquire():
+        fmp_calls = FMP_BUDGET.used
+        if cached is not None:
+            return cached.data
         print(f"🚫 FMP call limit ({MAX_FMP_CALLS}) reached.")
+        if raise_on_limit:
+            raise FmpBudgetExhausted(symbol)
         return None
+    fmp_calls = FMP_BUDGET.used
 
     url = f"https://financialmodelingprep.com/api/v3/historical-price-full/stock_dividend/{symbol}?apikey={FMP_API_KEY}"
 
     try:
-        response = requests.get(url, timeout=10)
-        fmp_calls += 1
+        with provider("fmp"):
+            response = requests.get(url, timeout=10)
 
         if response.status_code == 200:
             data = response.json().get("historical", [])
-            dividend_cache[symbol] = data
-            save_dividend_cache(dividend_cache)
+            dividend_cache.put(symbol, data)
             return data
         else:
             print(f"{symbol} – FMP call failed: {response.status_code} – {response.text}")
-            return None
+            return cached.data if cached is not None else None
     except Exception as e:
         print(f"{symbol} – FMP call error: {e}")
-        return None
+        return cached.data if cached is not None else None
 
 # ========== Daily Refresh Logic ==========
 def is_today_refresh_needed():
@@ -361,7 +379,98 @@ def mark_refresh_complete():
 
 # ========== FMP API ==========
 
-def run_screen():
+DEFERRED = "deferred"  # screen_ticker result when the FMP budget ran out before the ticker's turn
+
+
+def screen_ticker(symbol):
+    """
+    Screens one ticker against the monthly high-yield criteria. Returns the result
+    row, REJECTED if it does not qualify, DEFERRED if today's FMP budget is used up,
+    or None if a provider call failed (the ticker is retried on the next run).
+    Safe to call from several threads at once.
+    """
+    # === Dividend history check from FMP ===
+    try:
+        fmp_divs = get_fmp_dividends(symbol, raise_on_limit=True)
+    except FmpBudgetExhausted:
+        return DEFERRED
+    if fmp_divs is None:
+        return None
+    if len(fmp_divs) < 3:
+        return REJECTED
+    df_divs = pd.DataFrame(fmp_divs)
+    df_divs["date"] = pd.to_datetime(df_divs["date"])
+    df_divs.sort_values("date", ascending=False, inplace=True)
+    dividend_dates = df_divs["date"].tolist()
+
+    intervals = [(dividend_dates[i] - dividend_dates[i+1]).days for i in range(len(dividend_dates)-1)]
+    avg_interval = sum(intervals) / len(intervals)
+    if avg_interval > 35:
+        return REJECTED
+
+    most_recent_div = df_divs.iloc[0]["dividend"]
+    if most_recent_div == 0:
+        return REJECTED
+
+    stock = yf.Ticker(symbol)
+    try:
+        with provider("yfinance"):
+            price = stock.fast_info.get("lastPrice", None)
+    except Exception as e:
+        print(f"{symbol} – Price fetch error: {e}")
+        return None
+    if price is None:
+        print(f"{symbol} – Price unavailable.")
+        return None
+
+    yield_est = (most_recent_div * 12 / price) * 100
+    print(f"{symbol} – Price: {price:.2f}, Dividend: {most_recent_div}, Yield Est: {yield_est:.2f}%")
+    if yield_est < 15:
+        return REJECTED
+
+    with provider("yfinance"):
+        fin = stock.financials
+        cf = stock.cashflow
+    eps = fin.loc['Net Income', :].iloc[0] / fin.loc['Diluted Average Shares', :].iloc[0]
+    payout = abs(cf.loc['Cash Dividends Paid', :].iloc[0]) / fin.loc['Net Income', :].iloc[0]
+    if eps <= 0 and payout > 1.2:
+        return REJECTED
+
+    try:
+        with provider("yfinance"):
+            info = stock.get_info()
+        beta = info.get("beta", "N/A")
+        d2e = info.get("debtToEquity", "N/A")
+        sector = info.get("sector", "N/A")
+        industry = info.get("industry", "N/A")
+    except:
+        beta = d2e = sector = industry = "N/A"
+
+    div_years = round((dividend_dates[0] - dividend_dates[-1]).days / 365, 1)
+    if len(df_divs) >= 10:
+        start, end = df_divs.iloc[-1]["dividend"], df_divs.iloc[0]["dividend"]
+        try:
+            growth_rate = round(((end / start) ** (1 / div_years) - 1) * 100, 2)
+        except:
+            growth_rate = "N/A"
+    else:
+        growth_rate = "N/A"
+
+    return {
+        "Ticker": symbol,
+        "Yield Est (%)": round(yield_est, 2),
+        "EPS": round(eps, 2),
+        "Payout Ratio": round(payout, 2),
+        "Beta": round(beta, 2) if isinstance(beta, (float, int)) else beta,
+        "Div History (yrs)": div_years,
+        "5Y Growth Rate (%)": growth_rate,
+        "Debt/Equity": round(d2e, 2) if isinstance(d2e, (float, int)) else d2e,
+        "Sector": sector,
+        "Industry": industry
+    }
+
+
+def run_screen(workers=SCREEN_WORKERS):
     import pandas as pd
 
     if os.path.exists(PENDING_TICKERS_FILE):
@@ -379,113 +488,49 @@ def run_screen():
         json.dump(tickers, f)
     print(f"🗂️ Backup created: {backup_path}")
 
-    # === Daily cache file ===
+    # === Checkpoint journal: one appended record per finished ticker ===
     daily_cache_path = f"fmp_daily_results_{today}.csv"
-    if os.path.exists(daily_cache_path):
-        cache_df = pd.read_csv(daily_cache_path)
-        processed = set(cache_df["Ticker"].tolist())
-        filtered_data = cache_df.to_dict(orient="records")
-        print(f"📁 Loaded cache with {len(processed)} entries")
-    else:
-        processed = set()
-        filtered_data = []
-
-    leftover = []
-    total = len(tickers)
-    print(f"🔍 Screening {total} tickers...")
-
-    for i, symbol in enumerate(tickers, start=1):
-        print(f"[{i}/{total}] {symbol} | Matches: {len(filtered_data)} | FMP Calls: {fmp_calls}")
-
-        if symbol in processed:
-            print(f"⏩ Skipping {symbol}, already cached.")
-            continue
-
-        if fmp_calls >= MAX_FMP_CALLS:
-            leftover = tickers[i:]
-            print(f"🚧 FMP rate limit hit at {fmp_calls} calls.")
-            print(f"🟡 Attempting to screen remaining {len(leftover)} tickers using E*TRADE...")
-            break
-
-        try:
-            # === Dividend history check from FMP ===
-            fmp_divs = get_fmp_dividends(symbol)
-            if not fmp_divs or len(fmp_divs) < 3:
-                continue
-            df_divs = pd.DataFrame(fmp_divs)
-            df_divs["date"] = pd.to_datetime(df_divs["date"])
-            df_divs.sort_values("date", ascending=False, inplace=True)
-            dividend_dates = df_divs["date"].tolist()
-
-            intervals = [(dividend_dates[i] - dividend_dates[i+1]).days for i in range(len(dividend_dates)-1)]
-            avg_interval = sum(intervals) / len(intervals)
-            if avg_interval > 35:
-                continue
-
-            most_recent_div = df_divs.iloc[0]["dividend"]
-            if most_recent_div == 0:
-                continue
-
-            stock = yf.Ticker(symbol)
-            try:
-                price = stock.fast_info.get("lastPrice", None)
-            except Exception as e:
-                print(f"{symbol} – Price fetch error: {e}")
-                continue
-            if price is None:
-                print(f"{symbol} – Price unavailable.")
-                continue
-
-            yield_est = (most_recent_div * 12 / price) * 100
-            print(f"{symbol} – Price: {price:.2f}, Dividend: {most_recent_div}, Yield Est: {yield_est:.2f}%")
-            if yield_est < 15:
-                continue
-
-            fin = stock.financials
-            cf = stock.cashflow
-            eps = fin.loc['Net Income', :].iloc[0] / fin.loc['Diluted Average Shares', :].iloc[0]
-            payout = abs(cf.loc['Cash Dividends Paid', :].iloc[0]) / fin.loc['Net Income', :].iloc[0]
-            if eps <= 0 and payout > 1.2:
-                continue
+    journal = ScreenJournal(journal_path(today))
+    remove_stale_journals(journal.path)
+    journal.load()
+    if not journal.records and os.path.exists(daily_cache_path):
+        # Results written by an older run today, before the journal existed
+        for row in pd.read_csv(daily_cache_path).to_dict(orient="records"):
+            journal.append(row["Ticker"], MATCH, row)
+    processed = journal.done()
+    if processed:
+        print(f"📁 Resuming journal with {len(processed)} finished tickers ({len(journal.rows())} matches)")
+
+    # Highest-priority tickers are submitted first, so they get the FMP budget first
+    pending = prioritize([symbol for symbol in tickers if symbol not in processed], dividend_cache)
+    if len(pending) < len(tickers):
+        print(f"⏩ Skipping {len(tickers) - len(pending)} tickers already screened today.")
+    total = len(pending)
+    print(f"🔍 Screening {total} tickers on {workers} threads (FMP budget left: {FMP_BUDGET.remaining})...")
+
+    # Runs on this thread as each ticker finishes, so the journal has a single writer
+    finished, matches = 0, len(journal.rows())
+
+    def record(symbol, row):
+        nonlocal finished, matches
+        finished += 1
+        if isinstance(row, dict):
+            journal.append(symbol, MATCH, row)
+            matches += 1
+        elif row is REJECTED:
+            journal.append(symbol, REJECTED)
+        print(f"[{finished}/{total}] {symbol} | Matches: {matches} | FMP Calls: {FMP_BUDGET.used}")
 
-            try:
-                info = stock.get_info()
-                beta = info.get("beta", "N/A")
-                d2e = info.get("debtToEquity", "N/A")
-                sector = info.get("sector", "N/A")
-                industry = info.get("industry", "N/A")
-            except:
-                beta = d2e = sector = industry = "N/A"
-
-            div_years = round((dividend_dates[0] - dividend_dates[-1]).days / 365, 1)
-            if len(df_divs) >= 10:
-                start, end = df_divs.iloc[-1]["dividend"], df_divs.iloc[0]["dividend"]
-                try:
-                    growth_rate = round(((end / start) ** (1 / div_years) - 1) * 100, 2)
-                except:
-                    growth_rate = "N/A"
-            else:
-                growth_rate = "N/A"
-
-            row = {
-                "Ticker": symbol,
-                "Yield Est (%)": round(yield_est, 2),
-                "EPS": round(eps, 2),
-                "Payout Ratio": round(payout, 2),
-                "Beta": round(beta, 2) if isinstance(beta, (float, int)) else beta,
-                "Div History (yrs)": div_years,
-                "5Y Growth Rate (%)": growth_rate,
-                "Debt/Equity": round(d2e, 2) if isinstance(d2e, (float, int)) else d2e,
-                "Sector": sector,
-                "Industry": industry
-            }
-
-            filtered_data.append(row)
-            pd.DataFrame(filtered_data).to_csv(daily_cache_path, index=False)
-            processed.add(symbol)
+    try:
+        results = run_ordered(pending, screen_ticker, workers, on_result=record)
+    finally:
+        journal.close()
+    leftover = [symbol for symbol, row in zip(pending, results) if row is DEFERRED]
+    if leftover:
+        print(f"🚧 FMP rate limit hit at {FMP_BUDGET.used} calls; {len(leftover)} tickers saved for tomorrow.")
 
-        except Exception as e:
-            print(f"[{symbol}] skipped: {e}")
+    # Compact the journal into the day's results file once, at the end
+    filtered_data = journal.compact(daily_cache_path).to_dict(orient="records")
 
     out_df = pd.DataFrame(filtered_data)
     expected_sort_keys = ["Yield Est (%)", "Payout Ratio", "Div History (yrs)"]
@@ -698,7 +743,7 @@ def launch_dividend_gui(df, source_file=None):
 
 def build_feature_vector(ticker):
     from datetime import datetime
-    global dividend_cache, fmp_calls
+    global fmp_calls
 
     # === Dividend history via FMP (cached) ===
     dividends = get_fmp_dividends(ticker)
@@ -721,7 +766,8 @@ def build_feature_vector(ticker):
 
         # === Price and financial data ===
         stock = yf.Ticker(ticker)
-        price = stock.fast_info.get("lastPrice", None)
+        with provider("yfinance"):
+            price = stock.fast_info.get("lastPrice", None)
         if price is None or price == 0:
             print(f"{ticker} – Price unavailable or invalid.")
             return None
@@ -729,8 +775,9 @@ def build_feature_vector(ticker):
         yield_est = (most_recent_div * estimated_frequency / price) * 100
 
         try:
-            fin = stock.financials
-            cf = stock.cashflow
+            with provider("yfinance"):
+                fin = stock.financials
+                cf = stock.cashflow
             try:
                 eps = fin.loc['Net Income', :].iloc[0] / fin.loc['Diluted Average Shares', :].iloc[0]
                 payout = abs(cf.loc['Cash Dividends Paid', :].iloc[0]) / fin.loc['Net Income', :].iloc[0]
@@ -744,7 +791,8 @@ def build_feature_vector(ticker):
             eps = payout = "N/A"
 
         try:
-            info = stock.get_info()
+            with provider("yfinance"):
+                info = stock.get_info()
             beta = info.get("beta", "N/A")
             d2e = info.get("debtToEquity", "N/A")
             sector = info.get("sector", "N/A")
@@ -789,7 +837,8 @@ def build_feature_vector(ticker):
 
     # === FMP failed, try E*TRADE fallback ===
     print(f"{ticker} – Insufficient FMP dividend data. Attempting E*TRADE fallback...")
-    etrade_data = get_etrade_dividend_data([ticker])
+    with provider("etrade"):
+        etrade_data = get_etrade_dividend_data([ticker])
     if etrade_data:
         row = etrade_data[0]
         row["Source"] = "ETRADE"
@@ -828,19 +877,51 @@ def build_feature_vector(ticker):
         "Source": "ETRADE"
     }])
 
-def build_feature_dataframe(ticker_list):
+def _feature_vector_or_none(symbol):
+    print(f"→ Processing: {symbol}")
+    try:
+        return build_feature_vector(symbol)
+    except Exception as e:
+        print(f"❌ {symbol} – Build error: {e}")
+        return None
+
+
+def _feature_vector_or_deferred(symbol):
+    """Like _feature_vector_or_none, but DEFERRED once today's FMP budget is spent and the cache is stale."""
+    cached = dividend_cache.get(symbol)
+    if FMP_BUDGET.exhausted and (cached is None or cached.expired):
+        return DEFERRED
+    return _feature_vector_or_none(symbol)
+
+
+def build_feature_dataframe_within_budget(ticker_list, workers=SCREEN_WORKERS):
+    """
+    build_feature_dataframe for a whole ticker list, gated on the shared FMP budget.
+    Returns (feature rows, leftover tickers reached after the budget ran out).
+    """
+    ticker_list = list(ticker_list)
+    print(f"🧪 Building feature vectors for {len(ticker_list)} tickers (FMP budget left: {FMP_BUDGET.remaining})...")
+    results = run_ordered(ticker_list, _feature_vector_or_deferred, workers)
+    leftover = [symbol for symbol, df in zip(ticker_list, results) if df is DEFERRED]
+    if leftover:
+        print(f"🚧 FMP rate limit hit at {FMP_BUDGET.used} calls; {len(leftover)} tickers left for tomorrow.")
+    return _feature_frame(ticker_list, [None if df is DEFERRED else df for df in results]), leftover
+
+
+def build_feature_dataframe(ticker_list, workers=SCREEN_WORKERS):
+    """Feature rows for ticker_list, built concurrently and returned in ticker_list order."""
     print("🧪 Building feature vectors...")
+    ticker_list = list(ticker_list)
+    return _feature_frame(ticker_list, run_ordered(ticker_list, _feature_vector_or_none, workers))
+
+
+def _feature_frame(ticker_list, results):
     vectors = []
-    for symbol in ticker_list:
-        print(f"→ Processing: {symbol}")
-        try:
-            df = build_feature_vector(symbol)
-            if df is not None:
-                vectors.append(df)
-            else:
-                print(f"⚠️ Skipped: {symbol}")
-        except Exception as e:
-            print(f"❌ {symbol} – Build error: {e}")
+    for symbol, df in zip(ticker_list, results):
+        if df is not None:
+            vectors.append(df)
+        else:
+            print(f"⚠️ Skipped: {symbol}")
 
     if vectors:
         full_df = pd.concat(vectors, ignore_index=True)
@@ -853,7 +934,6 @@ def build_feature_dataframe(ticker_list):
 def predict_dividend_continuity(df, model_path="div_continuity_model.joblib"):
     import pandas as pd
     from datetime import date
-    from joblib import load
 
     required_cols = [
         "Yield Est (%)", "EPS", "Payout Ratio", "Beta",
@@ -893,7 +973,7 @@ def predict_dividend_continuity(df, model_path="div_continuity_model.joblib"):
             valid_df[col] = pd.to_numeric(valid_df[col], errors="coerce")
         X = valid_df[required_cols].fillna(0.0)
         try:
-            model = load(model_path)
+            model = get_active_model(CONTINUITY_MODEL_NAME, fallback_path=model_path)
             y_pred = model.predict_proba(X)[:, 1]
             valid_df["Continuation Prob (%)"] = (y_pred * 100).round(1)
             valid_df["Last Updated"] = date.today().isoformat()
@@ -932,15 +1012,10 @@ def predict_dividend_continuity(df, model_path="div_continuity_model.joblib"):
     return final_df
 
 def get_continuity_label(ticker, source="FMP"):
-    global dividend_cache
-
     if source == "ETRADE":
         return "N/A"  # No label available from E*TRADE-sourced tickers
 
-    if ticker in dividend_cache:
-        history = dividend_cache[ticker]
-    else:
-        history = get_fmp_dividends(ticker)
+    history = get_fmp_dividends(ticker)
 
     if not history or len(history) < 3:
         return 0
@@ -989,6 +1064,12 @@ def train_continuity_model(df, model_path="div_continuity_model.joblib"):
     # Save calibrated model
     joblib.dump(calibrated, model_path)
     print(f"✅ Calibrated model saved to '{model_path}'")
+    register_model(CONTINUITY_MODEL_NAME, calibrated, metadata={
+        "source": "train_continuity_model",
+        "features": required_cols,
+        "training_rows": len(X_train),
+        "metrics": {"test_accuracy": round(acc, 4)},
+    }, promote=True)
 
     return calibrated
 
@@ -1146,35 +1227,26 @@ if __name__ == "__main__":
     else:
         tos_tickers = list(excel_tickers)
 
-    # Step 2: Process and score as many holdings as possible (except manual)
-    leftover = []
-    processed = []
-    for i, ticker in enumerate(tos_tickers, 1):
-        print(f"[{i}/{len(tos_tickers)}] Processing {ticker}...")
-        try:
-            feature_df = build_feature_dataframe([ticker])
-            # --- ENSURE ALL FIELDS ARE NUMERIC AND FILLED ---
-            required_cols = [
-                "Yield Est (%)", "EPS", "Payout Ratio", "Beta",
-                "Div History (yrs)", "5Y Growth Rate (%)", "Debt/Equity"
-            ]
-            for col in required_cols:
-                if col not in feature_df.columns:
-                    feature_df[col] = 0.0
-                feature_df[col] = pd.to_numeric(feature_df[col], errors="coerce").fillna(0.0)
-            # ------------------------------------------------
-            if not feature_df.empty:
-                scored_df = predict_dividend_continuity(feature_df)
-                merge_new_screen_with_existing(scored_file, scored_df)
-            else:
-                print(f"⚠️ No data for {ticker}, skipping.")
-        except Exception as e:
-            print(f"❌ Error processing {ticker}: {e}")
-        # Check FMP call limit after each ticker
-        if fmp_calls >= MAX_FMP_CALLS:
-            print(f"🚧 FMP rate limit hit at {fmp_calls} calls.")
-            leftover = tos_tickers[i:]  # Remaining tickers to process tomorrow
-            break
+    # Step 2: Process and score as many holdings as today's FMP budget allows (except manual)
+    feature_df, leftover = build_feature_dataframe_within_budget(tos_tickers)
+    try:
+        # --- ENSURE ALL FIELDS ARE NUMERIC AND FILLED ---
+        required_cols = [
+            "Yield Est (%)", "EPS", "Payout Ratio", "Beta",
+            "Div History (yrs)", "5Y Growth Rate (%)", "Debt/Equity"
+        ]
+        for col in required_cols:
+            if col not in feature_df.columns:
+                feature_df[col] = 0.0
+            feature_df[col] = pd.to_numeric(feature_df[col], errors="coerce").fillna(0.0)
+        # ------------------------------------------------
+        if not feature_df.empty:
+            scored_df = predict_dividend_continuity(feature_df)
+            merge_new_screen_with_existing(scored_file, scored_df)
+        else:
+            print("⚠️ No holdings data built, skipping.")
+    except Exception as e:
+        print(f"❌ Error scoring holdings: {e}")
 
     # Step 2.5: Save leftovers for tomorrow
     if leftover:
@@ -1223,64 +1295,53 @@ if __name__ == "__main__":
 
 
     # --- PURGE: Only keep tickers that pay at least 12 times a year (monthly or 12+) ---
+    # Features are built once for the whole list; the purged rows are scored directly
     print("\n🔎 Purging candidate tickers to only those with 12+ payouts/year...")
-    filtered_tickers = []
-    for ticker in candidate_tickers:
+    purge_df, leftover = build_feature_dataframe_within_budget(candidate_tickers)
+    keep = []
+    for _, feature_row in purge_df.iterrows():
+        ticker = feature_row["Ticker"]
+        est_freq = feature_row.get("Est. Frequency", "")
+        # Accept if frequency is numeric and >= 12, or string 'monthly' (case-insensitive)
         try:
-            feature_df = build_feature_dataframe([ticker])
-            if not feature_df.empty:
-                est_freq = feature_df.iloc[0].get("Est. Frequency", "")
-                # Accept if frequency is numeric and >= 12, or string 'monthly' (case-insensitive)
-                try:
-                    freq_num = int(est_freq)
-                except Exception:
-                    freq_num = None
-                if (freq_num is not None and freq_num >= 12) or (str(est_freq).strip().lower() == "monthly"):
-                    filtered_tickers.append(ticker)
-                else:
-                    print(f"⏩ {ticker} purged: Est. Frequency = {est_freq}")
-            else:
-                print(f"⚠️ No data for {ticker}, skipping.")
-        except Exception as e:
-            print(f"❌ Error checking {ticker}: {e}")
-    print(f"✅ {len(filtered_tickers)} tickers remain after purge.")
-    candidate_tickers = filtered_tickers
+            freq_num = int(est_freq)
+        except Exception:
+            freq_num = None
+        if (freq_num is not None and freq_num >= 12) or (str(est_freq).strip().lower() == "monthly"):
+            keep.append(True)
+        else:
+            keep.append(False)
+            print(f"⏩ {ticker} purged: Est. Frequency = {est_freq}")
+    feature_df = purge_df[keep] if keep else purge_df
+    print(f"✅ {len(feature_df)} tickers remain after purge.")
 
-    leftover = []
-    for i, ticker in enumerate(candidate_tickers, 1):
-        print(f"[{i}/{len(candidate_tickers)}] Processing {ticker}...")
-        try:
-            feature_df = build_feature_dataframe([ticker])
-            if not feature_df.empty:
-                scored_df = predict_dividend_continuity(feature_df)
-                # --- FILTER: Only keep rows that meet your criteria ---
-                filtered = scored_df.copy()
-
-                # Ensure Est. Frequency is string for filtering
-                filtered["Est. Frequency"] = filtered["Est. Frequency"].astype(str).str.strip().str.lower()
-
-                filtered = filtered[
-                    (pd.to_numeric(filtered["Yield Est (%)"], errors="coerce").fillna(0) >= 12) &
-                    (pd.to_numeric(filtered["Div History (yrs)"], errors="coerce").fillna(0) >= 1) &
-                    (filtered["EPS"].astype(str).str.upper() != "N/A") &
-                    (pd.to_numeric(filtered["EPS"], errors="coerce").fillna(0) > 0) &
-                    (
-                        (filtered["Est. Frequency"] == "monthly") |
-                        (filtered["Est. Frequency"] == "12")
-                    )
-                ]
-                if not filtered.empty:
-                    merge_new_screen_with_existing("scored_candidates.csv", filtered)
-                else:
-                    print(f"⏩ {ticker} did not meet screening criteria, not added.")
+    try:
+        if not feature_df.empty:
+            scored_df = predict_dividend_continuity(feature_df)
+            # --- FILTER: Only keep rows that meet your criteria ---
+            filtered = scored_df.copy()
+
+            # Ensure Est. Frequency is string for filtering
+            filtered["Est. Frequency"] = filtered["Est. Frequency"].astype(str).str.strip().str.lower()
+
+            filtered = filtered[
+                (pd.to_numeric(filtered["Yield Est (%)"], errors="coerce").fillna(0) >= 12) &
+                (pd.to_numeric(filtered["Div History (yrs)"], errors="coerce").fillna(0) >= 1) &
+                (filtered["EPS"].astype(str).str.upper() != "N/A") &
+                (pd.to_numeric(filtered["EPS"], errors="coerce").fillna(0) > 0) &
+                (
+                    (filtered["Est. Frequency"] == "monthly") |
+                    (filtered["Est. Frequency"] == "12")
+                )
+            ]
+            if not filtered.empty:
+                merge_new_screen_with_existing("scored_candidates.csv", filtered)
             else:
-                print(f"⚠️ No data for {ticker}, skipping.")
-        except Exception as e:
-            print(f"❌ Error processing {ticker}: {e}")
-        if fmp_calls >= MAX_FMP_CALLS:
-            print(f"🚧 FMP rate limit hit at {fmp_calls} calls.")
-            leftover = candidate_tickers[i:]
-            break
+                print("⏩ No candidates met the screening criteria, none added.")
+        else:
+            print("⚠️ No candidate data built, skipping.")
+    except Exception as e:
+        print(f"❌ Error scoring candidates: {e}")
 
     if leftover:
         with open("pending_tickers.json", "w") as f:
@@ -1290,38 +1351,38 @@ if __name__ == "__main__":
         os.remove("pending_tickers.json")
 
     # Show GUI for candidates
-if os.path.exists("scored_candidates.csv"):
-    df = pd.read_csv("scored_candidates.csv")
+    if os.path.exists("scored_candidates.csv"):
+        df = pd.read_csv("scored_candidates.csv")
         # --- FILTER: Only keep monthly payers in the file and GUI ---
-    df["Est. Frequency"] = df["Est. Frequency"].astype(str).str.strip().str.lower()
-    df = df[
-        (df["Est. Frequency"] == "monthly") |
-        (df["Est. Frequency"] == "12")
-    ]
-    # Overwrite file with only monthly payers
-    df.to_csv("scored_candidates.csv", index=False)
-    # --- END FILTER ---
-    # --- NEW FILTER: Only show tickers with Yield Est (%) >= 15% in the GUI ---
-    df["Yield Est (%)"] = pd.to_numeric(df["Yield Est (%)"], errors="coerce")
-    df = df[df["Yield Est (%)"] >= 15]
-    # --- END NEW FILTER ---
-    numeric_fields = [
-        "EPS", "Payout Ratio", "Beta", "Div History (yrs)",
-        "5Y Growth Rate (%)", "Debt/Equity"
-    ]
-    for col in numeric_fields:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
-    if "Est. Frequency" in df.columns:
-        df["Est. Frequency"] = df["Est. Frequency"].apply(remap_frequency)
-    try:
-        splash.destroy()
-    except:
-        pass
-    launch_dividend_gui(df, source_file="scored_candidates.csv")
-else:
-    try:
-        splash.destroy()
-    except:
-        pass
-    print("⚠️ No candidate data found to launch GUI.")
\ No newline at end of file
+        df["Est. Frequency"] = df["Est. Frequency"].astype(str).str.strip().str.lower()
+        df = df[
+            (df["Est. Frequency"] == "monthly") |
+            (df["Est. Frequency"] == "12")
+        ]
+        # Overwrite file with only monthly payers
+        df.to_csv("scored_candidates.csv", index=False)
+        # --- END FILTER ---
+        # --- NEW FILTER: Only show tickers with Yield Est (%) >= 15% in the GUI ---
+        df["Yield Est (%)"] = pd.to_numeric(df["Yield Est (%)"], errors="coerce")
+        df = df[df["Yield Est (%)"] >= 15]
+        # --- END NEW FILTER ---
+        numeric_fields = [
+            "EPS", "Payout Ratio", "Beta", "Div History (yrs)",
+            "5Y Growth Rate (%)", "Debt/Equity"
+        ]
+        for col in numeric_fields:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
+        if "Est. Frequency" in df.columns:
+            df["Est. Frequency"] = df["Est. Frequency"].apply(remap_frequency)
+        try:
+            splash.destroy()
+        except:
+            pass
+        launch_dividend_gui(df, source_file="scored_candidates.csv")
+    else:
+        try:
+            splash.destroy()
+        except:
+            pass
+        print("⚠️ No candidate data found to launch GUI.")
\ No newline at end of file
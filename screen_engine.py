@@ -0,0 +1,151 @@
+"""
+Concurrent screening engine for the dividend screener.
+
+Screening is I/O-bound (FMP, yfinance and E*TRADE round trips), so tickers are
+processed on a thread pool while three shared guards keep the providers happy:
+
+* CallBudget   - thread-safe daily call quota. The count is persisted per day in
+                 BUDGET_FILE, so restarting the screener cannot exceed the FMP quota.
+* provider()   - per-provider concurrency cap plus minimum spacing between calls.
+* run_ordered  - runs a function over the tickers and returns results in input
+                 order, whatever order the workers finish in.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import date
+
+BUDGET_FILE = "fmp_budget.json"
+DEFAULT_WORKERS = 8
+# provider: (max concurrent calls, min seconds between call starts)
+PROVIDER_LIMITS = {
+    "fmp": (4, 0.25),
+    "yfinance": (6, 0.1),
+    "etrade": (2, 0.2),
+}
+
+
+class CallBudget:
+    """A daily call quota shared by every thread; try_acquire() never lets usage pass `limit`."""
+
+    def __init__(self, limit, state_path=BUDGET_FILE):
+        self.limit = limit
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._day = date.today().isoformat()
+        self._used = self._load()
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return 0
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        return int(state.get("used", 0)) if state.get("date") == self._day else 0
+
+    def _save(self):
+        if not self.state_path:
+            return
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"date": self._day, "used": self._used, "limit": self.limit}, f)
+        os.replace(tmp, self.state_path)
+
+    def _roll_day(self):
+        today = date.today().isoformat()
+        if today != self._day:
+            self._day, self._used = today, 0
+
+    def try_acquire(self, n=1):
+        """Reserves n calls; returns False (reserving nothing) if that would exceed the limit."""
+        with self._lock:
+            self._roll_day()
+            if self._used + n > self.limit:
+                return False
+            self._used += n
+            self._save()
+            return True
+
+    @property
+    def used(self):
+        with self._lock:
+            self._roll_day()
+            return self._used
+
+    @property
+    def remaining(self):
+        with self._lock:
+            self._roll_day()
+            return max(self.limit - self._used, 0)
+
+    @property
+    def exhausted(self):
+        return self.remaining == 0
+
+
+class ProviderLimiter:
+    """Caps concurrent calls to one provider and spaces call starts by min_interval seconds."""
+
+    def __init__(self, max_concurrent, min_interval=0.0):
+        self.min_interval = min_interval
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    @contextmanager
+    def slot(self):
+        with self._slots:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def provider(name):
+    """
+    Context manager holding one call slot of a provider:
+
+        with provider("yfinance"):
+            price = yf.Ticker(symbol).fast_info.get("lastPrice")
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = ProviderLimiter(*PROVIDER_LIMITS.get(name, (DEFAULT_WORKERS, 0.0)))
+            _limiters[name] = limiter
+    return limiter.slot()
+
+
+def run_ordered(items, func, workers=DEFAULT_WORKERS, on_result=None):
+    """
+    Calls func(item) for every item on a thread pool and returns the results in
+    the order of `items`. An item whose call raises gets None. on_result(item, result)
+    runs on the calling thread as each item finishes, so it can write files safely.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    if not items:
+        return results
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(items)), 1)) as pool:
+        futures = {pool.submit(func, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"[{items[i]}] skipped: {e}")
+            if on_result:
+                on_result(items[i], results[i])
+    return results
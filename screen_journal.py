@@ -0,0 +1,105 @@
+"""
+Append-only checkpoint journal for the dividend screen.
+
+Each finished ticker is one JSON line ({"ticker", "status", "row"}) appended and
+fsynced as soon as its result is known, so a screen costs one small write per
+ticker instead of rewriting the whole results file every time. After a crash,
+load() returns every committed record; a torn last line (the write in progress
+when the process died) is ignored, and the screen resumes after the last
+committed ticker. compact() writes the matched rows to a CSV once, at the end.
+"""
+import glob
+import json
+import os
+
+import pandas as pd
+
+JOURNAL_DIR = "."
+JOURNAL_PREFIX = "screen_journal_"
+MATCH = "match"
+REJECTED = "rejected"
+
+
+def journal_path(day, journal_dir=JOURNAL_DIR):
+    """Journal file for a screening day (YYYYMMDD)."""
+    return os.path.join(journal_dir, f"{JOURNAL_PREFIX}{day}.jsonl")
+
+
+class ScreenJournal:
+    def __init__(self, path):
+        self.path = path
+        self.records = {}  # ticker -> last committed record, in commit order
+        self._file = None
+
+    def load(self):
+        """Reads committed records from disk and returns them as {ticker: record}."""
+        self.records = {}
+        if not os.path.exists(self.path):
+            return self.records
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        # Everything before the final newline is committed; the remainder is a torn write
+        torn = lines.pop()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"⚠️ Skipping unreadable journal line in {self.path}")
+                continue
+            self.records.pop(record["ticker"], None)
+            self.records[record["ticker"]] = record
+        if torn:
+            print(f"⚠️ Dropped an incomplete last record from {self.path}")
+            self._truncate_torn_tail(len(torn.encode("utf-8")))
+        return self.records
+
+    def _truncate_torn_tail(self, n_bytes):
+        with open(self.path, "rb+") as f:
+            f.seek(-n_bytes, os.SEEK_END)
+            f.truncate()
+
+    def append(self, ticker, status, row=None):
+        """Commits one ticker's result; the record is on disk when this returns."""
+        record = {"ticker": ticker, "status": status, "row": row}
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.records.pop(ticker, None)
+        self.records[ticker] = record
+
+    def done(self):
+        """Tickers with a committed result (matched or rejected)."""
+        return set(self.records)
+
+    def rows(self):
+        """Matched result rows in commit order."""
+        return [r["row"] for r in self.records.values() if r["status"] == MATCH and r["row"]]
+
+    def compact(self, csv_path):
+        """Writes the matched rows to csv_path (atomically) and returns them as a DataFrame."""
+        df = pd.DataFrame(self.rows())
+        tmp = f"{csv_path}.tmp"
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, csv_path)
+        return df
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def remove_stale_journals(keep_path, journal_dir=JOURNAL_DIR):
+    """Deletes journals from previous days; their leftovers live in the pending-tickers file."""
+    for path in glob.glob(os.path.join(journal_dir, f"{JOURNAL_PREFIX}*.jsonl")):
+        if os.path.abspath(path) != os.path.abspath(keep_path):
+            os.remove(path)
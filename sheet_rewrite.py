@@ -0,0 +1,84 @@
+"""
+Bulk row reordering for openpyxl worksheets.
+
+sort_excel_trades used to delete every data row with ws.delete_rows (each call
+shifts all the rows below it, O(n^2) cell moves) and then rewrite values and number
+formats, dropping fonts, fills and borders on the way. Here the rows are read once
+into memory (value + style of every cell, plus the row height), reordered, and
+written back in a single pass:
+
+* styles are copied as-is, so formatting follows its row;
+* formulas are translated to their new row (=F5*G5 moved to row 2 becomes =F2*G2);
+* column widths, the header and everything outside the rewritten rows are untouched.
+
+    sort_rows(ws, key=lambda values: (values[ticker_idx], values[date_idx]))
+"""
+from copy import copy
+
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import get_column_letter
+
+
+class RowSnapshot:
+    __slots__ = ("row", "values", "styles", "height")
+
+    def __init__(self, row, values, styles, height):
+        self.row = row          # Row the snapshot was read from
+        self.values = values
+        self.styles = styles
+        self.height = height
+
+
+def read_rows(ws, min_row=2, max_row=None, max_col=None):
+    """Snapshots of rows min_row..max_row (default: to the last row) across max_col columns."""
+    max_row = max_row or ws.max_row
+    max_col = max_col or ws.max_column
+    if max_row < min_row:
+        return []
+    snapshots = []
+    for r, cells in enumerate(ws.iter_rows(min_row=min_row, max_row=max_row, max_col=max_col), start=min_row):
+        dim = ws.row_dimensions.get(r)
+        snapshots.append(RowSnapshot(r, [c.value for c in cells], [copy(c._style) for c in cells],
+                                     dim.height if dim is not None else None))
+    return snapshots
+
+
+def _moved_value(value, column, from_row, to_row):
+    if from_row == to_row or not (isinstance(value, str) and value.startswith("=")):
+        return value
+    col = get_column_letter(column)
+    return Translator(value, origin=f"{col}{from_row}").translate_formula(f"{col}{to_row}")
+
+
+def write_rows(ws, snapshots, min_row=2, clear_to=None):
+    """
+    Writes snapshots to consecutive rows starting at min_row. Rows after the last
+    snapshot up to clear_to are blanked, so the primitive also serves removals.
+    """
+    r = min_row - 1
+    for r, snap in enumerate(snapshots, start=min_row):
+        for column, (value, style) in enumerate(zip(snap.values, snap.styles), start=1):
+            cell = ws.cell(row=r, column=column)
+            cell.value = _moved_value(value, column, snap.row, r)
+            cell._style = copy(style)
+        if snap.height is not None or r in ws.row_dimensions:
+            ws.row_dimensions[r].height = snap.height
+    width = max((len(s.values) for s in snapshots), default=ws.max_column)
+    for blank in range(r + 1, (clear_to or 0) + 1):
+        for column in range(1, width + 1):
+            cell = ws.cell(row=blank, column=column)
+            cell.value = None
+            cell.style = "Normal"
+
+
+def sort_rows(ws, key, min_row=2, max_row=None, reverse=False):
+    """
+    Stable sort of rows min_row..max_row by key(values); returns True if the order
+    changed (nothing is written otherwise).
+    """
+    snapshots = read_rows(ws, min_row, max_row)
+    ordered = sorted(snapshots, key=lambda snap: key(snap.values), reverse=reverse)
+    if [s.row for s in ordered] == [s.row for s in snapshots]:
+        return False
+    write_rows(ws, ordered, min_row)
+    return True
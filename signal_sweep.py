@@ -0,0 +1,392 @@
+"""
+Walk-forward evaluation and parallel parameter sweeps for the trading signals.
+
+Replays stored minute bars through vectorized versions of day.py's selection and
+alert logic: the CompositeScore ranking (ATR, price change, volume, ADX, PMO, CCI
+ranks, now weighted), the technical alert score (ADX breakout, PMO and DI
+crossovers, CCI extreme reversals), the AI probability gate and the volatility
+thresholds from config.py. At every `step` bars the top_n ranked tickers whose
+alert score, AI probability and volatility pass are entered, and each entry is
+scored with the triple-barrier outcome (target, stop or horizon close).
+
+Bars are aligned into (bars x tickers) matrices once. Every distinct indicator
+setting in the grid and every barrier setting is computed once in the parent and
+handed to the worker processes, which only combine arrays per parameter set.
+Indicators use trailing smoothing only (day.py's centered ADX/DI smoothing would
+look one bar ahead in a replay).
+
+    python signal_sweep.py --grid sweep_grid.json --workers 8 --output sweep_results.csv
+
+sweep_grid.json maps parameter names (see DEFAULT_PARAMS) to lists of values.
+"""
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from scipy.stats import rankdata
+
+from ai_labeling import DEFAULT_HORIZON, barrier_labels
+from config import (AI_PROB_THRESHOLD, AI_STOP_PERCENT, AI_TARGET_PERCENT, VOLATILITY_THRESHOLDS,
+                    get_volatility_category)
+
+DEFAULT_PARAMS = {
+    "adx_period": 14, "pmo_period": 35, "pmo_signal_period": 10, "cci_period": 20,
+    "atr_period": 21, "rank_lookback": 200, "top_n": 5, "step": 15,
+    "entry_score": 1.5, "ai_prob_threshold": AI_PROB_THRESHOLD,
+    "w_atr": 1.0, "w_price_change": 1.0, "w_volume": 1.0, "w_adx": 1.0, "w_pmo": 1.0, "w_cci": 1.0,
+    "target_pct": AI_TARGET_PERCENT, "stop_pct": AI_STOP_PERCENT, "horizon": DEFAULT_HORIZON,
+    **{f"vol_{category}": value for category, value in VOLATILITY_THRESHOLDS.items()},
+}
+DEFAULT_GRID = {
+    "adx_period": [14, 21],
+    "cci_period": [14, 20],
+    "entry_score": [1.0, 1.5, 2.0],
+    "ai_prob_threshold": [0.55, 0.6],
+}
+N_FOLDS = 5
+CCI_CHUNK_ROWS = 10_000
+
+_market = None       # Set in each worker by _init_worker
+_indicators = None
+_outcomes = None
+
+
+def prepare_market(bars):
+    """
+    Aligns minute bars (Datetime, Ticker, OHLCV) into (bars x tickers) matrices on
+    the union of timestamps. Prices are forward-filled inside each ticker's
+    history; `valid` marks cells at or after a ticker's first bar.
+    """
+    bars = bars.copy()
+    bars["Datetime"] = pd.to_datetime(bars["Datetime"], errors="coerce")
+    bars = bars.dropna(subset=["Datetime"]).drop_duplicates(["Ticker", "Datetime"], keep="last")
+    wide = bars.pivot(index="Datetime", columns="Ticker").sort_index()
+    tickers = list(wide["Close"].columns)
+    valid = wide["Close"].ffill().notna().to_numpy()
+    market = {"times": wide.index.to_numpy(), "tickers": tickers, "valid": valid}
+    for name in ("Open", "High", "Low", "Close"):
+        market[name] = wide[name].ffill().bfill().to_numpy(dtype="float64")
+    market["Volume"] = wide["Volume"].fillna(0).to_numpy(dtype="float64")
+    market["category"] = np.array([get_volatility_category(t) for t in tickers])
+    market["ai_prob"] = None
+    return market
+
+
+def ai_probability_matrix(market, bars, model):
+    """
+    Calibrated AI probabilities for every (bar, ticker) on the market grid, using
+    the same technical features and calibration as live scoring. Sets market["ai_prob"].
+    """
+    from ai_features import technical_feature_frame
+    from ai_inference import LIVE_FEATURE_COLUMNS, calibrate_probabilities
+
+    bars = bars.copy()
+    bars["Datetime"] = pd.to_datetime(bars["Datetime"], errors="coerce")
+    features = pd.concat([technical_feature_frame(t, g) for t, g in bars.groupby("Ticker")], ignore_index=True)
+    feature_cols = list(getattr(model, "feature_names_in_", LIVE_FEATURE_COLUMNS))
+    features = features.dropna(subset=feature_cols)
+    raw = model.predict_proba(features[feature_cols])[:, 1]
+    features["ai_prob"] = calibrate_probabilities(raw, (features["high"] - features["low"]) / features["close"])
+    wide = features.pivot_table(index="datetime", columns="ticker", values="ai_prob", aggfunc="last")
+    wide = wide.reindex(index=market["times"], columns=market["tickers"])
+    market["ai_prob"] = wide.to_numpy(dtype="float64")
+    return market["ai_prob"]
+
+
+def _ewm(x, alpha):
+    """Column-wise EWM with adjust=False (y0 = x0), as pandas .ewm(alpha=..., adjust=False)."""
+    zi = (1 - alpha) * x[:1]
+    return lfilter([alpha], [1.0, -(1 - alpha)], x, axis=0, zi=zi)[0]
+
+
+def _rolling_mean(x, window):
+    csum = np.cumsum(np.vstack([np.zeros((1, x.shape[1])), x]), axis=0)
+    out = np.full_like(x, np.nan)
+    out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def _shift(x, n=1):
+    out = np.empty_like(x)
+    out[:n] = x[:1]
+    out[n:] = x[:-n]
+    return out
+
+
+def adx_indicator(market, period):
+    """Wilder-smoothed ADX, +DI and -DI (day.py calculate_adx without centered smoothing)."""
+    high, low, close = market["High"], market["Low"], market["Close"]
+    up, down = high - _shift(high), _shift(low) - low
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    prev_close = _shift(close)
+    tr = np.maximum.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    alpha = 1.0 / period
+    tr_s = _ewm(tr, alpha)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        plus_di = np.where(tr_s > 0, 100 * _ewm(plus_dm, alpha) / tr_s, 0.0)
+        minus_di = np.where(tr_s > 0, 100 * _ewm(minus_dm, alpha) / tr_s, 0.0)
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum > 0, 100 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+    adx = _ewm(dx, alpha)
+    adx[:2 * period] = np.nan
+    return {"ADX": adx, "+DI": plus_di, "-DI": minus_di}
+
+
+def pmo_indicator(market, period, signal_period):
+    """day.py calculate_pmo: double-smoothed percent rate of change and its signal line."""
+    close = market["Close"]
+    roc = np.zeros_like(close)
+    roc[1:] = (close[1:] / close[:-1] - 1) * 100
+    roc[0] = roc[1] if len(roc) > 1 else 0.0  # pandas starts the EWM at the first valid change
+    alpha = 2.0 / (period + 1)
+    pmo = _ewm(_ewm(roc, alpha), alpha)
+    return {"PMO": pmo, "PMO_signal": _ewm(pmo, 2.0 / (signal_period + 1))}
+
+
+def cci_indicator(market, period):
+    """day.py calculate_cci: (typical price - SMA) / (0.015 * mean absolute deviation)."""
+    tp = (market["High"] + market["Low"] + market["Close"]) / 3
+    cci = np.full_like(tp, np.nan)
+    for start in range(0, len(tp) - period + 1, CCI_CHUNK_ROWS):
+        block = tp[start:start + CCI_CHUNK_ROWS + period - 1]
+        windows = sliding_window_view(block, period, axis=0)  # (rows, tickers, period)
+        mean = windows.mean(axis=2)
+        mad = np.abs(windows - mean[..., np.newaxis]).mean(axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cci[start + period - 1:start + period - 1 + len(mean)] = (block[period - 1:] - mean) / (0.015 * mad)
+    return {"CCI": cci}
+
+
+def ranking_inputs(market, atr_period, lookback):
+    """day.py's selection inputs: mean true range, price change and mean volume over the lookback."""
+    close = market["Close"]
+    prev_close = _shift(close)
+    tr = np.maximum.reduce([market["High"] - market["Low"], np.abs(market["High"] - prev_close),
+                            np.abs(market["Low"] - prev_close)])
+    change = np.full_like(close, np.nan)
+    change[lookback - 1:] = close[lookback - 1:] - close[:len(close) - lookback + 1]
+    return {"ATR": _rolling_mean(tr, atr_period), "PriceChange": change,
+            "Volume": _rolling_mean(market["Volume"], lookback)}
+
+
+def barrier_returns(market, target_pct, stop_pct, horizon):
+    """Per-cell trade return: +target, -stop, or the horizon close if neither barrier is hit."""
+    close = market["Close"]
+    returns = np.full_like(close, np.nan)
+    for col in range(close.shape[1]):
+        labels = barrier_labels(close[:, col], target_pct, stop_pct, horizon)
+        exit_idx = np.minimum(np.arange(len(close)) + horizon, len(close) - 1)
+        fallback = close[exit_idx, col] / close[:, col] - 1
+        returns[:, col] = np.where(labels == 1, target_pct, np.where(labels == 0, -stop_pct, fallback))
+    returns[-1] = np.nan  # Nothing left to trade into
+    return returns
+
+
+def _indicator_keys(params):
+    p = {**DEFAULT_PARAMS, **params}
+    return {
+        "adx": ("adx", p["adx_period"]),
+        "pmo": ("pmo", p["pmo_period"], p["pmo_signal_period"]),
+        "cci": ("cci", p["cci_period"]),
+        "rank": ("rank", p["atr_period"], p["rank_lookback"]),
+    }
+
+
+def _outcome_key(params):
+    p = {**DEFAULT_PARAMS, **params}
+    return (p["target_pct"], p["stop_pct"], p["horizon"])
+
+
+def precompute(market, param_sets):
+    """Computes every distinct indicator and barrier setting used by the parameter sets once."""
+    builders = {
+        "adx": lambda key: adx_indicator(market, key[1]),
+        "pmo": lambda key: pmo_indicator(market, key[1], key[2]),
+        "cci": lambda key: cci_indicator(market, key[1]),
+        "rank": lambda key: ranking_inputs(market, key[1], key[2]),
+    }
+    indicators, outcomes = {}, {}
+    for params in param_sets:
+        for key in _indicator_keys(params).values():
+            if key not in indicators:
+                indicators[key] = builders[key[0]](key)
+        okey = _outcome_key(params)
+        if okey not in outcomes:
+            outcomes[okey] = barrier_returns(market, *okey)
+    return indicators, outcomes
+
+
+def _desc_rank_score(values):
+    """day.py's N + 1 - rank(descending, method='min') per row; NaN stays NaN."""
+    n = values.shape[1]
+    ranks = rankdata(np.where(np.isnan(values), np.nan, -values), axis=1, method="min", nan_policy="omit")
+    return n + 1 - ranks
+
+
+def _crossed_up(prev_a, a, prev_b, b):
+    return (prev_a < prev_b) & (a > b)
+
+
+def alert_score(adx, pmo, cci, rows):
+    """check_trade_alerts' technical score at each replay row from the previous and current bar."""
+    prev = np.maximum(rows - 1, 0)
+    ADX, pADX = adx["ADX"][rows], adx["ADX"][prev]
+    pdi, ppdi = adx["+DI"][rows], adx["+DI"][prev]
+    mdi, pmdi = adx["-DI"][rows], adx["-DI"][prev]
+    PMO, pPMO = pmo["PMO"][rows], pmo["PMO"][prev]
+    sig, psig = pmo["PMO_signal"][rows], pmo["PMO_signal"][prev]
+    CCI, pCCI = cci["CCI"][rows], cci["CCI"][prev]
+    with np.errstate(invalid="ignore"):
+        score = 2.0 * ((pADX < 25) & (ADX >= 25) & (pdi > mdi))
+        score += 1.5 * (_crossed_up(pPMO, PMO, psig, sig) & (PMO > -2.0))
+        score -= 1.5 * _crossed_up(psig, sig, pPMO, PMO)
+        score += 1.0 * (_crossed_up(ppdi, pdi, pmdi, mdi) & (ADX > 20))
+        score -= 1.0 * (_crossed_up(pmdi, mdi, ppdi, pdi) & (ADX > 20))
+        recovery = (pCCI < -200) & (CCI > -150)
+        score += 1.0 * recovery
+        score -= 1.0 * (~recovery & (pCCI > 200) & (CCI < 150))
+    return score
+
+
+def evaluate_params(params, market=None, indicators=None, outcomes=None, n_folds=N_FOLDS):
+    """
+    Replays one parameter set. Returns a dict with the parameters, overall trade
+    statistics and per-fold total returns (fold_0 ... fold_{n-1}) over equal time blocks.
+    """
+    market = market if market is not None else _market
+    indicators = indicators if indicators is not None else _indicators
+    outcomes = outcomes if outcomes is not None else _outcomes
+    p = {**DEFAULT_PARAMS, **params}
+    keys = _indicator_keys(p)
+    adx, pmo, cci, rank = (indicators[keys[name]] for name in ("adx", "pmo", "cci", "rank"))
+
+    # Rank and score only the replay rows (every `step` bars)
+    rows = np.arange(p["rank_lookback"], len(market["times"]), p["step"])
+    composite = (p["w_atr"] * np.nan_to_num(_desc_rank_score(rank["ATR"][rows]))
+                 + p["w_price_change"] * np.nan_to_num(_desc_rank_score(rank["PriceChange"][rows]))
+                 + p["w_volume"] * np.nan_to_num(_desc_rank_score(rank["Volume"][rows]))
+                 + p["w_adx"] * np.nan_to_num(_desc_rank_score(adx["ADX"][rows]))
+                 + p["w_pmo"] * np.nan_to_num(_desc_rank_score(pmo["PMO"][rows]))
+                 + p["w_cci"] * np.nan_to_num(_desc_rank_score(np.abs(cci["CCI"][rows]))))
+    eligible = market["valid"][rows] & ~np.isnan(rank["PriceChange"][rows])
+    composite = np.where(eligible, composite, -np.inf)
+
+    top_n = min(p["top_n"], composite.shape[1])
+    top = np.argpartition(-composite, top_n - 1, axis=1)[:, :top_n]
+    selected = np.zeros_like(composite, dtype=bool)
+    np.put_along_axis(selected, top, True, axis=1)
+    selected &= np.isfinite(composite)
+
+    thresholds = np.array([p[f"vol_{c}"] for c in market["category"]])
+    volatility = (market["High"][rows] - market["Low"][rows]) / market["Close"][rows]
+    entries = selected & (alert_score(adx, pmo, cci, rows) >= p["entry_score"]) & (volatility >= thresholds)
+    if market.get("ai_prob") is not None:
+        entries &= market["ai_prob"][rows] >= p["ai_prob_threshold"]
+    returns = outcomes[_outcome_key(p)][rows]
+    entries &= ~np.isnan(returns)
+
+    trade_returns = returns[entries]
+    per_row = np.where(entries, returns, 0.0).sum(axis=1)
+    fold_of_row = np.minimum((rows * n_folds) // len(market["times"]), n_folds - 1)
+    fold_totals = np.bincount(fold_of_row, weights=per_row, minlength=n_folds)
+
+    result = dict(params)
+    result.update({
+        "trades": int(entries.sum()),
+        "win_rate": float((trade_returns > 0).mean()) if len(trade_returns) else np.nan,
+        "avg_return": float(trade_returns.mean()) if len(trade_returns) else np.nan,
+        "total_return": float(trade_returns.sum()),
+        "fold_mean": float(fold_totals.mean()),
+        "fold_std": float(fold_totals.std()),
+        "positive_folds": int((fold_totals > 0).sum()),
+    })
+    result.update({f"fold_{i}": float(v) for i, v in enumerate(fold_totals)})
+    return result
+
+
+def _init_worker(market, indicators, outcomes):
+    global _market, _indicators, _outcomes
+    _market, _indicators, _outcomes = market, indicators, outcomes
+
+
+def expand_grid(grid):
+    """{name: [values]} -> list of parameter dicts (the cartesian product)."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def run_sweep(bars, grid=None, workers=None, model=None, n_folds=N_FOLDS):
+    """
+    Evaluates every parameter set in `grid` over the bars in parallel processes.
+    model: optional AI model; without it the AI probability gate is skipped.
+    Returns the results ranked by mean fold return, then by positive folds.
+    """
+    param_sets = expand_grid(grid or DEFAULT_GRID)
+    market = prepare_market(bars)
+    if model is not None:
+        ai_probability_matrix(market, bars, model)
+    indicators, outcomes = precompute(market, param_sets)
+    workers = workers or max((os.cpu_count() or 2) - 1, 1)
+    print(f"🧪 {len(param_sets)} parameter sets, {len(indicators)} indicator arrays, "
+          f"{len(market['times'])} bars x {len(market['tickers'])} tickers on {workers} processes")
+
+    if workers == 1:
+        results = [evaluate_params(p, market, indicators, outcomes, n_folds) for p in param_sets]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(market, indicators, outcomes)) as pool:
+            results = list(pool.map(evaluate_params, param_sets, itertools.repeat(None),
+                                    itertools.repeat(None), itertools.repeat(None),
+                                    itertools.repeat(n_folds), chunksize=max(len(param_sets) // (workers * 4), 1)))
+    table = pd.DataFrame(results)
+    return table.sort_values(["fold_mean", "positive_folds"], ascending=False).reset_index(drop=True)
+
+
+def walk_forward_summary(results, param_names, n_folds=N_FOLDS):
+    """
+    Out-of-sample check: for each fold k >= 1, picks the parameter set with the best
+    fold k-1 return and reports its return on fold k.
+    """
+    rows = []
+    for k in range(1, n_folds):
+        best = results.loc[results[f"fold_{k - 1}"].idxmax()]
+        rows.append({"fold": k, **{n: best[n] for n in param_names},
+                     "in_sample": best[f"fold_{k - 1}"], "out_of_sample": best[f"fold_{k}"]})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward parameter sweep for the trading signals")
+    parser.add_argument("--bars", default="historical_data.csv", help="Minute-bar CSV (Datetime, Ticker, OHLCV)")
+    parser.add_argument("--grid", help="JSON file mapping parameter names to value lists")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: cores - 1)")
+    parser.add_argument("--output", default="sweep_results.csv", help="CSV for the ranked results")
+    parser.add_argument("--no-ai", action="store_true", help="Skip the AI probability gate")
+    args = parser.parse_args()
+
+    sweep_grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            sweep_grid = json.load(f)
+    unknown = set(sweep_grid) - set(DEFAULT_PARAMS)
+    if unknown:
+        parser.error(f"Unknown parameters in grid: {sorted(unknown)}")
+
+    bars_df = pd.read_csv(args.bars, usecols=["Datetime", "Ticker", "Open", "High", "Low", "Close", "Volume"])
+    ai_model = None
+    if not args.no_ai:
+        from model_registry import get_active_model
+        ai_model = get_active_model("ai_model", fallback_path="ai_model.pkl")
+    ranked = run_sweep(bars_df, sweep_grid, workers=args.workers, model=ai_model)
+    ranked.to_csv(args.output, index=False)
+    print(ranked.head(20).to_string(index=False))
+    print("\n🚶 Walk-forward (best of previous fold):")
+    print(walk_forward_summary(ranked, list(sweep_grid)).to_string(index=False))
+    print(f"💾 Saved {len(ranked)} results to {args.output}")
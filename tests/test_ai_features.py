@@ -0,0 +1,108 @@
+# test_ai_features.py
+# Parity tests: vectorized feature builder vs. ai_module's row-by-row implementation
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ai_features import build_training_features
+from ai_module import extract_features_from_historical
+
+
+def make_minute_bars(tickers=("AAPL", "AMD"), n=150, seed=7):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker in tickers:
+        times = pd.date_range("2025-07-14 09:30", periods=n, freq="1min")
+        close = 100 + rng.normal(0, 0.2, n).cumsum()
+        frames.append(pd.DataFrame({
+            "Datetime": times.strftime("%Y-%m-%d %H:%M:%S"),
+            "Ticker": ticker,
+            "Open": close + rng.normal(0, 0.05, n),
+            "High": close + 0.1,
+            "Low": close - 0.1,
+            "Close": close,
+            "Volume": rng.integers(1000, 5000, n),
+        }))
+    # Shuffle so the builder has to sort
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed)
+
+
+def make_events(tickers=("AAPL", "AMD"), seed=11):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-07-14 08:00")
+    news_rows, whale_rows, congress_rows, inst_rows = [], [], [], []
+    for ticker in tickers:
+        for minute in sorted(rng.integers(0, 240, 25)):
+            news_rows.append({"Ticker": ticker, "Datetime": start + pd.Timedelta(minutes=int(minute)),
+                              "Sentiment": float(rng.normal()), "Headline": "h"})
+        for minute in sorted(rng.integers(0, 240, 30)):
+            whale_rows.append({"Ticker": ticker, "Datetime": start + pd.Timedelta(minutes=int(minute)),
+                               "Size": float(rng.integers(100, 10000)),
+                               "Direction": rng.choice(["buy", "sell"]), "Price": None})
+        for day in sorted(rng.integers(0, 60, 6)):
+            congress_rows.append({"Ticker": ticker, "TransactionDate": start - pd.Timedelta(days=int(day)),
+                                  "Transaction": rng.choice(["Purchase", "Sale"])})
+            inst_rows.append({"Ticker": ticker, "Date": start - pd.Timedelta(days=int(day)),
+                              "Transaction": rng.choice(["Buy", "Sell"])})
+    congress_df = pd.DataFrame(congress_rows).sort_values("TransactionDate", kind="mergesort")
+    inst_df = pd.DataFrame(inst_rows).sort_values("Date", kind="mergesort")
+    return pd.DataFrame(news_rows), pd.DataFrame(whale_rows), congress_df, inst_df
+
+
+def assert_frames_match(expected, actual):
+    assert list(expected.columns) == list(actual.columns)
+    assert expected.index.equals(actual.index)
+    for col in expected.columns:
+        exp, act = expected[col], actual[col]
+        if pd.api.types.is_numeric_dtype(exp):
+            assert np.allclose(exp.astype(float), act.astype(float), equal_nan=True), col
+        else:
+            assert (exp.astype(str) == act.astype(str)).all(), col
+
+
+def test_technical_features_match_reference():
+    bars = make_minute_bars()
+    assert_frames_match(extract_features_from_historical(bars.copy()), build_training_features(bars.copy()))
+
+
+def test_enrichment_features_match_reference():
+    bars = make_minute_bars()
+    news_df, whale_df, congress_df, inst_df = make_events()
+    expected = extract_features_from_historical(bars.copy(), news_df, whale_df, congress_df, inst_df)
+    actual = build_training_features(bars.copy(), news_df, whale_df, congress_df, inst_df)
+    assert_frames_match(expected, actual)
+
+
+def test_ticker_without_events_gets_zero_counts():
+    bars = make_minute_bars(tickers=("AAPL", "MSFT"))
+    news_df, whale_df, congress_df, inst_df = make_events(tickers=("AAPL",))
+    actual = build_training_features(bars, news_df, whale_df, congress_df, inst_df)
+    msft = actual.loc["MSFT"]
+    assert (msft["news_count"] == 0).all()
+    assert (msft["whale_volume"] == 0).all()
+    assert (msft["congress_last_type"] == "").all()
+
+
+def test_last_type_follows_event_time_not_file_order():
+    bars = make_minute_bars(tickers=("AAPL",))
+    start = pd.Timestamp("2025-07-14 08:00")
+    # Newest transaction listed first, as in an unsorted export
+    congress_df = pd.DataFrame([
+        {"Ticker": "AAPL", "TransactionDate": start - pd.Timedelta(days=1), "Transaction": "Purchase"},
+        {"Ticker": "AAPL", "TransactionDate": start - pd.Timedelta(days=10), "Transaction": "Sale"},
+    ])
+    inst_df = pd.DataFrame([
+        {"Ticker": "AAPL", "Date": start - pd.Timedelta(days=2), "Transaction": "Buy"},
+        {"Ticker": "AAPL", "Date": start - pd.Timedelta(days=5), "Transaction": "Sell"},
+    ])
+    actual = build_training_features(bars.copy(), None, None, congress_df, inst_df)
+    assert (actual["congress_last_type"] == "Purchase").all()
+    assert (actual["inst_last_type"] == "Buy").all()
+
+    # The row-by-row reference took the last row in file order
+    expected = extract_features_from_historical(bars.copy(), None, None, congress_df, inst_df)
+    assert (expected["congress_last_type"] == "Sale").all()
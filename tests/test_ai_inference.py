@@ -0,0 +1,60 @@
+# test_ai_inference.py
+# Batch live feature matrix vs. per-ticker indicator computation
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ai_features import add_technical_indicators
+from ai_inference import LIVE_FEATURE_COLUMNS, build_live_feature_matrix, score_candidates
+
+
+def make_bars(seed=5):
+    rng = np.random.default_rng(seed)
+    frames = []
+    # Different lengths and end times per ticker
+    for ticker, n, end in [("TQQQ", 900, "2025-08-22 15:59"), ("AGQ", 120, "2025-08-22 15:30"),
+                           ("SSO", 3000, "2025-08-22 15:59"), ("THIN", 10, "2025-08-22 15:59")]:
+        close = 40 + rng.normal(0, 0.1, n).cumsum()
+        frames.append(pd.DataFrame({
+            "Datetime": pd.date_range(end=end, periods=n, freq="1min"),
+            "Ticker": ticker, "Open": close, "High": close + 0.05, "Low": close - 0.05,
+            "Close": close, "Volume": rng.integers(100, 1000, n),
+        }))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed)
+
+
+def expected_latest(bars, ticker):
+    tdf = bars[bars["Ticker"] == ticker].sort_values("Datetime")
+    tdf = tdf[tdf["Datetime"] > tdf["Datetime"].max() - pd.Timedelta(days=2)].copy()
+    tdf = add_technical_indicators(tdf)
+    latest = tdf.iloc[-1]
+    row = {c: latest[c] for c in LIVE_FEATURE_COLUMNS[5:-1]}
+    row.update(open=latest["Open"], high=latest["High"], low=latest["Low"],
+               close=latest["Close"], volume=latest["Volume"], prev_close=tdf["Close"].iloc[-2])
+    return row
+
+
+def test_feature_matrix_matches_per_ticker_indicators():
+    bars = make_bars()
+    matrix = build_live_feature_matrix(bars, ["SSO", "TQQQ", "AGQ", "THIN", "MISSING"])
+    assert matrix["ticker"].tolist() == ["SSO", "TQQQ", "AGQ"]  # THIN has too few bars
+    for _, row in matrix.iterrows():
+        expected = expected_latest(bars, row["ticker"])
+        for col in LIVE_FEATURE_COLUMNS:
+            assert np.isclose(row[col], expected[col], equal_nan=True), (row["ticker"], col)
+
+
+def test_score_candidates_runs_one_batch():
+    bars = make_bars()
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(50, len(LIVE_FEATURE_COLUMNS))), columns=LIVE_FEATURE_COLUMNS)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, rng.integers(0, 2, 50))
+    scored = score_candidates(["TQQQ", "AGQ", "SSO"], bars=bars, model=model)
+    assert set(scored["ticker"]) == {"TQQQ", "AGQ", "SSO"}
+    assert scored["probability"].between(0.25, 0.75).all()
+    assert scored["probability"].is_monotonic_decreasing
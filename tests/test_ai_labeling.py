@@ -0,0 +1,46 @@
+# test_ai_labeling.py
+# Parity tests: vectorized barrier labeling vs. ai_module.label_barrier_outcomes
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ai_labeling import barrier_labels, label_outcomes, label_outcome_grid
+from ai_module import label_barrier_outcomes
+
+
+def make_feature_rows(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker in ("TQQQ", "SOXL"):
+        frames.append(pd.DataFrame({
+            "ticker": ticker,
+            "datetime": pd.date_range("2025-07-14 09:30", periods=n, freq="1min"),
+            "close": 50 * np.exp(rng.normal(0, 0.004, n).cumsum()),
+        }))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed)
+
+
+def test_labels_match_reference():
+    rows = make_feature_rows()
+    for target, stop, horizon in [(0.02, 0.01, 30), (0.005, 0.005, 10), (0.01, 0.02, 60)]:
+        expected = label_barrier_outcomes(rows.copy(), target, stop, horizon)
+        actual = label_outcomes(rows.copy(), target, stop, horizon)
+        assert expected["label"].tolist() == actual["label"].tolist()
+        assert expected.index.tolist() == actual.index.tolist()
+
+
+def test_target_wins_when_both_barriers_hit_on_same_bar():
+    # A negative stop puts the stop level above entry, so 103 crosses both barriers
+    labels = barrier_labels([100.0, 103.0], target_pct=0.02, stop_pct=-0.05, horizon=5)
+    assert labels[0] == 1.0
+    assert np.isnan(labels[1])
+
+
+def test_grid_has_one_column_per_setting():
+    grid = label_outcome_grid(make_feature_rows(n=50), [0.01, 0.02], [0.01], [10, 20])
+    label_cols = [c for c in grid.columns if c.startswith("label_")]
+    assert len(label_cols) == 4
@@ -0,0 +1,65 @@
+# test_ai_models.py
+# Model families and the held-out benchmark in ai_models
+
+import os
+import sys
+from unittest import mock
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import ai_module
+from ai_models import MODEL_FAMILIES, benchmark_models, expected_calibration_error
+
+
+def make_outcomes(n=400, seed=2):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    return pd.DataFrame({
+        "Ticker": "SSO", "Datetime": pd.date_range("2025-07-01", periods=n, freq="5min"),
+        "Predicted_Prob": 0.5, "Outcome": np.nan,
+        "rsi_14": X[:, 0], "macd": X[:, 1], "returns": X[:, 2], "volume": X[:, 3],
+        "Open Datetime": pd.date_range("2025-07-01", periods=n, freq="5min"),
+        "Profit/Loss": X[:, 0], "label": (X[:, 0] + 0.3 * rng.normal(size=n) > 0).astype(int),
+    })
+
+
+def test_benchmark_reports_every_family_on_the_newest_rows():
+    results = benchmark_models(make_outcomes())
+    assert set(results["model"]) == set(MODEL_FAMILIES)
+    assert results.attrs["test_rows"] == 100
+    assert (results["accuracy"] > 0.7).all()
+    assert results["latency_batch_ms"].is_monotonic_increasing
+    sizes = results.set_index("model")["size_kb"]
+    assert sizes["hist_gb"] < sizes["random_forest"]
+
+
+def test_expected_calibration_error():
+    assert expected_calibration_error([1, 0, 1, 0], [0.5, 0.5, 0.5, 0.5]) == 0.0
+    assert np.isclose(expected_calibration_error([0, 0], [0.9, 0.9]), 0.9)
+
+
+def test_retrain_from_feedback_works_with_every_family(tmp_path, monkeypatch):
+    outcomes = make_outcomes()
+    trade_log = str(tmp_path / "trade_log.xlsx")
+    outcomes[["Ticker", "Open Datetime", "Profit/Loss"]].assign(Strategy="ORB").to_excel(trade_log, index=False)
+    registered = []
+    monkeypatch.setattr(ai_module, "build_labeled_outcomes", lambda *a, **k: outcomes.copy())
+    monkeypatch.setattr(ai_module, "register_model", lambda name, model, metadata: registered.append(model) or 1)
+    monkeypatch.setattr(ai_module, "plot_accuracy_over_time", lambda *a, **k: None)
+    monkeypatch.setattr(ai_module, "plot_cumulative_pl", lambda *a, **k: None)
+    monkeypatch.setattr(ai_module.plt, "show", lambda *a, **k: None)
+    monkeypatch.setattr(ai_module, "tk", mock.MagicMock())
+    monkeypatch.setattr(ai_module, "ttk", mock.MagicMock())
+
+    for family in MODEL_FAMILIES:
+        ai_module.retrain_model_from_feedback(prediction_log_path=str(tmp_path), trade_log_path=trade_log,
+                                              model_output_path=str(tmp_path / f"{family}.pkl"), model_family=family)
+        ai_module.plt.close("all")
+
+    assert len(registered) == len(MODEL_FAMILIES)
+    for model in registered:
+        assert model.predict_proba(outcomes[["rsi_14", "macd", "returns", "volume"]]).shape == (len(outcomes), 2)
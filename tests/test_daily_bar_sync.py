@@ -0,0 +1,64 @@
+# test_daily_bar_sync.py
+# Incremental appends and split-triggered refetches in daily_bar_sync
+
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from daily_bar_sync import load_daily_bars, sync_daily_bars
+
+NOW = datetime(2025, 8, 22, 18, 0)  # Friday after the close
+
+
+def make_history(ticker, end, split_ratio=1.0):
+    days = pd.bdate_range(end=end, periods=300)
+    close = pd.Series(range(100, 400), dtype=float) / split_ratio
+    return pd.DataFrame({
+        "Datetime": days.strftime("%Y-%m-%d 01:00"), "Ticker": ticker,
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000,
+    })
+
+
+class FakeFetch:
+    def __init__(self, histories):
+        self.histories = histories
+        self.calls = []
+
+    def __call__(self, ticker, years_back=5, start_dt=None, end_dt=None):
+        self.calls.append((ticker, start_dt is None))
+        df = self.histories[ticker]
+        if start_dt is not None:
+            df = df[pd.to_datetime(df["Datetime"]) >= pd.Timestamp(start_dt)]
+        return df.reset_index(drop=True)
+
+
+def test_appends_only_missing_sessions(tmp_path):
+    path = str(tmp_path / "daily.csv")
+    latest = make_history("SSO", "2025-08-22")
+    latest.iloc[:-3].to_csv(path, index=False)  # Three sessions behind
+
+    fetch = FakeFetch({"SSO": latest})
+    df = sync_daily_bars(["SSO"], filename=path, fetch=fetch, now=NOW)
+    assert fetch.calls == [("SSO", False)]  # Only a short range request
+    assert len(df) == 300
+    assert len(load_daily_bars(path)) == 300
+
+    fetch.calls.clear()
+    sync_daily_bars(["SSO"], filename=path, fetch=fetch, now=NOW)
+    assert fetch.calls == []  # Already up to date
+
+
+def test_split_triggers_full_refetch(tmp_path):
+    path = str(tmp_path / "daily.csv")
+    make_history("SSO", "2025-08-19").to_csv(path, index=False)
+
+    adjusted = make_history("SSO", "2025-08-22", split_ratio=2.0)
+    fetch = FakeFetch({"SSO": adjusted})
+    df = sync_daily_bars(["SSO"], filename=path, fetch=fetch, now=NOW)
+    assert fetch.calls == [("SSO", False), ("SSO", True)]
+    stored = load_daily_bars(path)
+    assert len(stored) == len(df) == 300
+    assert stored["Close"].tolist() == adjusted["Close"].tolist()
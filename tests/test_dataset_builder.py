@@ -0,0 +1,70 @@
+# test_dataset_builder.py
+# Chunked, parallel dataset build vs. the single-process pipeline
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ai_features import build_training_features
+from ai_labeling import label_outcomes
+import dataset_builder
+from dataset_builder import PART_INDEX, build_dataset, build_task, partition_bars
+
+
+def make_history(seed=4):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker, n in [("SSO", 3000), ("AGQ", 1200)]:
+        close = 40 + rng.normal(0, 0.2, n).cumsum()
+        frames.append(pd.DataFrame({
+            "Datetime": pd.date_range("2025-05-20 09:30", periods=n, freq="30min"),
+            "Ticker": ticker, "Open": close, "High": close + 0.1, "Low": close - 0.1,
+            "Close": close, "Volume": rng.integers(100, 1000, n),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_parallel_build_matches_single_process(tmp_path):
+    bars = make_history()
+    csv_path = str(tmp_path / "minute.csv")
+    bars.to_csv(csv_path, index=False)
+    news = pd.DataFrame({"Ticker": ["SSO", "AGQ"], "Sentiment": [0.5, -0.2],
+                         "Datetime": pd.to_datetime(["2025-06-02 10:15", "2025-06-03 11:00"])})
+
+    dataset = build_dataset(csv_path, build_dir=str(tmp_path / "build"), events={"news": news},
+                            workers=2, task_span=pd.DateOffset(weeks=2), output_path=None)
+    dataset = dataset.reset_index(drop=True)
+
+    expected = label_outcomes(build_training_features(bars, news_df=news).reset_index())
+    expected = expected.reset_index(drop=True)
+    assert len(dataset) == len(expected)
+    assert (dataset["label"].to_numpy() == expected["label"].to_numpy()).all()
+    assert dataset["news_count"].sum() == expected["news_count"].sum() > 0
+    assert np.allclose(dataset["macd"], expected["macd"], equal_nan=True, atol=1e-4)
+
+
+def test_task_reads_only_the_parts_around_its_range(tmp_path, monkeypatch):
+    bars = make_history()
+    bars = bars[bars["Ticker"] == "SSO"]
+    csv_path = str(tmp_path / "minute.csv")
+    bars.to_csv(csv_path, index=False)
+    build_dir = str(tmp_path / "build")
+    partition_bars(csv_path, build_dir, chunk_rows=300)   # 10 parts of 300 bars
+
+    start, end = pd.Timestamp("2025-06-20"), pd.Timestamp("2025-06-23")
+    read = []
+    real_read = dataset_builder.read_frame
+    monkeypatch.setattr(dataset_builder, "read_frame", lambda path: read.append(path) or real_read(path))
+    path, rows = build_task(build_dir, "SSO", start, end)
+    assert rows > 0 and len(read) == 5   # 2 warm-up parts, the 2 parts spanning the range, 1 lookahead part
+    indexed = real_read(path)
+
+    # Same rows as a task that loads the whole history
+    os.remove(os.path.join(build_dir, "bars", "SSO", PART_INDEX))
+    read.clear()
+    path, full_rows = build_task(build_dir, "SSO", start, end)
+    assert len(read) == 10 and full_rows == rows
+    pd.testing.assert_frame_equal(indexed, real_read(path))
@@ -0,0 +1,57 @@
+# test_etrade_quote_client.py
+# Batching, ordering and typed output of etrade_quote_client
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+
+from etrade_quote_client import QuoteAuthError, fetch_quotes
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = ""
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Answers batched quote URLs; symbols starting with 'BAD' are rejected like E*TRADE does."""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        symbols = url.rsplit("/", 1)[1].removesuffix(".json").split(",")
+        with self._lock:
+            self.batches.append(symbols)
+        if self.status_code != 200:
+            return FakeResponse(self.status_code)
+        quotes = [{"Product": {"symbol": s}, "All": {
+            "lastTrade": 10.0 + i, "bidSize": 100, "high52": 12.5, "week52HiDate": 1735689600,
+            "annualDividend": 1.2, "yield": 9.5}} for i, s in enumerate(symbols) if not s.startswith("BAD")]
+        return FakeResponse(200, {"QuoteResponse": {"QuoteData": quotes}})
+
+
+def test_symbols_are_batched_and_returned_in_order():
+    symbols = [f"S{i:03d}" for i in range(100)][::-1] + ["s000", "BADX"]
+    session = FakeSession()
+    quotes = fetch_quotes(symbols, session=session, base_url="https://api")
+
+    assert sorted(len(b) for b in session.batches) == [1, 25, 25, 25, 25]  # 101 unique symbols
+    assert quotes["Ticker"].tolist() == [f"S{i:03d}" for i in range(100)][::-1]
+    assert str(quotes["bidSize"].dtype) == "Int64"
+    assert quotes["week52HiDate"].notna().all() and quotes["annualDividend"].eq(1.2).all()
+
+
+def test_unauthorized_supplied_session_raises():
+    with pytest.raises(QuoteAuthError):
+        fetch_quotes(["O", "MAIN"], session=FakeSession(status_code=401), base_url="https://api")
@@ -0,0 +1,54 @@
+# test_etrade_session_manager.py
+# Token expiry and background renewal in etrade_session_manager
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+pytest.importorskip("requests_oauthlib")
+from etrade_session_manager import EtradeSessionManager, read_token_store, token_expired
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return FakeResponse(self.status_code)
+
+
+def test_tokens_expire_at_midnight_eastern():
+    record = {"issued_at": "2025-08-20T08:30:00"}
+    assert not token_expired(record, now=datetime(2025, 8, 20, 23, 59))
+    assert token_expired(record, now=datetime(2025, 8, 21, 0, 1))
+    assert token_expired({"date": "2025-08-19"}, now=datetime(2025, 8, 20, 9, 0))
+
+
+def test_keepalive_renews_idle_token_and_records_it(tmp_path):
+    store = tmp_path / "auth.json"
+    store.write_text(json.dumps({"oauth_token": "t", "oauth_token_secret": "s",
+                                 "issued_at": "2025-08-20T08:00:00"}))
+    now = [datetime(2025, 8, 20, 8, 0)]
+    manager = EtradeSessionManager(store_path=str(store), clock=lambda: now[0])
+    manager._session, manager._token, manager._last_activity = FakeSession(), "t", now[0]
+
+    now[0] += timedelta(minutes=30)
+    manager.keepalive_once()
+    assert manager._session.urls == []  # Recently active
+
+    now[0] += timedelta(minutes=65)
+    manager.keepalive_once()
+    assert manager._session.urls[-1].endswith("/oauth/renew_access_token")
+    assert read_token_store(str(store))["last_renewed"] == "2025-08-20T09:35:00"
+    assert manager.status()["token_age"] == timedelta(hours=1, minutes=35)
@@ -0,0 +1,50 @@
+# test_feature_store.py
+# Incremental materialization and point-in-time reads in feature_store
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ai_features import technical_feature_frame
+from feature_store import FEATURE_COLUMNS, FeatureStore
+
+
+def make_bars(n=900, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 50 + rng.normal(0, 0.1, n).cumsum()
+    return pd.DataFrame({
+        "Datetime": pd.date_range("2025-08-21 09:30", periods=n, freq="1min"),
+        "Ticker": "SSO", "Open": close, "High": close + 0.05, "Low": close - 0.05,
+        "Close": close, "Volume": rng.integers(100, 1000, n),
+    })
+
+
+def test_incremental_updates_match_full_computation(tmp_path):
+    bars = make_bars()
+    store = FeatureStore(str(tmp_path))
+    assert store.update(bars.iloc[:600]) == 600
+    for i in range(600, 900, 100):
+        store.update(bars.iloc[:i + 100])  # Already-stored bars are skipped
+    assert store.update(bars) == 0
+
+    expected = technical_feature_frame("SSO", bars)
+    stored = FeatureStore(str(tmp_path)).read(["SSO"])
+    assert len(stored) == len(expected)
+    assert np.allclose(stored[FEATURE_COLUMNS].to_numpy(float), expected[FEATURE_COLUMNS].to_numpy(float),
+                       equal_nan=True)
+
+
+def test_reads_are_point_in_time(tmp_path):
+    bars = make_bars()
+    store = FeatureStore(str(tmp_path))
+    store.update(bars, sealed_before=bars["Datetime"].iloc[-1])  # Last minute still forming
+    as_of = bars["Datetime"].iloc[400]
+
+    assert store.read(["SSO"], as_of=as_of)["datetime"].max() == as_of
+    latest = store.latest(["SSO"], as_of=as_of)
+    assert latest["datetime"].iloc[0] == as_of
+    assert np.isclose(latest["close"].iloc[0], bars["Close"].iloc[400])
+    assert store.latest(["SSO"])["datetime"].iloc[0] == bars["Datetime"].iloc[-2]
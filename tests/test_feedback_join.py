@@ -0,0 +1,33 @@
+# test_feedback_join.py
+# Tolerance-bounded nearest as-of join of trades to predictions
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from feedback_join import feature_columns, match_trades_to_predictions
+
+
+def test_nearest_prediction_within_tolerance_per_ticker():
+    preds = pd.DataFrame({
+        "Ticker": ["SSO", "SSO", "TQQQ", "SSO"],
+        "Datetime": pd.to_datetime(["2025-07-14 09:30", "2025-07-14 09:38", "2025-07-14 09:40", "2025-07-14 11:00"]),
+        "Predicted_Prob": [0.6, 0.7, 0.8, 0.9],
+        "Outcome": [None] * 4,
+        "close": [1.0, 2.0, 3.0, 4.0],
+    })
+    trades = pd.DataFrame({
+        "Ticker": ["sso", "TQQQ", "SSO"],
+        "Open Datetime": pd.to_datetime(["2025-07-14 09:37", "2025-07-14 09:20", "2025-07-14 10:30"]),
+        "Profit/Loss": [12.5, -3.0, 5.0],
+    })
+    matched = match_trades_to_predictions(trades, preds)
+    # 09:37 SSO -> 09:38 (nearest); 09:20 TQQQ is 20 min away; 10:30 SSO is 30 min from 11:00
+    assert len(matched) == 1
+    row = matched.iloc[0]
+    assert row["Ticker"] == "SSO"
+    assert row["Prediction Datetime"] == pd.Timestamp("2025-07-14 09:38")
+    assert row["close"] == 2.0 and row["label"] == 1
+    assert feature_columns(matched) == ["close"]
@@ -0,0 +1,52 @@
+# test_fmp_cache.py
+# Per-symbol reads/writes, TTL and one-time JSON migration in fmp_cache
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from fmp_cache import FmpCache
+
+HISTORY = [{"date": "2025-07-15", "dividend": 0.12}, {"date": "2025-06-16", "dividend": 0.12}]
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps({"ABR": HISTORY, "EMPTY": []}))
+    db = str(tmp_path / "cache.sqlite")
+
+    cache = FmpCache(db, legacy_json=str(legacy))
+    assert len(cache) == 2 and "ABR" in cache and cache["EMPTY"] == []
+    assert cache["ABR"] == HISTORY
+
+    cache.put("ABR", HISTORY[:1])
+    # Reopening does not re-import the JSON over newer entries
+    assert FmpCache(db, legacy_json=str(legacy))["ABR"] == HISTORY[:1]
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = FmpCache(str(tmp_path / "cache.sqlite"), ttl=timedelta(days=30), legacy_json=None)
+    fetched = datetime(2025, 8, 1, 9, 0)
+    cache.put("O", HISTORY, now=fetched)
+
+    assert not cache.get("O", now=fetched + timedelta(days=29)).expired
+    entry = cache.get("O", now=fetched + timedelta(days=31))
+    assert entry.expired and entry.data == HISTORY
+    assert cache.fetched_times() == {"O": fetched}
+    assert cache.get("MISSING") is None
+
+
+def test_old_legacy_json_does_not_migrate_already_expired(tmp_path):
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps({"ABR": HISTORY}))
+    mtime = (datetime.now() - timedelta(days=90)).timestamp()
+    os.utime(legacy, (mtime, mtime))
+
+    cache = FmpCache(str(tmp_path / "cache.sqlite"), ttl=timedelta(days=30), legacy_json=str(legacy))
+    entry = cache.get("ABR")
+    assert not entry.expired and entry.data == HISTORY
+    assert entry.expires_at > datetime.now() + timedelta(days=29)
+    # The planner still sees how old the data really is
+    assert entry.fetched_at < datetime.now() - timedelta(days=89)
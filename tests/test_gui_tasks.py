@@ -0,0 +1,112 @@
+# test_gui_tasks.py
+# Worker execution, main-loop delivery, de-duplication and cancellation of gui_tasks
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+
+from gui_tasks import TaskCancelled, TaskRunner, check_cancelled, report_progress
+
+
+class FakeRoot:
+    """Stands in for a Tk root: after() callbacks are run by pump() on the test thread."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, fn, *args):
+        self.pending.append((fn, args))
+
+    def pump(self, runner, timeout=5):
+        deadline = time.time() + timeout
+        while (runner.running(self) or self.pending) and time.time() < deadline:
+            calls, self.pending = self.pending, []
+            for fn, args in calls:
+                fn(*args)
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def runner():
+    runner = TaskRunner(max_workers=2, poll_ms=1)
+    yield runner
+    runner.shutdown(wait=True)
+
+
+def test_results_and_progress_are_delivered_on_the_polling_thread(runner):
+    root = FakeRoot()
+    seen = []
+
+    def work(n):
+        for i in range(n):
+            report_progress(i + 1, f"step {i + 1}")
+        return threading.current_thread().name
+
+    runner.submit(root, work, 3, on_done=lambda r: seen.append(("done", r, threading.current_thread().name)),
+                  on_progress=lambda v, m: seen.append(("progress", v, m)))
+    root.pump(runner)
+
+    assert seen[:3] == [("progress", 1, "step 1"), ("progress", 2, "step 2"), ("progress", 3, "step 3")]
+    kind, worker_thread, delivered_on = seen[3]
+    assert kind == "done" and worker_thread.startswith("gui-task")
+    assert delivered_on == threading.current_thread().name
+    assert root.pending == [] and runner.running(root) == []
+
+
+def test_errors_go_to_on_error(runner):
+    root = FakeRoot()
+    errors = []
+    runner.submit(root, lambda: 1 / 0, on_error=errors.append, on_done=lambda r: errors.append("done?"))
+    root.pump(runner)
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
+
+
+def test_named_task_is_not_started_twice_but_others_overlap(runner):
+    root = FakeRoot()
+    gate = threading.Event()
+    started = []
+
+    def slow(tag):
+        started.append(tag)
+        gate.wait(5)
+        return tag
+
+    first = runner.submit(root, slow, "a", name="refresh")
+    assert runner.submit(root, slow, "b", name="refresh") is first
+    other = runner.submit(root, slow, "c", name="results")
+    while len(started) < 2:
+        time.sleep(0.01)
+    assert sorted(started) == ["a", "c"] and other is not first
+    gate.set()
+    root.pump(runner)
+    assert runner.running(root) == []
+
+
+def test_cancelled_task_never_reaches_on_done(runner):
+    root = FakeRoot()
+    done, errors = [], []
+    release = threading.Event()
+
+    def loop():
+        while True:
+            release.set()
+            check_cancelled()
+            time.sleep(0.01)
+
+    task = runner.submit(root, loop, name="loop", on_done=done.append, on_error=errors.append)
+    release.wait(5)
+    assert runner.cancel(root, "loop") == 1
+    root.pump(runner)
+
+    assert task.cancelled and done == [] and errors == []
+    with pytest.raises(TaskCancelled):
+        task.check()
+
+
+def test_report_and_check_are_no_ops_outside_tasks():
+    report_progress(1, "ignored")
+    check_cancelled()
@@ -0,0 +1,50 @@
+# test_model_registry.py
+# Versioning, hot reload and rollback for model_registry
+
+import os
+import sys
+
+import joblib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import model_registry as registry
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+
+def test_promote_hot_swaps_and_rollback_restores(tmp_path):
+    reg = str(tmp_path / "registry")
+    v1 = registry.register_model("m", ConstantModel(1), {"metrics": {"acc": 0.6}}, promote=True, registry_dir=reg)
+    first = registry.get_active_model("m", registry_dir=reg)
+    assert first.value == 1
+    # Cached object is reused while nothing changes
+    assert registry.get_active_model("m", registry_dir=reg) is first
+
+    v2 = registry.register_model("m", ConstantModel(2), registry_dir=reg)
+    assert registry.get_active_model("m", registry_dir=reg).value == 1  # Not promoted yet
+    registry.promote_version("m", v2, registry_dir=reg)
+    assert registry.get_active_model("m", registry_dir=reg).value == 2
+
+    assert registry.rollback("m", registry_dir=reg) == v1
+    assert registry.get_active_model("m", registry_dir=reg).value == 1
+    assert registry.get_active_metadata("m", registry_dir=reg)["metrics"] == {"acc": 0.6}
+
+
+def test_falls_back_to_legacy_file(tmp_path):
+    legacy = tmp_path / "legacy.pkl"
+    joblib.dump(ConstantModel(7), legacy)
+    model = registry.get_active_model("none", fallback_path=str(legacy), registry_dir=str(tmp_path / "r"))
+    assert model.value == 7
+
+
+def test_registries_with_the_same_model_name_do_not_share_the_cache(tmp_path):
+    first, second = str(tmp_path / "a"), str(tmp_path / "b")
+    registry.register_model("m", ConstantModel(1), promote=True, registry_dir=first)
+    registry.register_model("m", ConstantModel(2), promote=True, registry_dir=second)
+
+    assert registry.get_active_model("m", registry_dir=first).value == 1
+    assert registry.get_active_model("m", registry_dir=second).value == 2
+    assert registry.get_active_model("m", registry_dir=first).value == 1
@@ -0,0 +1,75 @@
+# test_model_updater.py
+# Warm-start growth and the validation gate in model_updater
+
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import model_updater
+
+
+def test_grow_trees_keeps_existing_trees():
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    y = (X["a"] > 0).astype(int)
+    base = RandomForestClassifier(n_estimators=10, max_depth=3, random_state=0).fit(X, y)
+    grown = model_updater._grow_trees(base, X.iloc[:80], y.iloc[:80], 5)
+    assert len(grown.estimators_) == 15
+    assert grown.estimators_[0] is not base.estimators_[0]  # Base model left untouched
+    assert len(base.estimators_) == 10
+
+
+def test_grow_trees_on_a_pipeline_reuses_the_fitted_scaler():
+    rng = np.random.default_rng(2)
+    X = pd.DataFrame(rng.normal(loc=50, scale=10, size=(200, 3)), columns=["a", "b", "c"])
+    y = (X["a"] > 50).astype(int)
+    base = Pipeline([("scale", StandardScaler()), ("model", RandomForestClassifier(n_estimators=10, max_depth=3, random_state=0))])
+    base.fit(X, y)
+    # A window drawn from a shifted distribution must not refit the scaler
+    new = X.iloc[:80] + 100
+    grown = model_updater._grow_trees(base, new, y.iloc[:80], 5)
+    assert len(grown[-1].estimators_) == 15 and len(base[-1].estimators_) == 10
+    np.testing.assert_allclose(grown[0].mean_, base[0].mean_)
+    assert grown.predict_proba(X).shape == (200, 2)
+
+
+def test_launch_reaps_and_does_not_stack_updates(monkeypatch):
+    launched = []
+
+    class FakeProcess:
+        def __init__(self, args, cwd):
+            self.code = None
+            launched.append(self)
+
+        def poll(self):
+            return self.code
+
+        def wait(self):
+            while self.code is None:
+                time.sleep(0.01)
+            return self.code
+
+    monkeypatch.setattr(model_updater, "_update_process", None)
+    monkeypatch.setattr(model_updater, "is_off_hours", lambda: True)
+    monkeypatch.setattr(model_updater.subprocess, "Popen", FakeProcess)
+
+    first = model_updater.launch_incremental_update()
+    assert model_updater.launch_incremental_update() is first and len(launched) == 1
+    first.code = 0
+    second = model_updater.launch_incremental_update()
+    assert second is not first and len(launched) == 2
+    second.code = 0
+
+
+def test_off_hours_window():
+    assert model_updater.is_off_hours(datetime(2025, 8, 23, 12, 0))      # Saturday
+    assert model_updater.is_off_hours(datetime(2025, 8, 22, 18, 30))     # Friday evening
+    assert not model_updater.is_off_hours(datetime(2025, 8, 22, 11, 0))  # Friday, market hours
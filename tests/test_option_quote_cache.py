@@ -0,0 +1,86 @@
+# test_option_quote_cache.py
+# Chain sharing, expiry/strike matching and cycle handling of option_quote_cache
+
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from option_quote_cache import OptionQuoteCache, parse_expiry
+
+EXPIRIES = [(2025, 6, 20), (2025, 7, 18)]
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Answers expiration and CALLPUT chain requests; chains price contracts by strike."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url.rsplit("/", 1)[1], params["symbol"]))
+        if url.endswith("optionexpiredate.json"):
+            return FakeResponse({"OptionExpireDateResponse": {"ExpirationDate": [
+                {"year": y, "month": m, "day": d} for y, m, d in EXPIRIES]}})
+        assert params["chainType"] == "CALLPUT"
+        pairs = [{"Call": {"strikePrice": k, "lastPrice": k / 10}, "Put": {"strikePrice": k, "lastPrice": k / 100}}
+                 for k in (50.0, 55.0, 60.0)]
+        return FakeResponse({"OptionChainResponse": {"OptionPair": pairs}})
+
+
+def chain_requests(session):
+    return [c for c in session.calls if c[0] == "optionchains.json"]
+
+
+def test_contracts_on_one_chain_share_a_request():
+    session = FakeSession()
+    cache = OptionQuoteCache(session=session, base_url="https://api")
+
+    assert cache.option_price("O", 55, "put", "06/20/2025") == 0.55
+    assert cache.option_price("o", 60, "call", "2025-06-20") == 6.0
+    assert cache.option_price("O", 56, "put", "06/21/2025") == 0.55  # nearest expiry and strike
+    assert len(chain_requests(session)) == 1
+    assert len(session.calls) == 2  # one expiration list, one chain
+
+    cache.option_price("O", 55, "put", "07/18/2025")
+    assert len(chain_requests(session)) == 2
+
+
+def test_new_cycle_refetches_chains_but_keeps_expirations():
+    session = FakeSession()
+    cache = OptionQuoteCache(session=session, base_url="https://api")
+    cache.option_price("O", 55, "put", "06/20/2025")
+    cache.begin_cycle()
+    cache.option_price("O", 55, "put", "06/20/2025")
+
+    assert len(chain_requests(session)) == 2
+    assert sum(1 for c in session.calls if c[0] == "optionexpiredate.json") == 1
+
+
+def test_chain_expires_after_ttl():
+    now = [0.0]
+    session = FakeSession()
+    cache = OptionQuoteCache(session=session, base_url="https://api", chain_ttl=60, clock=lambda: now[0])
+    cache.option_price("O", 55, "put", "06/20/2025")
+    now[0] = 30.0
+    cache.option_price("O", 55, "put", "06/20/2025")
+    now[0] = 61.0
+    cache.option_price("O", 55, "put", "06/20/2025")
+
+    assert len(chain_requests(session)) == 2
+
+
+def test_parse_expiry():
+    assert parse_expiry("06/20/2025") == date(2025, 6, 20)
+    assert parse_expiry("2025-06-20") == date(2025, 6, 20)
+    assert parse_expiry("June 20") is None
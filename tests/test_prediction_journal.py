@@ -0,0 +1,46 @@
+# test_prediction_journal.py
+# Buffering, day partitioning, range reads and CSV migration for prediction_journal
+
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from prediction_journal import PredictionJournal
+
+
+def record(ticker, when, prob):
+    return {"Ticker": ticker, "Datetime": when, "Predicted_Prob": prob, "Outcome": "", "close": 10.5}
+
+
+def test_buffer_flushes_into_day_partitions(tmp_path):
+    journal = PredictionJournal(str(tmp_path / "journal"), flush_rows=3)
+    journal.append([record("tqqq", "2025-07-14 09:31:00", 0.6), record("SSO", "2025-07-14 09:31:00", 0.4)])
+    assert journal.partitions() == []  # Still buffered
+    assert len(journal.read()) == 2    # ...but visible to readers
+    journal.append([record("SSO", "2025-07-15 10:00:00", 0.7)])
+    assert [os.path.basename(p) for p in journal.partitions()] == ["2025-07-14", "2025-07-15"]
+
+    df = journal.read()
+    assert df["Ticker"].tolist() == ["TQQQ", "SSO", "SSO"]
+    assert pd.api.types.is_datetime64_any_dtype(df["Datetime"])
+    assert df["Outcome"].isna().all()
+
+
+def test_range_query_reads_only_matching_rows(tmp_path):
+    journal = PredictionJournal(str(tmp_path / "journal"), flush_rows=1)
+    for day in (14, 15, 16):
+        journal.append([record("SSO", datetime(2025, 7, day, 9, 45), 0.5)])
+    df = journal.read(start="2025-07-15 00:00", end="2025-07-15 23:59", tickers=["sso"])
+    assert df["Datetime"].tolist() == [pd.Timestamp("2025-07-15 09:45")]
+
+
+def test_csv_migration_runs_once(tmp_path):
+    csv_path = tmp_path / "prediction_log.csv"
+    pd.DataFrame([record("AGQ", "2025-07-14 09:23:25", 0.87), record("AGQ", "2025-07-15 09:23:25", 0.5)]).to_csv(csv_path, index=False)
+    journal = PredictionJournal(str(tmp_path / "journal"))
+    assert journal.migrate_csv(str(csv_path)) == 2
+    assert journal.migrate_csv(str(csv_path)) == 0
+    assert len(journal.read()) == 2
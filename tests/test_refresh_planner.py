@@ -0,0 +1,51 @@
+# test_refresh_planner.py
+# Priority scoring, budgeted plans and same-day resume in refresh_planner
+
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from refresh_planner import build_plan, load_plan, mark_done, next_ex_date, save_plan, score_tickers
+
+NOW = datetime(2025, 8, 20, 9, 0)
+
+
+def monthly_history(last):
+    return [{"date": (last - timedelta(days=30 * i)).strftime("%Y-%m-%d")} for i in range(6)]
+
+
+def test_next_ex_date_extends_recent_interval():
+    assert next_ex_date(monthly_history(datetime(2025, 8, 1))).date() == date(2025, 8, 31)
+    assert next_ex_date([{"date": "2025-08-01"}]) is None
+
+
+def test_stale_big_holdings_and_overdue_ex_dates_come_first():
+    fetched = {
+        "BIG": NOW - timedelta(days=40),    # Stale, large position
+        "SMALL": NOW - timedelta(days=40),  # Stale, small position
+        "FRESH": NOW - timedelta(hours=2),  # Refreshed today
+        "OVERDUE": NOW - timedelta(days=5), # Fresh, but a payment should have appeared
+    }
+    scores = score_tickers(
+        ["SMALL", "FRESH", "OVERDUE", "BIG", "NEW"], fetched, ttl_days=30,
+        position_values={"BIG": 50_000, "SMALL": 2_000, "FRESH": 40_000},
+        candidate_scores={"OVERDUE": 0.9, "NEW": 0.2},
+        ex_dates={"OVERDUE": NOW - timedelta(days=2)}, now=NOW)
+    order = scores["ticker"].tolist()
+    assert order.index("BIG") < order.index("SMALL")
+    assert order[-1] == "FRESH" and scores.iloc[-1]["score"] == 0
+    overdue = scores.set_index("ticker").loc["OVERDUE"]
+    assert overdue["ex_div"] == 1.0 and overdue["fmp_calls"] == 1
+
+    plan = build_plan(scores, fmp_budget=2)
+    assert sum(e["fmp_calls"] for e in plan) <= 2
+    assert [e["ticker"] for e in plan] == order[:2]
+
+
+def test_saved_plan_resumes_without_done_tickers(tmp_path):
+    path = str(tmp_path / "plan.json")
+    save_plan([{"ticker": "A", "fmp_calls": 1}, {"ticker": "B", "fmp_calls": 0}], path)
+    mark_done(["A"], path)
+    assert [e["ticker"] for e in load_plan(path)] == ["B"]
+    assert load_plan(path, day=date.today() + timedelta(days=1)) is None
@@ -0,0 +1,77 @@
+# test_report_writer.py
+# Write-only frame output, named styles and ReportSheet layout of report_writer
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from report_writer import MONEY, PERCENT, ReportSheet, ReportWriter, signed_style, write_report
+
+
+def test_write_report_round_trips_through_read_excel(tmp_path):
+    path = str(tmp_path / "trade_log.xlsx")
+    df = pd.DataFrame({"Ticker": ["AAPL", "O", None], "Open Price": [190.5, 55.25, float("nan")], "Trade QTY": [10, 5, 1]})
+    write_report(path, {"Sheet1": df}, column_formats={"Open Price": MONEY})
+
+    back = pd.read_excel(path)
+    assert back.columns.tolist() == ["Ticker", "Open Price", "Trade QTY"]
+    assert back["Open Price"].tolist()[:2] == [190.5, 55.25] and pd.isna(back["Open Price"][2])
+
+    ws = load_workbook(path)["Sheet1"]
+    assert ws["B2"].number_format == MONEY and ws["C2"].number_format == "General"
+    assert ws["A1"].font.bold and ws["A1"].font.name == "Arial" and ws["B3"].border.left.style == "thin"
+    assert ws.freeze_panes == "A2"
+    assert ws.column_dimensions["B"].width == len("Open Price") + 2
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_styles_are_registered_once_per_workbook(tmp_path):
+    path = str(tmp_path / "two_sheets.xlsx")
+    with ReportWriter(path) as report:
+        report.write_frame("A", pd.DataFrame({"x": [1.0]}), column_formats={"x": MONEY})
+        report.write_frame("B", pd.DataFrame({"x": [2.0]}), column_formats={"x": MONEY})
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["A", "B"]
+    names = list(wb.named_styles)
+    assert names.count(f"report_body {MONEY}") == 1 and names.count("report_header") == 1
+
+
+def test_report_sheet_into_an_editable_workbook():
+    wb = Workbook()
+    report = ReportSheet()
+    report.put(1, 1, "DASHBOARD", "results_title")
+    report.merge("A1:C1")
+    report.put(2, 2, -12.5, signed_style(-12.5, "results_up", "results_down", "results_label"), MONEY)
+    report.put(3, 2, 0.25, "results_value", PERCENT)
+    report.auto_width(3)
+    report.write_to(wb.active)
+
+    # Regenerating into the same workbook reuses the registered styles
+    ReportSheet().write_to(wb.create_sheet("again"))
+    report.write_to(wb["again"])
+
+    ws = wb.active
+    assert "A1:C1" in ws.merged_cells
+    assert ws["A1"].fill.fgColor.rgb.endswith("1F4E79") and ws["A1"].alignment.horizontal == "center"
+    assert ws["B2"].font.color.rgb.endswith("CC0000") and ws["B2"].number_format == MONEY
+    assert ws["B3"].number_format == PERCENT and ws["B3"].border.top.style == "thin"
+    assert ws.column_dimensions["A"].width == len("DASHBOARD") + 2
+    assert ws.column_dimensions["C"].width == 6
+
+
+def test_report_sheet_streams_into_a_write_only_sheet(tmp_path):
+    path = str(tmp_path / "dashboard.xlsx")
+    report = ReportSheet()
+    report.put(1, 1, "Title", "results_title")
+    report.merge("A1:B1")
+    report.put(3, 2, 10, "results_count")
+    with ReportWriter(path) as writer:
+        writer.write_sheet("Results", report)
+
+    ws = load_workbook(path)["Results"]
+    assert ws["A1"].value == "Title" and ws["A2"].value is None and ws["B3"].value == 10
+    assert "A1:B1" in ws.merged_cells
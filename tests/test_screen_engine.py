@@ -0,0 +1,55 @@
+# test_screen_engine.py
+# Shared call budget, provider caps and ordered results in screen_engine
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from screen_engine import CallBudget, ProviderLimiter, run_ordered
+
+
+def test_budget_is_never_exceeded_across_threads(tmp_path):
+    budget = CallBudget(25, state_path=str(tmp_path / "budget.json"))
+
+    def screen(symbol):
+        return symbol if budget.try_acquire() else "deferred"
+
+    results = run_ordered([f"T{i}" for i in range(100)], screen, workers=16)
+    assert budget.used == 25
+    assert sum(r != "deferred" for r in results) == 25
+    # A restart the same day picks up the persisted count
+    assert CallBudget(25, state_path=str(tmp_path / "budget.json")).exhausted
+
+
+def test_results_keep_input_order_and_errors_become_none():
+    def slow_square(n):
+        time.sleep(random.random() / 100)
+        if n == 7:
+            raise ValueError("bad ticker")
+        return n * n
+
+    seen = []
+    results = run_ordered(range(20), slow_square, workers=8, on_result=lambda item, res: seen.append(item))
+    assert results == [None if n == 7 else n * n for n in range(20)]
+    assert sorted(seen) == list(range(20))
+
+
+def test_provider_limiter_caps_concurrency():
+    limiter = ProviderLimiter(max_concurrent=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call(_):
+        with limiter.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+    run_ordered(range(12), call, workers=6)
+    assert peak[0] == 2
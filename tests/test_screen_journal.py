@@ -0,0 +1,41 @@
+# test_screen_journal.py
+# Crash-safe resume and compaction for the screen checkpoint journal
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from screen_journal import MATCH, REJECTED, ScreenJournal, journal_path, remove_stale_journals
+
+
+def test_resume_ignores_torn_tail_and_compacts(tmp_path):
+    path = journal_path("20250801", str(tmp_path))
+    journal = ScreenJournal(path)
+    journal.append("AAA", MATCH, {"Ticker": "AAA", "Yield Est (%)": 18.2})
+    journal.append("BBB", REJECTED)
+    journal.close()
+    # Simulate a crash in the middle of the next write
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"ticker": "CCC", "sta')
+
+    resumed = ScreenJournal(path)
+    assert list(resumed.load()) == ["AAA", "BBB"]
+    resumed.append("DDD", MATCH, {"Ticker": "DDD", "Yield Est (%)": 21.0})
+    resumed.close()
+
+    again = ScreenJournal(path)
+    again.load()
+    assert again.done() == {"AAA", "BBB", "DDD"}
+    out = again.compact(str(tmp_path / "results.csv"))
+    assert out["Ticker"].tolist() == ["AAA", "DDD"]
+    assert pd.read_csv(tmp_path / "results.csv")["Ticker"].tolist() == ["AAA", "DDD"]
+
+
+def test_stale_journals_are_removed(tmp_path):
+    old, today = journal_path("20250731", str(tmp_path)), journal_path("20250801", str(tmp_path))
+    for path in (old, today):
+        ScreenJournal(path).append("AAA", REJECTED)
+    remove_stale_journals(today, str(tmp_path))
+    assert not os.path.exists(old) and os.path.exists(today)
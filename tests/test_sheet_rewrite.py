@@ -0,0 +1,52 @@
+# test_sheet_rewrite.py
+# One-pass row sorting of sheet_rewrite: values, styles, formulas and widths
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+from sheet_rewrite import read_rows, sort_rows, write_rows
+
+
+def make_sheet():
+    ws = Workbook().active
+    ws.append(["Ticker", "Shares", "Cost", "Investment"])
+    for r, (ticker, shares, cost) in enumerate([("O", 100, 55.5), ("AGNC", 200, 9.8), ("MAIN", 50, 40.0)], start=2):
+        ws.append([ticker, shares, cost, f"=B{r}*C{r}"])
+        ws.cell(row=r, column=3).number_format = "$#,##0.00"
+    ws["A3"].font = Font(bold=True, color="CC0000")
+    ws.row_dimensions[3].height = 30
+    ws.column_dimensions["A"].width = 18
+    return ws
+
+
+def test_sort_moves_values_styles_and_formulas_together():
+    ws = make_sheet()
+    assert sort_rows(ws, key=lambda values: values[0])
+
+    assert [ws.cell(row=r, column=1).value for r in range(1, 5)] == ["Ticker", "AGNC", "MAIN", "O"]
+    assert [ws.cell(row=r, column=4).value for r in range(2, 5)] == ["=B2*C2", "=B3*C3", "=B4*C4"]
+    assert ws["A2"].font.bold and ws["A2"].font.color.rgb.endswith("CC0000")
+    assert not ws["A4"].font.bold
+    assert ws.row_dimensions[2].height == 30
+    assert ws["C2"].number_format == "$#,##0.00"
+    assert ws.column_dimensions["A"].width == 18
+
+
+def test_sorted_sheet_is_left_alone():
+    ws = make_sheet()
+    assert sort_rows(ws, key=lambda values: values[1] if values[1] != 200 else 0) is True
+    assert sort_rows(ws, key=lambda values: values[1] if values[1] != 200 else 0) is False
+
+
+def test_write_rows_blanks_rows_left_over_after_a_removal():
+    ws = make_sheet()
+    kept = [snap for snap in read_rows(ws) if snap.values[0] != "AGNC"]
+    write_rows(ws, kept, clear_to=ws.max_row)
+
+    assert [ws.cell(row=r, column=1).value for r in range(2, 5)] == ["O", "MAIN", None]
+    assert ws["D3"].value == "=B3*C3"
+    assert not ws["A4"].font.bold
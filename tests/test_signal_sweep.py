@@ -0,0 +1,51 @@
+# test_signal_sweep.py
+# Vectorized indicators and the parallel sweep in signal_sweep
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import signal_sweep
+
+
+def make_bars(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker in ["SSO", "AGQ", "TQQQ", "SPY"]:
+        close = 40 + rng.normal(0, 0.1, n).cumsum()
+        frames.append(pd.DataFrame({
+            "Datetime": pd.date_range("2025-08-01", periods=n, freq="1min"), "Ticker": ticker,
+            "Open": close, "High": close + np.abs(rng.normal(0, 0.05, n)),
+            "Low": close - np.abs(rng.normal(0, 0.05, n)), "Close": close, "Volume": rng.integers(100, 1000, n),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_pmo_and_cci_match_pandas_definitions():
+    bars = make_bars()
+    market = signal_sweep.prepare_market(bars)
+    col = market["tickers"].index("SSO")
+    tdf = bars[bars["Ticker"] == "SSO"].reset_index(drop=True)
+
+    roc = tdf["Close"].pct_change() * 100
+    pmo = roc.ewm(span=35, adjust=False).mean().ewm(span=35, adjust=False).mean()
+    assert np.allclose(signal_sweep.pmo_indicator(market, 35, 10)["PMO"][1:, col], pmo[1:])
+
+    tp = (tdf["High"] + tdf["Low"] + tdf["Close"]) / 3
+    mad = tp.rolling(20).apply(lambda x: np.mean(np.abs(x - np.mean(x))), raw=True)
+    cci = (tp - tp.rolling(20).mean()) / (0.015 * mad)
+    assert np.allclose(signal_sweep.cci_indicator(market, 20)["CCI"][:, col], cci, equal_nan=True)
+
+
+def test_parallel_sweep_matches_serial_and_is_ranked():
+    bars = make_bars()
+    grid = {"adx_period": [14, 21], "entry_score": [0.5, 1.5], "top_n": [2, 4]}
+    parallel = signal_sweep.run_sweep(bars, grid, workers=2)
+    serial = signal_sweep.run_sweep(bars, grid, workers=1)
+    assert len(parallel) == 8
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert parallel["fold_mean"].is_monotonic_decreasing
+    assert (parallel["trades"] >= 0).all()
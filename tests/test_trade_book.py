@@ -0,0 +1,38 @@
+# test_trade_book.py
+# Row index, cached headers and changed-cell writes in trade_book
+
+import os
+import sys
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from trade_book import TradeBook
+
+
+def make_sheet():
+    ws = Workbook().active
+    ws.append(["Type", "Stock ticker", "Date of transaction", "Number of shares +/-", "Current Price"])
+    ws.append(["Stock", "O", "2025-07-01", 100, 55.0])
+    ws.append(["Put", "MAIN", "2025-07-02", -1, 1.2])
+    ws.append(["Stock", "O", "2025-08-01", 50, 55.0])
+    return ws
+
+
+def test_rows_are_indexed_by_trade_key_and_symbol():
+    book = TradeBook(make_sheet())
+    assert book.column(["Stock Ticker", "Ticker"]) == 2
+    assert book.column(["Missing", "currentprice"]) == 5
+    assert book.find_row("O", "2025-08-01", "50") == 4
+    assert book.find_row("O", "2025-08-01", "51") is None
+    assert book.rows_by_symbol["O"] == [2, 4]
+
+
+def test_only_changed_cells_are_written():
+    ws = make_sheet()
+    book = TradeBook(ws)
+    price_col = book.column(["Current Price"])
+    assert not book.set_value(2, price_col, 55.0)
+    assert book.set_value(4, price_col, 56.25, "$#,##0.00")
+    assert book.changed_cells == 1
+    assert ws.cell(row=4, column=price_col).value == 56.25
@@ -0,0 +1,80 @@
+# test_trade_results.py
+# Parsing, grouped aggregates and content-hash caching of trade_results
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import trade_results
+from trade_results import compute_analytics, load_closed_trade_analytics, rows_frame, sheet_content_hash
+
+HEADER = ["Type", "Stock ticker", "Date of transaction", "Close Date", "Realized profit loss", "P&L %"]
+RENAME = {"Stock ticker": "Ticker", "Date of transaction": "Date", "Realized profit loss": "Realized P/L"}
+ROWS = [
+    ["Sold Put", "O", "1/2/2024", datetime(2024, 1, 12), 120.0, 0.05],
+    ["Sold Put", "o", "1/5/2024", "2/1/2024", "$-40.50", "-2%"],
+    ["Covered Call", "MAIN", "2024-12-01", "2025-01-10", 300, 12],
+    ["Covered Call", "MAIN", "12/20/2024", None, 999, 0.5],          # still open: no close date
+    ["Stock", "AGNC", "3/1/2025", "03-15-2025", "n/a", 0.1],          # unparseable P/L
+]
+
+
+@pytest.fixture
+def xlsx(tmp_path):
+    path = str(tmp_path / "trades.xlsx")
+    wb = Workbook()
+    wb.active.title = "Open_Trades_2025"
+    ws = wb.create_sheet("Closed_Trades_2025")
+    ws.append(HEADER)
+    for row in ROWS:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def test_yearly_stats_match_the_tracker_rules():
+    analytics = compute_analytics(rows_frame([HEADER] + ROWS, RENAME))
+    stats = analytics["yearly_stats"]
+
+    assert list(stats) == [2024, 2025]
+    assert stats[2024]["trade_count"] == 2 and stats[2024]["total_pl"] == pytest.approx(79.5)
+    assert stats[2024]["win_rate"] == 0.5 and stats[2024]["avg_percent"] == pytest.approx(0.015)
+    assert stats[2025]["trade_count"] == 1 and stats[2025]["avg_percent"] == pytest.approx(0.12)
+
+
+def test_breakdowns_and_holding_periods():
+    analytics = compute_analytics(rows_frame([HEADER] + ROWS, RENAME))
+
+    assert analytics["by_symbol"].index.tolist() == ["MAIN", "O"]
+    assert analytics["by_strategy"].loc["Sold Put", "trade_count"] == 2
+    assert analytics["monthly"].index.tolist() == ["2024-01", "2024-02", "2025-01"]
+    assert analytics["by_symbol"].loc["O", "avg_days_held"] == pytest.approx((10 + 27) / 2)
+    assert analytics["holding"]["max_days"] == 40
+
+
+def test_empty_or_missing_sheet():
+    assert compute_analytics(None)["yearly_stats"] == {}
+    assert compute_analytics(rows_frame([HEADER]))["by_symbol"].empty
+
+
+def test_analytics_are_cached_until_the_sheet_changes(xlsx, monkeypatch):
+    reads = []
+    real_read = trade_results.read_sheet_frame
+    monkeypatch.setattr(trade_results, "read_sheet_frame", lambda *a: reads.append(a) or real_read(*a))
+
+    first = load_closed_trade_analytics(xlsx, rename=RENAME)
+    assert load_closed_trade_analytics(xlsx, rename=RENAME) is first
+    assert len(reads) == 1
+
+    before = sheet_content_hash(xlsx, "Closed_Trades_2025")
+    wb = load_workbook(xlsx)
+    wb["Closed_Trades_2025"].append(["Stock", "AGNC", "3/1/2025", "3/20/2025", 10, 0.01])
+    wb.save(xlsx)
+    assert sheet_content_hash(xlsx, "Closed_Trades_2025") != before
+
+    again = load_closed_trade_analytics(xlsx, rename=RENAME)
+    assert len(reads) == 2 and again["yearly_stats"][2025]["trade_count"] == 2
@@ -0,0 +1,113 @@
+# test_workbook_session.py
+# Shared loading, deferred commits, change detection and in-memory reads of workbook_session
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from workbook_session import WorkbookConflictError, WorkbookSession, workbook_action, get_workbook_session
+
+
+@pytest.fixture
+def xlsx(tmp_path):
+    path = str(tmp_path / "trades.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Open_Trades_2025"
+    ws.append(["Ticker", "Shares", "Cost"])
+    ws.append(["O", 100, 55.5])
+    ws.append(["MAIN", 50, 40.0])
+    wb.save(path)
+    return path
+
+
+def test_nested_actions_share_one_load_and_one_save(xlsx):
+    session = WorkbookSession(xlsx)
+
+    def inner():
+        with session.unit_of_work():
+            session.edit("Open_Trades_2025")["C2"] = 56.0
+            assert session.commit() is True
+            assert session.saves == 0  # deferred to the outer action
+
+    with session.unit_of_work():
+        inner()
+        session.create_sheet("Results", replace=True)["A1"] = "Win rate"
+        session.commit()
+
+    assert (session.loads, session.saves) == (1, 1)
+    with session.unit_of_work():
+        assert session.commit() is False  # Nothing dirty, nothing saved
+    wb = load_workbook(xlsx)
+    assert wb["Open_Trades_2025"]["C2"].value == 56.0 and wb["Results"]["A1"].value == "Win rate"
+    assert not os.path.exists(f"{xlsx}.tmp")
+
+
+def test_uncommitted_or_failed_actions_are_discarded(xlsx):
+    session = WorkbookSession(xlsx)
+    with session.unit_of_work():
+        session.edit("Open_Trades_2025")["A2"] = "XXX"
+    with pytest.raises(RuntimeError):
+        with session.unit_of_work():
+            with session.unit_of_work():
+                session.edit("Open_Trades_2025")["A3"] = "YYY"
+                session.commit()
+            raise RuntimeError("boom")
+
+    assert session.saves == 0
+    assert session.sheet("Open_Trades_2025")["A2"].value == "O"
+    assert session.sheet("Open_Trades_2025")["A3"].value == "MAIN"
+
+
+def test_workbook_reloads_after_an_external_save(xlsx):
+    session = WorkbookSession(xlsx)
+    assert session.sheet("Open_Trades_2025")["A2"].value == "O"
+
+    wb = load_workbook(xlsx)
+    wb["Open_Trades_2025"]["A2"] = "AGNC"
+    wb.save(xlsx)
+    os.utime(xlsx, ns=(os.stat(xlsx).st_atime_ns, os.stat(xlsx).st_mtime_ns + 10**9))
+
+    assert session.sheet("Open_Trades_2025")["A2"].value == "AGNC"
+    assert session.loads == 2
+
+
+def test_commit_refuses_to_overwrite_external_changes(xlsx):
+    session = WorkbookSession(xlsx)
+    session.edit("Open_Trades_2025")["A2"] = "MINE"
+    wb = load_workbook(xlsx)
+    wb["Open_Trades_2025"]["A3"] = "THEIRS"
+    wb.save(xlsx)
+    os.utime(xlsx, ns=(os.stat(xlsx).st_atime_ns, os.stat(xlsx).st_mtime_ns + 10**9))
+
+    with pytest.raises(WorkbookConflictError):
+        session.commit()
+    assert load_workbook(xlsx)["Open_Trades_2025"]["A3"].value == "THEIRS"
+
+
+def test_read_frame_sees_pending_edits_like_read_excel(xlsx):
+    session = WorkbookSession(xlsx)
+    with session.unit_of_work():
+        session.edit("Open_Trades_2025").append(["AGNC", 200, None])
+        pending = session.read_frame("Open_Trades_2025")
+        session.commit()
+
+    saved = pd.read_excel(xlsx, header=0, sheet_name="Open_Trades_2025")
+    assert pending["Ticker"].tolist() == saved["Ticker"].tolist() == ["O", "MAIN", "AGNC"]
+    assert pending["Shares"].tolist() == saved["Shares"].tolist()
+    assert pending["Cost"].fillna(0).tolist() == saved["Cost"].fillna(0).tolist()
+
+
+def test_workbook_action_uses_the_shared_session(xlsx):
+    @workbook_action(xlsx)
+    def rename_first():
+        book = get_workbook_session(xlsx)
+        book.edit("Open_Trades_2025")["A2"] = "REALTY"
+        book.commit()
+
+    rename_first()
+    assert load_workbook(xlsx)["Open_Trades_2025"]["A2"].value == "REALTY"
@@ -0,0 +1,76 @@
+"""
+In-memory index over a TradeTracker trades sheet.
+
+TradeBook reads the sheet once: header positions are cached, and every row is
+indexed by its (ticker, trade date, shares) key, the same key TradeTracker uses
+to match a GUI trade to its Excel row. Lookups are dict reads instead of a
+row-by-row scan per trade, and set_value() only writes cells whose value
+actually changes, so a price refresh touches just the cells that moved.
+"""
+from collections import defaultdict
+
+TICKER_HEADERS = ["Stock ticker", "Ticker"]
+DATE_HEADERS = ["Date of transaction", "Trade Date", "Date"]
+SHARES_HEADERS = ["Number of shares +/-", "Shares", "Quantity"]
+
+
+def normalize_header(name):
+    return str(name).strip().replace(" ", "").lower()
+
+
+def trade_key(ticker, date, shares):
+    """Row key; values are compared as strings, matching how the GUI rows are matched to Excel."""
+    return str(ticker), str(date), str(shares)
+
+
+class TradeBook:
+    def __init__(self, ws, header_row=1):
+        self.ws = ws
+        self.header_row = header_row
+        self.header = [cell.value for cell in ws[header_row]]
+        self._columns = {}
+        for idx, name in enumerate(self.header, start=1):
+            if name:
+                self._columns.setdefault(normalize_header(name), idx)
+        self._rows = {}                         # trade key -> first matching row
+        self.rows_by_symbol = defaultdict(list)  # ticker -> rows
+        self.changed_cells = 0
+        self._index()
+
+    def column(self, names):
+        """1-based column of the first header in `names` present on the sheet, or None."""
+        for name in names:
+            idx = self._columns.get(normalize_header(name))
+            if idx:
+                return idx
+        return None
+
+    def _index(self):
+        ticker_col, date_col, shares_col = (self.column(TICKER_HEADERS), self.column(DATE_HEADERS),
+                                            self.column(SHARES_HEADERS))
+        if not ticker_col:
+            return
+        for r, values in enumerate(self.ws.iter_rows(min_row=self.header_row + 1, values_only=True),
+                                   start=self.header_row + 1):
+            ticker = values[ticker_col - 1] if ticker_col <= len(values) else None
+            date = values[date_col - 1] if date_col and date_col <= len(values) else None
+            shares = values[shares_col - 1] if shares_col and shares_col <= len(values) else None
+            self._rows.setdefault(trade_key(ticker, date, shares), r)
+            if ticker:
+                self.rows_by_symbol[str(ticker).strip().upper()].append(r)
+
+    def find_row(self, ticker, date, shares):
+        return self._rows.get(trade_key(ticker, date, shares))
+
+    def set_value(self, row, column, value, number_format=None):
+        """Writes a cell only if its value (or number format) differs; returns True if written."""
+        if not row or not column:
+            return False
+        cell = self.ws.cell(row=row, column=column)
+        if cell.value == value and (number_format is None or cell.number_format == number_format):
+            return False
+        cell.value = value
+        if number_format is not None:
+            cell.number_format = number_format
+        self.changed_cells += 1
+        return True
@@ -0,0 +1,181 @@
+"""
+Closed-trade analytics for the trackers' Results sheet.
+
+generate_results used to read Closed_Trades_2025 cell by cell through the editable
+workbook and build the yearly table in Python loops. Here the sheet is streamed
+with a read-only workbook into a DataFrame, every aggregate (by year, month, symbol
+and strategy, plus holding periods) comes from a groupby, and the result is cached
+under a hash of the sheet's stored XML, so an unchanged sheet is not even parsed on
+the next run.
+
+    analytics = load_closed_trade_analytics("Bryan Perry Transactions.xlsx", rename=EXCEL_TO_APP_COLS)
+    analytics["yearly_stats"]   # {year: {"total_pl", "avg_percent", "win_rate", "trade_count", ...}}
+    analytics["by_symbol"]      # DataFrame, one row per ticker
+"""
+import hashlib
+import os
+import posixpath
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+CLOSED_SHEET = "Closed_Trades_2025"
+DATE_FORMATS = ["%m/%d/%Y", "%Y-%m-%d", "%m-%d-%Y"]
+SUMMARY_COLUMNS = ["total_pl", "avg_percent", "win_rate", "trade_count", "winning_trades",
+                   "losing_trades", "avg_days_held"]
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def sheet_content_hash(path, sheet_name):
+    """SHA-1 of a sheet's stored XML and the shared strings it indexes, or None if unreadable."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+            rel_id = next(s.get(f"{_NS_REL}id") for s in workbook.iter(f"{_NS_MAIN}sheet")
+                          if s.get("name") == sheet_name)
+            rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+            target = next(r.get("Target") for r in rels.iter(f"{_NS_PKG}Relationship") if r.get("Id") == rel_id)
+            member = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+            digest = hashlib.sha1(zf.read(member))
+            if "xl/sharedStrings.xml" in zf.namelist():
+                digest.update(zf.read("xl/sharedStrings.xml"))
+            return digest.hexdigest()
+    except (OSError, KeyError, StopIteration, zipfile.BadZipFile, ET.ParseError):
+        return None
+
+
+def rows_frame(rows, rename=None):
+    """DataFrame from sheet rows (first row is the header); headers are mapped through `rename`."""
+    rows = list(rows)
+    if not rows:
+        return pd.DataFrame()
+    rename = rename or {}
+    header = [rename.get(h, h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(rows[0])]
+    df = pd.DataFrame(rows[1:], columns=header)
+    # Alternative headers can map to the same column; the rightmost one wins, as in a dict
+    return df.loc[:, ~df.columns.duplicated(keep="last")]
+
+
+def read_sheet_frame(path, sheet_name=CLOSED_SHEET, rename=None):
+    """The sheet as a DataFrame, streamed through a read-only workbook (None if the sheet is missing)."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        if sheet_name not in wb.sheetnames:
+            return None
+        return rows_frame(wb[sheet_name].iter_rows(values_only=True), rename)
+    finally:
+        wb.close()
+
+
+def parse_dates(series):
+    """Datetimes from cells holding datetimes or date strings in DATE_FORMATS (NaT otherwise)."""
+    as_datetime = pd.to_datetime(series.where(series.map(lambda v: hasattr(v, "year"))), errors="coerce")
+    text = series.astype(str).str.split().str[0]
+    for fmt in DATE_FORMATS:
+        as_datetime = as_datetime.fillna(pd.to_datetime(text, format=fmt, errors="coerce"))
+    return as_datetime
+
+
+def parse_money(series):
+    """Floats from numbers or "$1,234.50" strings; blanks are 0, unparseable text is NaN."""
+    text = series.astype(str).str.replace("$", "", regex=False).str.replace(",", "", regex=False)
+    values = pd.to_numeric(text, errors="coerce")
+    return values.mask(series.isna() | series.eq(""), 0.0)
+
+
+def parse_percent(series):
+    """P&L % in percent units: "12%" -> 12, stored fractions (floats below 1) -> x100."""
+    is_text = series.map(lambda v: isinstance(v, str))
+    is_fraction = series.map(lambda v: isinstance(v, float) and v < 1)
+    values = parse_money(series.where(~is_text, series.astype(str).str.replace("%", "", regex=False)))
+    return values.mask(is_fraction, values * 100)
+
+
+def prepare_trades(df):
+    """Closed trades with a parsed close date; one row per trade that has a P/L and P&L %."""
+    columns = ["ticker", "type", "close_date", "year", "month", "pl", "pct", "days_held"]
+    if df is None or df.empty or "Close Date" not in df.columns:
+        return pd.DataFrame(columns=columns)
+    missing = pd.Series(None, index=df.index, dtype=object)
+    close_date = parse_dates(df["Close Date"])
+    trades = pd.DataFrame({
+        "ticker": df.get("Ticker", missing).astype(str).str.strip().str.upper(),
+        "type": df.get("Type", missing).fillna("").astype(str).str.strip(),
+        "close_date": close_date,
+        "pl": parse_money(df.get("Realized P/L", missing)),
+        "pct": parse_percent(df.get("P&L %", missing)),
+        "days_held": (close_date - parse_dates(df.get("Date", missing))).dt.days,
+    })
+    trades = trades[trades["close_date"].notna() & trades["pl"].notna() & trades["pct"].notna()].copy()
+    trades["year"] = trades["close_date"].dt.year
+    trades["month"] = trades["close_date"].dt.strftime("%Y-%m")
+    return trades[columns]
+
+
+def summarize(trades, by):
+    """Per-group totals: P/L, average P&L % (as a fraction), win rate, counts and days held."""
+    if trades.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    grouped = trades.assign(win=trades["pl"] > 0, loss=trades["pl"] < 0).groupby(by, sort=False)
+    summary = grouped.agg(total_pl=("pl", "sum"), total_percent=("pct", "sum"), trade_count=("pl", "size"),
+                          winning_trades=("win", "sum"), losing_trades=("loss", "sum"),
+                          avg_days_held=("days_held", "mean"))
+    summary["avg_percent"] = summary["total_percent"] / summary["trade_count"] / 100
+    summary["win_rate"] = summary["winning_trades"] / summary["trade_count"]
+    return summary[SUMMARY_COLUMNS]
+
+
+def compute_analytics(df):
+    """All closed-trade aggregates from a sheet frame."""
+    trades = prepare_trades(df)
+    yearly = summarize(trades, "year")
+    held = trades["days_held"].dropna()
+    return {
+        "trades": trades,
+        "yearly": yearly,
+        "yearly_stats": {int(year): stats for year, stats in yearly.drop(columns="avg_days_held").to_dict("index").items()},
+        "monthly": summarize(trades, "month").sort_index(),
+        "by_symbol": summarize(trades, "ticker").sort_values("total_pl", ascending=False),
+        "by_strategy": summarize(trades, "type").sort_values("total_pl", ascending=False),
+        "holding": {
+            "avg_days": float(held.mean()) if len(held) else None,
+            "median_days": float(held.median()) if len(held) else None,
+            "max_days": int(held.max()) if len(held) else None,
+        },
+    }
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_closed_trade_analytics(path, sheet_name=CLOSED_SHEET, rename=None, session=None):
+    """
+    Analytics for the closed-trades sheet, recomputed only when its content changes.
+    With a workbook session that holds unsaved edits to the sheet, those are used instead
+    of the file (and not cached).
+    """
+    if session is not None and sheet_name in session.dirty:
+        if sheet_name not in session.sheetnames:
+            return compute_analytics(None)
+        return compute_analytics(rows_frame(session.sheet(sheet_name).iter_rows(values_only=True), rename))
+
+    key = (os.path.abspath(path), sheet_name)
+    content_hash = sheet_content_hash(path, sheet_name)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and content_hash and cached[0] == content_hash:
+        return cached[1]
+
+    analytics = compute_analytics(read_sheet_frame(path, sheet_name, rename))
+    if content_hash:
+        with _cache_lock:
+            _cache[key] = (content_hash, analytics)
+    return analytics
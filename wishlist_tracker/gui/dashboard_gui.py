@@ -17,6 +17,7 @@ if PROJECT_ROOT not in sys.path:
 from wishlist_tracker.utils.watchlist_manager import load_watchlist
 from wishlist_tracker.utils.etrade_data import fetch_and_update_watchlist
 from wishlist_tracker.utils.option_chain import fetch_put_option_chain
+from gui_tasks import check_cancelled, get_task_runner, report_progress
 
 WATCHLIST_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'watchlist.csv')
 
@@ -34,6 +35,8 @@ class DashboardGUI:
         btn_frame.pack(pady=5)
         tk.Button(btn_frame, text="Refresh Data", command=self.refresh_data, bg="#a3cef1", fg="#232946", font=("Segoe UI", 11, "bold"), width=14).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Manage Tickers", command=self.open_ticker_manager, bg="#b8c1ec", fg="#232946", font=("Segoe UI", 11, "bold"), width=14).pack(side=tk.LEFT, padx=5)
+        self.status_label = tk.Label(btn_frame, text="", bg="#e3f0ff", fg="#232946", font=("Segoe UI", 10, "italic"))
+        self.status_label.pack(side=tk.LEFT, padx=10)
 
         # Table
         columns = ("Symbol", "Current Price", "52W High", "52W Low", "Premium", "Put Below", "Put Target", "Put Above", "Trend/Entry", "Entry Price", "Exit Price", "Stop Loss", "Notes")
@@ -61,8 +64,34 @@ class DashboardGUI:
         self.refresh_data()
 
     def refresh_data(self):
+        # The E*TRADE sign-in prompt is a Tk window, so the session is checked here on the main thread
+        try:
+            from etrade_auth import get_etrade_session
+            get_etrade_session()
+        except Exception as e:
+            print(f"DEBUG: E*TRADE session check failed: {e}")
+        # Quotes, option chains and 1-min bars are fetched on a worker; the table updates when they arrive
+        self.status_label.config(text="Refreshing...")
+        get_task_runner().submit(self.master, self.load_rows, name="refresh_data", on_done=self.show_rows,
+                                 on_error=self.show_refresh_error, on_progress=self.show_progress)
+
+    def show_progress(self, done, message):
+        self.status_label.config(text=message)
+
+    def show_rows(self, rows):
+        self.status_label.config(text="")
         for row in self.tree.get_children():
             self.tree.delete(row)
+        for row in rows:
+            self.tree.insert('', 'end', values=row[:-1])
+
+    def show_refresh_error(self, e):
+        self.status_label.config(text="")
+        print(f"DEBUG: Refresh failed: {e}")
+        messagebox.showerror("Refresh Data", f"Could not refresh the watchlist.\n{e}")
+
+    def load_rows(self):
+        """Fetches and formats one table row per watchlist ticker (runs on a worker)"""
         watchlist = load_watchlist(WATCHLIST_CSV)
         fetch_and_update_watchlist(watchlist)
         import configparser
@@ -81,9 +110,11 @@ class DashboardGUI:
         fib_lookback = config.getint('Fibonacci', 'lookback_days', fallback=20)
         piv_method = config.get('Pivots', 'method', fallback='classic')
 
-        # Fetch 1-min OHLCV for each symbol (synchronously)
+        # Fetch 1-min OHLCV for each symbol
         rows = []
-        for inst in watchlist:
+        for idx, inst in enumerate(watchlist, start=1):
+            check_cancelled()
+            report_progress(idx, f"Refreshing {inst.symbol} ({idx}/{len(watchlist)})...")
             puts = []
             try:
                 puts = fetch_put_option_chain(inst.symbol, float(inst.current_price or 0))
@@ -185,8 +216,7 @@ class DashboardGUI:
 
         # Sort rows by premium_val_num (most negative at the top)
         rows.sort(key=lambda r: r[-1])
-        for row in rows:
-            self.tree.insert('', 'end', values=row[:-1])
+        return rows
 
     def open_ticker_manager(self):
         import subprocess
@@ -0,0 +1,234 @@
+"""
+Shared workbook handle for the trade trackers (unit of work).
+
+A single user action in TradeTracker/PutTracker used to load and save the styled
+transactions workbook several times: generate_results refreshed prices (load +
+save), read closed trades (load) and wrote Results (load + save); closing a trade
+saved the row, reloaded it to move the trade, and saved again. A WorkbookSession
+keeps one loaded workbook per file:
+
+* every code path of an action gets the same Workbook through sheet()/edit();
+* edit(), create_sheet() and remove_sheet() record which sheets are dirty;
+* commit() saves atomically (temp file + os.replace); a commit from an action
+  nested in another one (add_trade -> sort_excel_trades)
+  is deferred, so the outer action's commit saves both;
+* between actions the workbook stays loaded and is reused until the file changes
+  on disk (mtime/size), e.g. when Excel or another app writes it.
+
+    @workbook_action("Bryan Perry Transactions.xlsx")
+    def close_trade(self):
+        book = get_workbook_session("Bryan Perry Transactions.xlsx")
+        ws = book.edit("Open_Trades_2025")
+        ...
+        book.commit()      # deferred if close_trade runs inside another action
+"""
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+from openpyxl import load_workbook
+
+
+class WorkbookConflictError(Exception):
+    """Raised when the file changed on disk while this session held unsaved edits."""
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cell_value(value):
+    # Same conversion pandas applies to openpyxl cells, so in-memory frames match read_excel
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class WorkbookSession:
+    def __init__(self, path, loader=load_workbook):
+        self.path = path
+        self._loader = loader
+        self._lock = threading.RLock()
+        self._wb = None
+        self._stamp = None
+        self._depth = 0
+        self._commit_requested = False
+        self.dirty = set()
+        self.loads = 0
+        self.saves = 0
+
+    # --- workbook -----------------------------------------------------------
+    def changed_on_disk(self):
+        return self._wb is not None and _file_stamp(self.path) != self._stamp
+
+    @property
+    def workbook(self):
+        """The shared Workbook, (re)loaded if it is not loaded yet or the file changed on disk."""
+        with self._lock:
+            if self._wb is not None and not self.dirty and self.changed_on_disk():
+                print(f"🔄 {self.path} changed on disk; reloading")
+                self._wb = None
+            if self._wb is None:
+                self._wb = self._loader(self.path)
+                self._stamp = _file_stamp(self.path)
+                self.loads += 1
+            return self._wb
+
+    @property
+    def sheetnames(self):
+        return self.workbook.sheetnames
+
+    def sheet(self, name):
+        """A worksheet for reading; use edit() for sheets that will be written."""
+        return self.workbook[name]
+
+    def edit(self, name):
+        """A worksheet that will be written; it is saved at the next commit."""
+        ws = self.workbook[name]
+        self.dirty.add(name)
+        return ws
+
+    def mark_dirty(self, name):
+        """Flags a sheet obtained through sheet() as written."""
+        self.dirty.add(name)
+
+    def create_sheet(self, name, replace=False):
+        """A new sheet (an existing one is kept unless replace=True)."""
+        wb = self.workbook
+        if name in wb.sheetnames:
+            if not replace:
+                return self.edit(name)
+            wb.remove(wb[name])
+        ws = wb.create_sheet(name)
+        self.dirty.add(name)
+        return ws
+
+    def remove_sheet(self, name):
+        wb = self.workbook
+        if name in wb.sheetnames:
+            wb.remove(wb[name])
+            self.dirty.add(name)
+
+    def read_frame(self, sheet_name):
+        """
+        The sheet as a DataFrame (header row 0). Reads the loaded workbook when the
+        sheet has pending edits, so callers see them before the commit; otherwise
+        reads the file like pd.read_excel.
+        """
+        with self._lock:
+            if sheet_name not in self.dirty or self._wb is None:
+                return pd.read_excel(self.path, header=0, sheet_name=sheet_name)
+            if sheet_name not in self._wb.sheetnames:
+                raise ValueError(f"Worksheet named '{sheet_name}' not found")
+            rows = [[_cell_value(v) for v in row] for row in self._wb[sheet_name].iter_rows(values_only=True)]
+        while rows and all(v is None for v in rows[-1]):
+            rows.pop()
+        if not rows:
+            return pd.DataFrame()
+        header = [f"Unnamed: {i}" if h is None else h for i, h in enumerate(rows[0])]
+        return pd.DataFrame(rows[1:], columns=header)
+
+    # --- unit of work -------------------------------------------------------
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Groups an action's edits into one save. commit() from a nested block is deferred
+        to the outermost one; edits still uncommitted when the outermost block ends (the
+        action bailed out before saving) are discarded, as is everything if it raises.
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._depth == 1:
+                    self.rollback()
+                raise
+            else:
+                if self._depth == 1:
+                    if self._commit_requested:
+                        self._save()
+                    elif self.dirty:
+                        self.rollback()
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._commit_requested = False
+
+    def commit(self):
+        """
+        Saves dirty sheets now; inside a nested unit of work, when the outermost one ends.
+        Returns False when there was nothing to save.
+        """
+        with self._lock:
+            if self._depth > 1:
+                self._commit_requested = True
+                return bool(self.dirty)
+            self._commit_requested = False
+            return self._save()
+
+    def rollback(self):
+        """Drops unsaved edits; the next access reloads the file."""
+        with self._lock:
+            self._wb = None
+            self.dirty.clear()
+
+    def _save(self):
+        if not self.dirty or self._wb is None:
+            return False
+        if self.changed_on_disk():
+            dirty = ", ".join(sorted(self.dirty))
+            self.rollback()
+            raise WorkbookConflictError(f"{self.path} was changed by another program; "
+                                        f"unsaved changes to {dirty} were discarded. Please retry.")
+        tmp = f"{self.path}.tmp"
+        try:
+            self._wb.save(tmp)
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._stamp = _file_stamp(self.path)
+        self.saves += 1
+        print(f"💾 Saved {self.path} ({', '.join(sorted(self.dirty))})")
+        self.dirty.clear()
+        return True
+
+    def close(self):
+        with self._lock:
+            if self._wb is not None:
+                self._wb.close()
+            self._wb = None
+            self.dirty.clear()
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_workbook_session(path):
+    """The shared session for a workbook file."""
+    key = os.path.abspath(path)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = WorkbookSession(path)
+            _sessions[key] = session
+        return session
+
+
+def workbook_action(path):
+    """Decorator running a method as one unit of work on `path` (one load, at most one save)."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_workbook_session(path).unit_of_work():
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator